@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252
+
+
+# 날짜 x 티커 행렬에 대한 백테스트 - 모든 티커를 한 번의 NumPy 연산으로 계산
+# signal은 목표 포지션(1: 매수, 0: 현금, -1: 매도)이며 다음 날부터 보유
+def backtest_matrix(prices, signal, commission=0.0, slippage=0.0, allow_short=False, periods_per_year=TRADING_DAYS):
+    prices = np.asarray(prices, dtype=float)
+    signal = np.nan_to_num(np.asarray(signal, dtype=float))
+    if not allow_short:
+        signal = np.clip(signal, 0.0, None)
+
+    valid = ~np.isnan(prices)
+    # 휴장일 등 빈 칸은 직전 가격으로 채워 다음 거래일 수익률에 반영
+    filled = pd.DataFrame(prices).ffill().to_numpy()
+    prev_prices = np.vstack([np.full((1,) + filled.shape[1:], np.nan), filled[:-1]])
+    with np.errstate(invalid='ignore', divide='ignore'):
+        daily_returns = np.nan_to_num(filled / prev_prices - 1)
+
+    exposure = np.vstack([np.zeros((1,) + signal.shape[1:]), signal[:-1]])
+    trades = np.abs(np.diff(exposure, axis=0, prepend=0.0))
+    costs = trades * (commission + slippage)
+    net_returns = exposure * daily_returns - costs
+
+    equity = np.cumprod(1 + net_returns, axis=0)
+    drawdown = equity / np.maximum.accumulate(equity, axis=0) - 1
+
+    observations = np.maximum(valid.sum(axis=0), 1)
+    years = observations / periods_per_year
+    mean = net_returns.sum(axis=0) / observations
+    std = np.sqrt(((net_returns - mean) ** 2 * valid).sum(axis=0) / np.maximum(observations - 1, 1))
+    downside = np.sqrt((np.minimum(net_returns, 0) ** 2).sum(axis=0) / observations)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        metrics = {
+            'total_return': equity[-1] - 1,
+            'cagr': np.where(equity[-1] > 0, equity[-1] ** (1 / years), 0.0) - 1,
+            'sharpe': mean / std * np.sqrt(periods_per_year),
+            'sortino': mean / downside * np.sqrt(periods_per_year),
+            'max_drawdown': drawdown.min(axis=0),
+            'turnover': trades.sum(axis=0) / years,
+            'exposure': (np.abs(exposure) * valid).sum(axis=0) / observations,
+        }
+    return {'net_returns': net_returns, 'equity': equity, 'metrics': metrics}
+
+
+# StockAnalyzer.calculate_returns 결과에 수수료/슬리피지, 공매도 처리와 자산 곡선을 추가
+def backtest_returns(returns, commission=0.0, slippage=0.0, allow_short=False):
+    result = backtest_matrix(returns[['price']].to_numpy(), returns[['signal']].to_numpy(),
+                             commission=commission, slippage=slippage, allow_short=allow_short)
+    returns = returns.copy()
+    returns['net_returns'] = result['net_returns'][:, 0]
+    returns['equity'] = result['equity'][:, 0]
+    return returns
+
+
+# 전체 티커 x 전체 전략 백테스트 요약 테이블
+def backtest_universe(analyzer, stock_frames, commission=0.0, slippage=0.0, allow_short=False):
+    signals_by_strategy = {}
+    for ticker, stock_data in stock_frames.items():
+        for strategy, signals in analyzer.generate_all_signals(stock_data).items():
+            signals_by_strategy.setdefault(strategy, {})[ticker] = signals['signal']
+
+    prices = pd.DataFrame({ticker: stock_data['Close'] for ticker, stock_data in stock_frames.items()})
+    rows = []
+    for strategy, signal_by_ticker in signals_by_strategy.items():
+        signal = pd.DataFrame(signal_by_ticker).reindex(index=prices.index, columns=prices.columns).ffill()
+        metrics = backtest_matrix(prices.to_numpy(), signal.to_numpy(), commission=commission,
+                                  slippage=slippage, allow_short=allow_short)['metrics']
+        table = pd.DataFrame(metrics, index=prices.columns)
+        table.insert(0, 'strategy', strategy)
+        rows.append(table)
+    summary = pd.concat(rows).rename_axis('ticker').reset_index()
+    return summary[['strategy', 'ticker'] + [column for column in summary.columns if column not in ('strategy', 'ticker')]]
@@ -0,0 +1,86 @@
+import time
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class DownloadError(Exception):
+    pass
+
+
+# 초당 요청 수를 제한하는 rate limiter - 같은 소스를 쓰는 모든 스레드가 공유
+class RateLimiter:
+    def __init__(self, rate):
+        self.interval = 1.0 / rate
+        self.next_time = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_time)
+            self.next_time = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+_rate_limiters = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(name, rate):
+    with _rate_limiters_lock:
+        if name not in _rate_limiters:
+            _rate_limiters[name] = RateLimiter(rate)
+        return _rate_limiters[name]
+
+
+# 데이터 소스의 fetch 호출에 소스별 rate limit을 적용하는 래퍼
+class RateLimitedSource:
+    def __init__(self, source, rate):
+        self.source = source
+        self.name = getattr(source, 'name', type(source).__name__)
+        self.limiter = get_rate_limiter(self.name, rate)
+
+    def fetch(self, ticker, start_date, end_date):
+        self.limiter.acquire()
+        return self.source.fetch(ticker, start_date, end_date)
+
+
+# 제한된 스레드 풀로 여러 티커를 동시에 다운로드 - 실패한 티커는 재시도 후 따로 기록하고 나머지는 계속 진행
+class BatchDownloader:
+    def __init__(self, fetch, max_workers=8, retries=3, backoff=1.0):
+        self.fetch = fetch
+        self.max_workers = max_workers
+        self.retries = retries
+        self.backoff = backoff
+
+    # yfinance는 일시적인 HTTP 오류도 빈 DataFrame으로 반환하므로 빈 데이터도 재시도
+    # (상장폐지 등으로 계속 비어 있으면 재시도 후 실패 처리)
+    def fetch_with_retry(self, ticker):
+        for attempt in range(self.retries + 1):
+            try:
+                data = self.fetch(ticker)
+                if data is None or len(data) == 0:
+                    raise DownloadError(f'{ticker}: no data')
+                return data
+            except DownloadError:
+                if attempt == self.retries:
+                    raise
+            except Exception as e:
+                if attempt == self.retries:
+                    raise DownloadError(f'{ticker}: {e}') from e
+            # 지수 백오프 + 지터
+            time.sleep(self.backoff * (2 ** attempt) * (1 + random.random()))
+
+    def run(self, tickers):
+        frames = {}
+        failures = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [(ticker, executor.submit(self.fetch_with_retry, ticker)) for ticker in tickers]
+            for ticker, future in futures:
+                try:
+                    frames[ticker] = future.result()
+                except DownloadError as e:
+                    failures[ticker] = e
+        return frames, failures
@@ -1,18 +1,25 @@
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import warnings
-warnings.filterwarnings('ignore')
+from indicator_engine import IndicatorEngine
+from signal_rules import SignalRules
+from plotting import pyplot
+
+# 상단 밴드 돌파 시 매도, 하단 밴드 이탈 시 매수
+BOLLINGER_RULES = '''
+sell when close > upper_band
+buy when close < lower_band
+'''
 
 class BollingerBandsStrategy:
-    def __init__(self, data, window, num_std):
+    def __init__(self, data, window, num_std, engine=None):
         self.data = data
         self.window = window
         self.num_std = num_std
+        self.engine = engine if engine is not None else IndicatorEngine(data)
 
     def calculate_bollinger_bands(self):
-        rolling_mean = self.data['Close'].rolling(window=self.window).mean()
-        rolling_std = self.data['Close'].rolling(window=self.window).std()
+        rolling_mean = self.engine.rolling('Close', 'mean', self.window)
+        rolling_std = self.engine.rolling('Close', 'std', self.window)
         upper_band = rolling_mean + (self.num_std * rolling_std)
         lower_band = rolling_mean - (self.num_std * rolling_std)
         return upper_band, lower_band
@@ -21,20 +28,13 @@ class BollingerBandsStrategy:
         upper_band, lower_band = self.calculate_bollinger_bands()
 
         signals = pd.DataFrame(index=self.data.index)
-        signals['signal'] = 0.0
-
-        # Crossing upper band - Sell Signal
-        signals['signal'][self.data['Close'] > upper_band] = -1.0
-
-        # Crossing lower band - Buy Signal
-        signals['signal'][self.data['Close'] < lower_band] = 1.0
-
-        # Position change signal
-        signals['positions'] = signals['signal'].diff()
+        signals['signal'], signals['positions'] = SignalRules(BOLLINGER_RULES).evaluate(
+            self.data, upper_band=upper_band, lower_band=lower_band)
 
         return signals
 
     def plot_bollinger_bands_strategy(self, stock_data, signals, company_name, pdf):
+        plt = pyplot()
         upper_band, lower_band = self.calculate_bollinger_bands()
 
         plt.figure(figsize=(12, 6))
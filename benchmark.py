@@ -0,0 +1,329 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+import panel
+from stock_analysis import StockAnalyzer
+from ma_rsi_strategy import MovingAverageRSIStrategy
+from bb_strategy import BollingerBandsStrategy
+
+BASELINE_PATH = 'benchmark_baseline.json'
+BAR_SIZES = (1000, 10000, 100000, 1000000)
+TICKER_COUNTS = (1, 10, 100, 1000)
+# --full 옵션에서 추가되는 대형 케이스
+FULL_BAR_SIZES = BAR_SIZES + (10000000,)
+FULL_TICKER_COUNTS = TICKER_COUNTS + (5000,)
+BARS_PER_TICKER = 1000
+# 짧은 케이스는 누적 측정 시간이 MIN_MEASURE_SECONDS가 될 때까지(최대 MAX_REPEAT회) 반복하여 최솟값을 사용
+MIN_MEASURE_SECONDS = 1.0
+MAX_REPEAT = 200
+# 기준값보다 이 시간(초) 이상 느려지지 않으면 비율이 커도 회귀로 보지 않음 (1ms 미만 케이스의 타이머 잡음)
+MIN_REGRESSION_SECONDS = 0.005
+# CLI 시작 시간 예산(초) - 스케줄러에서 하루 수백 번 실행하므로 --help/인자 처리까지는 표준 라이브러리만 사용
+STARTUP_BUDGET = 0.5
+STARTUP_COMMANDS = (['--help'], ['screen', '--help'], ['backtest', '--help'])
+# 하위 명령을 실행하기 전에는 불러오지 않아야 하는 모듈
+HEAVY_MODULES = ('pandas', 'matplotlib', 'mplfinance', 'yfinance', 'FinanceDataReader')
+CLI_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cli.py')
+# 영업일 인덱스로 표현할 수 있는 최대 길이 (pandas Timestamp 범위) - 이보다 길면 분봉 인덱스 사용
+MAX_DAILY_BARS = 60000
+
+
+# ---- 합성 OHLCV 데이터 ----
+
+# 재현 가능한 합성 OHLCV - 로그 랜덤워크 가격, 변동성에 비례하는 거래량, 시가 갭, 휴장일(날짜 누락)과 NaN 행 포함
+def synthetic_ohlcv(n_bars, seed=0, start='2000-01-03', volatility=0.02, gap_rate=0.02, holiday_rate=0.03,
+                    nan_rate=0.001):
+    rng = np.random.default_rng(seed)
+    freq = 'B' if n_bars <= MAX_DAILY_BARS else 'min'
+    # 휴장일만큼 여유 있게 날짜를 만들고 일부를 제거
+    calendar = pd.date_range(start, periods=int(n_bars * (1 + holiday_rate)) + 1, freq=freq)
+    keep = np.sort(rng.choice(len(calendar), n_bars, replace=False))
+    index = pd.DatetimeIndex(calendar[keep], name='Date')
+
+    returns = rng.standard_t(4, n_bars) * volatility / np.sqrt(2)
+    gaps = np.where(rng.random(n_bars) < gap_rate, rng.normal(0, 3 * volatility, n_bars), 0.0)
+    close = 100 * np.exp(np.cumsum(returns + gaps))
+    open_ = close * np.exp(-returns + rng.normal(0, volatility / 4, n_bars))
+    wick = np.abs(rng.normal(0, volatility / 2, (2, n_bars)))
+    high = np.maximum(open_, close) * np.exp(wick[0])
+    low = np.minimum(open_, close) * np.exp(-wick[1])
+    volume = np.round(rng.lognormal(13, 0.5, n_bars) * (1 + 20 * np.abs(returns + gaps)))
+
+    data = pd.DataFrame({'Open': open_, 'High': high, 'Low': low, 'Close': close, 'Adj Close': close,
+                         'Volume': volume}, index=index)
+    data.iloc[np.flatnonzero(rng.random(n_bars) < nan_rate)] = np.nan
+    return data
+
+
+def synthetic_universe(n_tickers, n_bars=BARS_PER_TICKER, seed=0):
+    return {f'T{i:05d}': synthetic_ohlcv(n_bars, seed=seed + i) for i in range(n_tickers)}
+
+
+# ---- 벤치마크 케이스 ----
+# (이름, 준비 함수, 실행 함수) - 준비 함수는 측정에서 제외되며 실행 함수에 넘길 인자를 반환
+
+SERIES_CASES = [
+    ('calculate_moving_average', None, lambda a, d: a.calculate_moving_average(d, 50)),
+    ('calculate_bollinger_bands', None, lambda a, d: a.calculate_bollinger_bands(d, 20)),
+    ('moving_average_cross_strategy', None, lambda a, d: a.moving_average_cross_strategy(d, 50, 200)),
+    ('calculate_returns', lambda a, d: (a.moving_average_cross_strategy(d, 50, 200), d),
+     lambda a, s, d: a.calculate_returns(s, d)),
+    ('rsi_strategy', None, lambda a, d: a.rsi_strategy(d, 14)),
+    ('calculate_macd', None, lambda a, d: a.calculate_macd(d)),
+    ('macd_strategy', lambda a, d: (a.calculate_macd(d),), lambda a, d: a.macd_strategy(d)),
+    ('calculate_stochastic_oscillator', None, lambda a, d: a.calculate_stochastic_oscillator(d)),
+    ('stochastic_oscillator_strategy', lambda a, d: (a.calculate_stochastic_oscillator(d),),
+     lambda a, d: a.stochastic_oscillator_strategy(d)),
+    ('calculate_vwma', None, lambda a, d: a.calculate_vwma(d)),
+    ('vwma_strategy', lambda a, d: (a.calculate_vwma(d),), lambda a, d: a.vwma_strategy(d)),
+    ('calculate_ichimoku_cloud', None, lambda a, d: a.calculate_ichimoku_cloud(d)),
+    ('ichimoku_strategy', lambda a, d: (a.calculate_ichimoku_cloud(d),), lambda a, d: a.ichimoku_strategy(d)),
+    ('calculate_adx', None, lambda a, d: a.calculate_adx(d)),
+    ('adx_strategy', lambda a, d: (a.calculate_adx(d),), lambda a, d: a.adx_strategy(d)),
+    ('BollingerBandsStrategy', None,
+     lambda a, d: BollingerBandsStrategy(d, window=20, num_std=2).generate_signals()),
+    ('MovingAverageRSIStrategy', None,
+     lambda a, d: MovingAverageRSIStrategy(d, short_window=50, long_window=200, rsi_window=14).generate_signals()),
+    ('generate_all_signals', None, lambda a, d: a.generate_all_signals(d)),
+    ('compute_ticker', None, lambda a, d: a.compute_ticker(d)),
+]
+
+
+def panel_indicators(frames):
+    stock_panel = panel.Panel.from_frames(frames)
+    panel.moving_average(stock_panel, 50)
+    panel.bollinger_bands(stock_panel, 20)
+    panel.rsi(stock_panel)
+    panel.macd(stock_panel)
+    panel.vwma(stock_panel)
+    panel.stochastic_oscillator(stock_panel)
+    panel.ichimoku_cloud(stock_panel)
+    panel.adx(stock_panel)
+
+
+UNIVERSE_CASES = [
+    ('compute_ticker_loop', None, lambda a, frames: [a.compute_ticker(d) for d in frames.values()]),
+    ('panel_indicators', None, lambda a, frames: panel_indicators(frames)),
+]
+
+
+def copy_input(data):
+    if isinstance(data, dict):
+        return {ticker: frame.copy() for ticker, frame in data.items()}
+    return data.copy()
+
+
+# 실행 시간(최소 repeat회, 짧은 케이스는 min_seconds를 채울 때까지 반복한 것 중 최솟값)과
+# 최대 메모리 사용량(tracemalloc)을 측정
+# 계산 메서드가 입력 데이터에 컬럼을 추가하므로 매 실행마다 복사본을 사용
+def measure(analyzer, setup, run, data, repeat=3, min_seconds=MIN_MEASURE_SECONDS, max_repeat=MAX_REPEAT):
+    best = float('inf')
+    total = 0.0
+    runs = 0
+    while runs < repeat or (total < min_seconds and runs < max_repeat):
+        args = setup(analyzer, copy_input(data)) if setup else (copy_input(data),)
+        start = time.perf_counter()
+        run(analyzer, *args)
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+        total += elapsed
+        runs += 1
+
+    args = setup(analyzer, copy_input(data)) if setup else (copy_input(data),)
+    tracemalloc.start()
+    try:
+        run(analyzer, *args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def result_key(name, bars, tickers):
+    return f'{name}@{bars}x{tickers}'
+
+
+def run_benchmarks(bar_sizes=BAR_SIZES, ticker_counts=TICKER_COUNTS, bars_per_ticker=BARS_PER_TICKER, cases=None,
+                   repeat=3, log=print):
+    analyzer = StockAnalyzer({}, profile=False)
+    selected = lambda name: not cases or any(case in name for case in cases)
+    results = {}
+
+    def record(name, bars, tickers, seconds, peak):
+        results[result_key(name, bars, tickers)] = {
+            'bars': bars, 'tickers': tickers, 'seconds': round(seconds, 6),
+            'bars_per_sec': int(bars * tickers / seconds) if seconds > 0 else None,
+            'peak_mb': round(peak / 2 ** 20, 2),
+        }
+        log(format_row(result_key(name, bars, tickers), results[result_key(name, bars, tickers)]))
+
+    for bars in bar_sizes:
+        data = synthetic_ohlcv(bars)
+        # 대형 입력은 한 번만 실행
+        case_repeat = repeat if bars <= 100000 else 1
+        for name, setup, run in SERIES_CASES:
+            if selected(name):
+                record(name, bars, 1, *measure(analyzer, setup, run, data, case_repeat))
+
+    for tickers in ticker_counts:
+        frames = synthetic_universe(tickers, bars_per_ticker)
+        case_repeat = repeat if tickers <= 100 else 1
+        for name, setup, run in UNIVERSE_CASES:
+            if selected(name):
+                record(name, bars_per_ticker, tickers, *measure(analyzer, setup, run, frames, case_repeat))
+    return results
+
+
+# '<이름>@<봉 수>x<티커 수>' 케이스 하나만 다시 측정
+def rerun_case(key, repeat=3):
+    name, size = key.split('@')
+    bars, tickers = (int(value) for value in size.split('x'))
+    series = any(case == name for case, _, _ in SERIES_CASES)
+    results = run_benchmarks([bars] if series else [], [] if series else [tickers], bars, [name], repeat,
+                             log=lambda line: None)
+    return results.get(key)
+
+
+# ---- CLI 시작 시간 ----
+
+# 새 프로세스로 cli.py를 실행하는 시간 (repeat회 중 최솟값)
+def measure_startup(args, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, CLI_PATH] + list(args), stdout=subprocess.DEVNULL, check=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+# 인자 파서를 만든 뒤 이미 불러온 무거운 모듈 목록
+def startup_imports():
+    code = ('import json, sys, cli; cli.build_parser(); '
+            f'print(json.dumps(sorted({{m.split(".")[0] for m in sys.modules}} & set({list(HEAVY_MODULES)!r}))))')
+    output = subprocess.run([sys.executable, '-c', code], cwd=os.path.dirname(CLI_PATH), stdout=subprocess.PIPE,
+                            check=True, universal_newlines=True).stdout
+    return json.loads(output)
+
+
+def check_startup(budget=STARTUP_BUDGET, repeat=5, log=print):
+    ok = True
+    for args in STARTUP_COMMANDS:
+        seconds = measure_startup(args, repeat)
+        within = seconds <= budget
+        ok &= within
+        log(f"{'cli.py ' + ' '.join(args):<50} {seconds:>10.4f}s {'ok' if within else f'예산 {budget}s 초과'}")
+    heavy = startup_imports()
+    if heavy:
+        log(f'인자 처리 단계에서 불러온 모듈: {heavy}')
+    return ok and not heavy
+
+
+def environment():
+    return {'python': platform.python_version(), 'numpy': np.__version__, 'pandas': pd.__version__,
+            'machine': platform.machine(), 'system': platform.system()}
+
+
+# ---- 기준값 저장 및 비교 ----
+
+def save_results(path, results):
+    with open(path, 'w') as f:
+        json.dump({'environment': environment(), 'results': results}, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def load_results(path):
+    with open(path) as f:
+        return json.load(f)['results']
+
+
+# 기준값 대비 실행 시간 비율 - tolerance 이상, 그리고 min_seconds 이상 느려진 케이스를 회귀로 표시
+def compare(results, baseline, tolerance=0.25, min_seconds=MIN_REGRESSION_SECONDS):
+    rows = []
+    for key, result in results.items():
+        if key not in baseline:
+            continue
+        ratio = result['seconds'] / baseline[key]['seconds'] if baseline[key]['seconds'] else float('inf')
+        slower = result['seconds'] - baseline[key]['seconds']
+        rows.append({'case': key, 'baseline': baseline[key]['seconds'], 'current': result['seconds'],
+                     'ratio': ratio, 'regression': ratio > 1 + tolerance and slower > min_seconds})
+    return pd.DataFrame(rows, columns=['case', 'baseline', 'current', 'ratio', 'regression'])
+
+
+def format_row(key, result):
+    throughput = f"{result['bars_per_sec']:>14,}" if result['bars_per_sec'] is not None else f"{'-':>14}"
+    return f"{key:<50} {result['seconds']:>10.4f}s {throughput} bars/s {result['peak_mb']:>10.2f} MB"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='stock_lab 지표/전략 벤치마크')
+    parser.add_argument('--bars', type=int, nargs='+', help='단일 티커 데이터 길이 목록')
+    parser.add_argument('--tickers', type=int, nargs='+', help='유니버스 티커 수 목록')
+    parser.add_argument('--bars-per-ticker', type=int, default=BARS_PER_TICKER)
+    parser.add_argument('--full', action='store_true', help='10M 봉, 5,000 티커 케이스 포함')
+    parser.add_argument('--cases', nargs='+', help='이름에 포함된 문자열로 케이스 선택')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', help='결과 JSON 저장 경로')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--update-baseline', action='store_true', help='결과로 기준값 파일을 갱신')
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    parser.add_argument('--confirm', type=int, default=2, help='회귀 후보 재측정 횟수')
+    parser.add_argument('--min-regression', type=float, default=MIN_REGRESSION_SECONDS,
+                        help='회귀로 판정할 최소 증가 시간(초)')
+    parser.add_argument('--startup', action='store_true', help='CLI 시작 시간 예산만 검사')
+    parser.add_argument('--startup-budget', type=float, default=STARTUP_BUDGET)
+    args = parser.parse_args(argv)
+
+    if args.startup:
+        return 0 if check_startup(args.startup_budget) else 1
+
+    bar_sizes = args.bars or (FULL_BAR_SIZES if args.full else BAR_SIZES)
+    ticker_counts = args.tickers or (FULL_TICKER_COUNTS if args.full else TICKER_COUNTS)
+    results = run_benchmarks(bar_sizes, ticker_counts, args.bars_per_ticker, args.cases, args.repeat)
+
+    if args.output:
+        save_results(args.output, results)
+    if args.update_baseline:
+        try:
+            baseline = load_results(args.baseline)
+        except FileNotFoundError:
+            baseline = {}
+        baseline.update(results)
+        save_results(args.baseline, baseline)
+        return 0
+
+    try:
+        baseline = load_results(args.baseline)
+    except FileNotFoundError:
+        print(f'기준값 파일 없음: {args.baseline} (--update-baseline으로 생성)')
+        return 0
+    comparison = compare(results, baseline, args.tolerance, args.min_regression)
+    # 회귀로 보이는 케이스만 다시 측정하여 더 빠른 값으로 재판정 (공유 머신의 일시적인 느려짐으로 인한 오탐 방지)
+    for _ in range(args.confirm):
+        flagged = list(comparison.loc[comparison['regression'], 'case'])
+        if not flagged:
+            break
+        print(f'회귀 후보 {len(flagged)}건 재측정')
+        for key in flagged:
+            result = rerun_case(key, args.repeat)
+            if result is not None and result['seconds'] < results[key]['seconds']:
+                results[key] = result
+        comparison = compare(results, baseline, args.tolerance, args.min_regression)
+    if comparison.empty:
+        return 0
+    print(comparison.to_string(index=False, float_format=lambda value: f'{value:.4f}'))
+    regressions = comparison[comparison['regression']]
+    if not regressions.empty:
+        print(f'회귀 {len(regressions)}건 (허용치 {args.tolerance:.0%} 초과)')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,252 @@
+import numpy as np
+import pandas as pd
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import matplotlib.dates as mdates
+import mplfinance as mpf
+
+# 폰트 설정은 프로세스마다 한 번만
+plt.rcParams['font.family'] = 'Malgun Gothic'
+plt.rcParams['axes.unicode_minus'] = False
+
+MAX_POINTS = 1500
+MAX_CANDLES = 600
+
+
+# Largest-Triangle-Three-Buckets 다운샘플링 - 화면에 보이는 모양을 유지하면서 max_points개의 인덱스를 선택
+# 순차 LTTB의 '직전 선택 점' 대신 직전 버킷 평균을 사용하여 전체를 벡터 연산으로 계산
+def lttb_indices(x, y, max_points):
+    valid = np.flatnonzero(~np.isnan(y))
+    if len(valid) <= max_points or max_points < 3:
+        return valid
+    x, y = x[valid], y[valid]
+    n = len(valid)
+    starts = np.linspace(1, n - 1, max_points - 1).astype(int)[:-1]
+    bucket = np.repeat(np.arange(len(starts)), np.diff(np.append(starts, n - 1)))
+    counts = np.bincount(bucket)
+    mean_x = np.bincount(bucket, weights=x[1:n - 1]) / counts
+    mean_y = np.bincount(bucket, weights=y[1:n - 1]) / counts
+    prev_x, prev_y = np.concatenate([[x[0]], mean_x[:-1]]), np.concatenate([[y[0]], mean_y[:-1]])
+    next_x, next_y = np.concatenate([mean_x[1:], [x[-1]]]), np.concatenate([mean_y[1:], [y[-1]]])
+
+    inner_x, inner_y = x[1:n - 1], y[1:n - 1]
+    ax, ay, cx, cy = prev_x[bucket], prev_y[bucket], next_x[bucket], next_y[bucket]
+    areas = np.abs((ax - cx) * (inner_y - ay) - (ax - inner_x) * (cy - ay))
+    # 버킷별 면적이 가장 큰 점
+    order = np.lexsort((-areas, bucket))
+    best = order[np.concatenate([[0], np.cumsum(counts)[:-1]])] + 1
+    return valid[np.concatenate([[0], best, [n - 1]])]
+
+
+# 캔들 수가 max_candles를 넘으면 k개 봉씩 묶어 OHLC를 다시 집계
+# data가 IndicatorStore여도 mplfinance에 넘길 수 있도록 항상 OHLC DataFrame을 반환
+def resample_ohlc(data, max_candles):
+    ohlc = data[['Open', 'High', 'Low', 'Close']]
+    if len(data) <= max_candles:
+        return ohlc
+    groups = np.arange(len(data)) // int(np.ceil(len(data) / max_candles))
+    return pd.DataFrame({
+        'Open': ohlc['Open'].groupby(groups).first().to_numpy(),
+        'High': ohlc['High'].groupby(groups).max().to_numpy(),
+        'Low': ohlc['Low'].groupby(groups).min().to_numpy(),
+        'Close': ohlc['Close'].groupby(groups).last().to_numpy(),
+    }, index=data.index.to_series().groupby(groups).last())
+
+
+BUY = dict(marker='^', markersize=10, color='g', lw=0, label='Buy Signal')
+SELL = dict(marker='v', markersize=10, color='r', lw=0, label='Sell Signal')
+
+
+def price_panel(strategy):
+    return {'lines': [('data', 'Close', dict(label='Close Price'))],
+            'markers': [(strategy, 'data', 'Close', 1.0, BUY), (strategy, 'data', 'Close', -1.0, SELL)]}
+
+
+# 전략별 차트 템플릿 - StockAnalyzer / MovingAverageRSIStrategy의 plot_* 메서드와 같은 구성
+# lines: (소스, 컬럼, 스타일), markers: (시그널 전략, 소스, 컬럼, 포지션 값, 스타일)
+# bands: (소스, 위쪽 컬럼, 아래쪽 컬럼, 조건(None/'above'/'below'), 스타일), hlines: (값, 스타일)
+TEMPLATES = {
+    'ma': {
+        'figsize': (12, 6), 'title': 'Moving Average Crossover Strategy', 'axis_labels': True,
+        'panels': [{
+            'lines': [('data', 'Close', dict(label='Close Price')),
+                      ('ma', 'short_mavg', dict(label='Short Moving Average', color='red')),
+                      ('ma', 'long_mavg', dict(label='Long Moving Average', color='blue')),
+                      ('ma', 'upper_band', dict(linestyle='--', linewidth=1, color='black')),
+                      ('ma', 'lower_band', dict(linestyle='--', linewidth=1, color='black'))],
+            'markers': [('ma', 'ma', 'short_mavg', 1.0, BUY), ('ma', 'ma', 'short_mavg', -1.0, SELL),
+                        ('ma', 'data', 'Close', 1.0, dict(marker='^', markersize=10, color='c', lw=0, label='Buy Signal(Sub)')),
+                        ('ma', 'data', 'Close', -1.0, dict(marker='v', markersize=10, color='y', lw=0, label='Sell Signal(Sub)'))],
+            'bands': [('ma', 'upper_band', 'lower_band', None, dict(color='gray', alpha=0.3, label='Bollinger Bands'))],
+        }],
+    },
+    'rsi': {'figsize': (12, 6), 'title': 'RSI Strategy', 'axis_labels': True, 'panels': [price_panel('rsi')]},
+    'ma_rsi': {
+        'figsize': (12, 6), 'title': 'Moving Average RSI Strategy', 'axis_labels': True,
+        'panels': [{
+            'lines': [('data', 'Close', dict(label='Close Price')),
+                      ('data', 'short_mavg', dict(label='Short Moving Average', color='red')),
+                      ('data', 'long_mavg', dict(label='Long Moving Average', color='blue'))],
+            'markers': [('ma_rsi', 'data', 'short_mavg', 1.0, BUY), ('ma_rsi', 'data', 'short_mavg', -1.0, SELL)],
+        }],
+    },
+    'macd': {
+        'figsize': (12, 8), 'title': 'MACD Strategy',
+        'panels': [price_panel('macd'),
+                   {'lines': [('macd', 'MACD', dict(label='MACD', color='blue')),
+                              ('macd', 'Signal_line', dict(label='Signal Line', color='red'))]}],
+    },
+    'stochastic': {
+        'figsize': (12, 8), 'title': 'Stochastic Oscillator Strategy',
+        'panels': [price_panel('stochastic'),
+                   {'lines': [('stochastic', '%K', dict(label='%K', color='blue')),
+                              ('stochastic', '%D', dict(label='%D', color='red'))],
+                    'hlines': [(20, dict(color='gray', linestyle='--')), (80, dict(color='gray', linestyle='--'))]}],
+    },
+    'vwma': {
+        'figsize': (12, 6), 'title': 'VWMA Strategy',
+        'panels': [{
+            'lines': [('data', 'Close', dict(label='Close Price')),
+                      ('vwma', 'VWMA', dict(label='VWMA', color='orange')),
+                      ('vwma', 'SMA', dict(label='SMA', color='purple'))],
+            'markers': [('vwma', 'data', 'Close', 1.0, BUY), ('vwma', 'data', 'Close', -1.0, SELL)],
+        }],
+    },
+    'ichimoku': {
+        'figsize': (12, 6), 'title': 'Ichimoku Cloud Strategy',
+        'panels': [{
+            'lines': [('data', 'Close', dict(label='Close Price')),
+                      ('ichimoku', 'Conversion_Line', dict(label='Conversion Line', color='blue')),
+                      ('ichimoku', 'Base_Line', dict(label='Base Line', color='red'))],
+            'markers': [('ichimoku', 'data', 'Close', 1.0, BUY), ('ichimoku', 'data', 'Close', -1.0, SELL)],
+            'bands': [('ichimoku', 'Leading_Span_A', 'Leading_Span_B', 'above', dict(facecolor='green', alpha=0.3)),
+                      ('ichimoku', 'Leading_Span_A', 'Leading_Span_B', 'below', dict(facecolor='red', alpha=0.3))],
+        }],
+    },
+    'adx': {
+        'figsize': (12, 8), 'title': 'ADX Strategy',
+        'panels': [price_panel('adx'),
+                   {'lines': [('adx', 'ADX', dict(label='ADX', color='orange')),
+                              ('adx', 'ADX_threshold', dict(color='gray', linestyle='--'))]}],
+    },
+}
+
+
+# 한 번 만든 figure를 재사용하고 선 데이터만 교체하는 차트 템플릿
+class FigureTemplate:
+    def __init__(self, spec, max_points=MAX_POINTS):
+        self.spec = spec
+        self.max_points = max_points
+        self.figure = plt.figure(figsize=spec['figsize'])
+        self.axes = []
+        self.lines = []
+        self.markers = []
+        self.bands = []
+        panels = spec['panels']
+        for i, panel in enumerate(panels):
+            ax = self.figure.add_subplot(len(panels), 1, i + 1)
+            ax.xaxis_date()
+            for source, column, style in panel.get('lines', []):
+                self.lines.append((source, column, ax.plot([], [], **style)[0]))
+            for strategy, source, column, position, style in panel.get('markers', []):
+                style = dict(style)
+                marker = style.pop('marker')
+                self.markers.append((strategy, source, column, position, ax.plot([], [], marker, **style)[0]))
+            for band in panel.get('bands', []):
+                self.bands.append((ax, band, None))
+            for value, style in panel.get('hlines', []):
+                ax.axhline(value, **style)
+            if i == 0:
+                self.title = ax.set_title('')
+                if spec.get('axis_labels'):
+                    ax.set_xlabel('Date')
+                    ax.set_ylabel('Price')
+            self.axes.append(ax)
+        self.legends_ready = False
+
+    def render(self, company_name, stock_data, signals, pdf):
+        sources = dict(signals, data=stock_data)
+        x = mdates.date2num(stock_data.index.to_pydatetime())
+        close = stock_data['Close'].to_numpy(dtype=float)
+
+        for source, column, line in self.lines:
+            y = sources[source][column].to_numpy(dtype=float)
+            keep = lttb_indices(x, y, self.max_points)
+            line.set_data(x[keep], y[keep])
+
+        # 매수/매도 표시는 다운샘플링하지 않고 모두 그림
+        for strategy, source, column, position, line in self.markers:
+            mask = (sources[strategy]['positions'] == position).to_numpy()
+            line.set_data(x[mask], sources[source][column].to_numpy(dtype=float)[mask])
+
+        keep = lttb_indices(x, close, self.max_points)
+        for i, (ax, (source, upper_column, lower_column, where, style), collection) in enumerate(self.bands):
+            if collection is not None:
+                collection.remove()
+            upper = sources[source][upper_column].to_numpy(dtype=float)[keep]
+            lower = sources[source][lower_column].to_numpy(dtype=float)[keep]
+            condition = None if where is None else (upper >= lower if where == 'above' else upper < lower)
+            self.bands[i] = (ax, self.bands[i][1], ax.fill_between(x[keep], upper, lower, where=condition, **style))
+
+        for ax in self.axes:
+            ax.relim()
+            ax.autoscale_view()
+        if not self.legends_ready:
+            for ax in self.axes:
+                if ax.get_legend_handles_labels()[0]:
+                    ax.legend()
+                ax.grid(True)
+            self.legends_ready = True
+        self.title.set_text(f"{self.spec['title']} - {company_name}")
+        pdf.savefig(self.figure)
+
+
+class ChartRenderer:
+    def __init__(self, max_points=MAX_POINTS, max_candles=MAX_CANDLES):
+        self.max_points = max_points
+        self.max_candles = max_candles
+        self.templates = {}
+
+    def template(self, name):
+        if name not in self.templates:
+            self.templates[name] = FigureTemplate(TEMPLATES[name], self.max_points)
+        return self.templates[name]
+
+    def plot_mplfinance(self, stock_data, signals, company_name, pdf):
+        candles = resample_ohlc(stock_data, self.max_candles)
+        overlays = signals[['upper_band', 'lower_band', 'short_mavg', 'long_mavg']]
+        if len(candles) < len(stock_data):
+            overlays = overlays.groupby(np.arange(len(overlays)) // int(np.ceil(len(stock_data) / self.max_candles))).last()
+            overlays.index = candles.index
+        addplot = [mpf.make_addplot(overlays['upper_band'], linestyle='--', color='black'),
+                   mpf.make_addplot(overlays['lower_band'], linestyle='--', color='black'),
+                   mpf.make_addplot(overlays['short_mavg'], color='red'),
+                   mpf.make_addplot(overlays['long_mavg'], color='blue')]
+        fig, ax = mpf.plot(candles, type='candle', addplot=addplot,
+                           title=f'Moving Average Crossover Strategy - {company_name}', volume=False, style='charles',
+                           warn_too_much_data=len(candles) + 1, returnfig=True)
+        pdf.savefig(fig)
+        plt.close(fig)
+
+    # name: stock_analysis.PDF_PATHS의 키
+    def render_strategy(self, name, company_name, stock_data, signals, pdfs):
+        if name == 'mplfinance':
+            self.plot_mplfinance(stock_data, signals['ma'], company_name, pdfs['mplfinance'])
+        else:
+            self.template(name).render(company_name, stock_data, signals, pdfs[name])
+
+    def render_ticker(self, company_name, stock_data, signals, pdfs):
+        for name in ('ma', 'mplfinance', 'rsi', 'ma_rsi', 'macd', 'stochastic', 'vwma', 'ichimoku', 'adx'):
+            self.render_strategy(name, company_name, stock_data, signals, pdfs)
+
+
+_renderer = None
+
+
+# 프로세스마다 하나의 렌더러를 두어 워커가 여러 티커를 처리할 때 figure를 재사용
+def get_renderer():
+    global _renderer
+    if _renderer is None:
+        _renderer = ChartRenderer()
+    return _renderer
@@ -0,0 +1,167 @@
+import argparse
+import datetime
+import json
+import sys
+
+# 무거운 모듈(pandas, matplotlib, yfinance, stock_analysis 등)은 선택된 하위 명령 안에서만 불러옴
+# --help나 인자 오류는 표준 라이브러리만으로 처리
+TICKERS_PATH = './Ticker.json'
+REGISTRY_PATH = './Ticker.reg'
+CACHE_DIR = './cache'
+START_DATE = '2020-01-01'
+
+
+def today():
+    return datetime.datetime.now().strftime('%Y-%m-%d')
+
+
+def load_tickers(path, selected=None):
+    with open(path, 'r', encoding='utf-8') as f:
+        tickers = json.load(f)
+    if selected:
+        tickers = {ticker: tickers.get(ticker, ticker) for ticker in selected}
+    return tickers
+
+
+# --market/--sector/--name-prefix가 있으면 티커 레지스트리 색인으로 대상 티커를 고름
+def select_tickers(args):
+    if args.market or args.sector or args.name_prefix:
+        from ticker_registry import TickerRegistry
+        tickers = TickerRegistry(args.registry).ticker_dict(market=args.market, sector=args.sector,
+                                                            name_prefix=args.name_prefix)
+        if args.select:
+            tickers = {ticker: name for ticker, name in tickers.items() if ticker in args.select}
+        return tickers
+    return load_tickers(args.tickers, args.select)
+
+
+def make_analyzer(args, **kwargs):
+    from stock_analysis import StockAnalyzer
+    return StockAnalyzer(select_tickers(args), cache_dir=args.cache_dir, **kwargs)
+
+
+def cmd_fetch(args):
+    analyzer = make_analyzer(args, profile=False)
+    stock_frames = analyzer.download_many(list(analyzer.ticker_company_dict), args.start_date, args.end_date,
+                                          max_workers=args.workers)
+    for ticker, error in analyzer.download_failures.items():
+        print(f'{ticker} 주식 데이터 다운로드 실패: {error}')
+    print(f'{len(stock_frames)}개 티커, {sum(len(frame) for frame in stock_frames.values())}개 봉 -> {args.cache_dir}')
+    return 1 if analyzer.download_failures and not stock_frames else 0
+
+
+def cmd_analyze(args):
+    analyzer = make_analyzer(args, fast_render=args.fast_render, result_cache_dir=args.result_cache)
+    analyzer.analyze_stocks(workers=args.workers, render=not args.no_render, pipelined=args.pipelined)
+    if args.result_cache and args.result_cache_max_age is not None:
+        removed = analyzer.result_cache.prune(args.result_cache_max_age)
+        print(f'결과 캐시: {args.result_cache_max_age}일 동안 쓰지 않은 항목 {removed}개 삭제')
+    return 0
+
+
+def cmd_screen(args):
+    analyzer = make_analyzer(args)
+    table = analyzer.screen_stocks(args.strategies, args.max_age, args.end_date, args.output)
+    print(table.head(args.top).to_string(index=False) if len(table) else '시그널 전환 없음')
+    return 0
+
+
+def cmd_render(args):
+    analyzer = make_analyzer(args, fast_render=args.fast_render)
+    analyzer.render_stocks(args.signals, workers=args.workers)
+    return 0
+
+
+def cmd_backtest(args):
+    from portfolio import backtest_portfolio
+    analyzer = make_analyzer(args, profile=False)
+    stock_frames = analyzer.download_many(list(analyzer.ticker_company_dict), args.start_date, args.end_date)
+    result = backtest_portfolio(stock_frames, args.strategy, allocation=args.allocation, rebalance=args.rebalance,
+                                top_n=args.top_n, max_weight=args.max_weight, min_cash=args.min_cash,
+                                commission=args.commission, slippage=args.slippage)
+    for name, value in result['metrics'].items():
+        print(f'{name:<14} {value:>12.4f}')
+    if args.output:
+        result['equity'].to_frame().join([result['exposure'], result['turnover']]).to_csv(args.output)
+    return 0
+
+
+def build_parser():
+    # 티커 선택/캐시 옵션은 모든 하위 명령에 공통 - 하위 명령 뒤에 받아야 nargs='+' 옵션이 명령 이름을 삼키지 않음
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--tickers', default=TICKERS_PATH, help='티커 -> 회사명 JSON (UTF-8)')
+    common.add_argument('--select', nargs='+', help='일부 티커만 실행')
+    common.add_argument('--cache-dir', default=CACHE_DIR, help='OHLCV 캐시 디렉터리')
+    common.add_argument('--registry', default=REGISTRY_PATH, help='티커 레지스트리 (ticker_registry.py)')
+    common.add_argument('--market', nargs='+', help='레지스트리에서 시장으로 선택 (예: KOSPI)')
+    common.add_argument('--sector', nargs='+', help='레지스트리에서 섹터로 선택 (예: 금융)')
+    common.add_argument('--name-prefix', help='레지스트리에서 회사명 접두사로 선택')
+
+    parser = argparse.ArgumentParser(prog='stock_lab', description='stock_lab 주식 분석')
+    subparsers = parser.add_subparsers(dest='command', metavar='command')
+
+    fetch = subparsers.add_parser('fetch', parents=[common], help='OHLCV를 내려받아 캐시에 저장')
+    fetch.add_argument('--start-date', default=START_DATE)
+    fetch.add_argument('--end-date', default=today())
+    fetch.add_argument('--workers', type=int, default=8)
+    fetch.set_defaults(func=cmd_fetch)
+
+    analyze = subparsers.add_parser('analyze', parents=[common], help='전체 전략 계산 + PDF 생성 (기본 명령)')
+    analyze.add_argument('--workers', type=int, help='프로세스 수')
+    analyze.add_argument('--no-render', action='store_true', help='PDF 없이 시그널 표만 저장')
+    analyze.add_argument('--pipelined', action='store_true', help='다운로드/계산/시각화 단계를 겹쳐 실행')
+    analyze.add_argument('--fast-render', action='store_true')
+    analyze.add_argument('--result-cache', help='결과 캐시 디렉터리 (바뀐 티커만 다시 계산)')
+    analyze.add_argument('--result-cache-max-age', type=float, metavar='DAYS',
+                         help='이 기간 동안 쓰지 않은 결과 캐시 항목 삭제')
+    analyze.set_defaults(func=cmd_analyze)
+
+    screen = subparsers.add_parser('screen', parents=[common], help='최근 시그널 전환 스크리닝')
+    screen.add_argument('--strategies', nargs='+')
+    screen.add_argument('--max-age', type=int, default=0, help='최근 몇 개 봉 안의 전환까지 포함할지')
+    screen.add_argument('--end-date')
+    screen.add_argument('--output', help='CSV 경로 (기본 result/screen.csv)')
+    screen.add_argument('--top', type=int, default=30, help='출력할 행 수')
+    screen.set_defaults(func=cmd_screen)
+
+    render = subparsers.add_parser('render', parents=[common], help='저장된 시그널 표로 PDF만 다시 생성')
+    render.add_argument('--signals', default='result/signals.csv.gz')
+    render.add_argument('--workers', type=int)
+    render.add_argument('--fast-render', action='store_true')
+    render.set_defaults(func=cmd_render)
+
+    backtest = subparsers.add_parser('backtest', parents=[common], help='전체 티커 포트폴리오 백테스트')
+    backtest.add_argument('--strategy', default='ma')
+    backtest.add_argument('--allocation', choices=['equal', 'vol', 'top_n'], default='equal')
+    backtest.add_argument('--rebalance', default='M', type=lambda value: int(value) if value.isdigit() else value,
+                          help="리밸런싱 주기 ('W', 'M', 'Q' 또는 봉 수)")
+    backtest.add_argument('--top-n', type=int)
+    backtest.add_argument('--max-weight', type=float, default=1.0)
+    backtest.add_argument('--min-cash', type=float, default=0.0)
+    backtest.add_argument('--commission', type=float, default=0.0)
+    backtest.add_argument('--slippage', type=float, default=0.0)
+    backtest.add_argument('--start-date', default=START_DATE)
+    backtest.add_argument('--end-date', default=today())
+    backtest.add_argument('--output', help='자산 곡선 CSV 경로')
+    backtest.set_defaults(func=cmd_backtest)
+    return parser
+
+
+def parse_args(argv):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    # 명령 없이 실행하면 기존 main.py와 같이 기본 옵션으로 전체 분석
+    if args.command is None:
+        args = parser.parse_args(['analyze'], namespace=args)
+    if args.command == 'backtest' and args.allocation == 'top_n' and args.top_n is None:
+        parser.error('--allocation top_n에는 --top-n이 필요합니다')
+    return args
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else list(argv))
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,315 @@
+import argparse
+import datetime
+import json
+import os
+import shutil
+import socket
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+import pandas as pd
+
+QUEUE_PATH = 'result/queue.sqlite'
+JOB_DIR = 'result/job'
+UNIT_SIZE = 25
+LEASE_SECONDS = 600
+MAX_ATTEMPTS = 3
+
+
+# ---- 작업 큐 ----
+# 작업 단위(unit) 상태: pending -> running -> done / failed
+# 워커는 lease(임대 시간) 동안 작업을 점유하며 주기적으로 연장 - 워커가 죽어 lease가 만료되면 다시 pending으로
+# 같은 인터페이스(put/claim/heartbeat/complete/fail/requeue_expired/counts/units)를 구현하면 다른 큐로 교체 가능
+
+class SQLiteQueue:
+    def __init__(self, path=QUEUE_PATH, max_attempts=MAX_ATTEMPTS):
+        self.path = path
+        self.max_attempts = max_attempts
+        with self.connect() as db:
+            db.execute('CREATE TABLE IF NOT EXISTS units (id INTEGER PRIMARY KEY, payload TEXT NOT NULL, '
+                       "state TEXT NOT NULL DEFAULT 'pending', worker TEXT, lease_until REAL, "
+                       'attempts INTEGER NOT NULL DEFAULT 0, result TEXT, error TEXT)')
+
+    # 호출마다 새 연결 - 여러 스레드/프로세스가 같은 파일을 공유, 쓰기는 BEGIN IMMEDIATE로 직렬화
+    def connect(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        db = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        db.row_factory = sqlite3.Row
+        return Transaction(db)
+
+    # 기존 작업을 지우고 새 작업 단위들을 등록
+    def put(self, payloads):
+        with self.connect() as db:
+            db.execute('DELETE FROM units')
+            db.executemany('INSERT INTO units (id, payload) VALUES (?, ?)',
+                           [(unit_id, json.dumps(payload)) for unit_id, payload in enumerate(payloads)])
+
+    # 대기 중인 작업 하나를 점유 - 없으면 None
+    def claim(self, worker, lease=LEASE_SECONDS):
+        with self.connect() as db:
+            row = db.execute("SELECT * FROM units WHERE state = 'pending' ORDER BY id LIMIT 1").fetchone()
+            if row is None:
+                return None
+            db.execute("UPDATE units SET state = 'running', worker = ?, lease_until = ?, attempts = attempts + 1 "
+                       'WHERE id = ?', (worker, time.time() + lease, row['id']))
+        return {'id': row['id'], 'attempt': row['attempts'] + 1, 'payload': json.loads(row['payload'])}
+
+    # lease 연장 - 이미 다른 워커에게 넘어간 작업이면 False
+    def heartbeat(self, unit_id, worker, lease=LEASE_SECONDS):
+        with self.connect() as db:
+            cursor = db.execute("UPDATE units SET lease_until = ? WHERE id = ? AND state = 'running' AND worker = ?",
+                                (time.time() + lease, unit_id, worker))
+        return cursor.rowcount == 1
+
+    # 완료 기록 - lease 만료 후 다른 워커가 먼저 끝냈으면 무시하고 False
+    def complete(self, unit_id, worker, result):
+        with self.connect() as db:
+            cursor = db.execute("UPDATE units SET state = 'done', result = ?, error = NULL "
+                                "WHERE id = ? AND state = 'running' AND worker = ?",
+                                (json.dumps(result), unit_id, worker))
+        return cursor.rowcount == 1
+
+    # 실패 기록 - 시도 횟수가 남아 있으면 다시 대기열로
+    def fail(self, unit_id, worker, error):
+        with self.connect() as db:
+            db.execute("UPDATE units SET state = CASE WHEN attempts < ? THEN 'pending' ELSE 'failed' END, "
+                       "error = ?, worker = NULL WHERE id = ? AND state = 'running' AND worker = ?",
+                       (self.max_attempts, error, unit_id, worker))
+
+    # lease가 만료된(워커가 죽은) 작업을 다시 대기열로 - 반환값: 되돌린 작업 수
+    def requeue_expired(self):
+        with self.connect() as db:
+            cursor = db.execute("UPDATE units SET state = CASE WHEN attempts < ? THEN 'pending' ELSE 'failed' END, "
+                                "error = 'lease expired: ' || worker, worker = NULL "
+                                "WHERE state = 'running' AND lease_until < ?", (self.max_attempts, time.time()))
+        return cursor.rowcount
+
+    def counts(self):
+        with self.connect() as db:
+            rows = db.execute('SELECT state, COUNT(*) FROM units GROUP BY state').fetchall()
+        return {state: count for state, count in rows}
+
+    def units(self):
+        with self.connect() as db:
+            rows = db.execute('SELECT * FROM units ORDER BY id').fetchall()
+        return [dict(row, payload=json.loads(row['payload']), result=json.loads(row['result']) if row['result'] else None)
+                for row in rows]
+
+
+class Transaction:
+    def __init__(self, db):
+        self.db = db
+
+    def __enter__(self):
+        self.db.execute('BEGIN IMMEDIATE')
+        return self.db
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self.db.execute('ROLLBACK' if exc_type else 'COMMIT')
+        finally:
+            self.db.close()
+
+
+# ---- 코디네이터 ----
+
+# Ticker.json을 작업 단위로 나누어 큐에 등록하고, 작업이 끝나면 result/ 산출물(시그널 표, 전략별 PDF)을 조립
+class Coordinator:
+    def __init__(self, queue, job_dir=JOB_DIR):
+        self.queue = queue
+        self.job_dir = job_dir
+
+    def submit(self, ticker_company_dict, start_date, end_date, unit_size=UNIT_SIZE, render=True, fast_render=False):
+        shutil.rmtree(self.job_dir, ignore_errors=True)
+        os.makedirs(self.job_dir)
+        tickers = list(ticker_company_dict.items())
+        payloads = [{'tickers': dict(tickers[i:i + unit_size]), 'start_date': start_date, 'end_date': end_date,
+                     'render': render, 'fast_render': fast_render, 'job_dir': os.path.abspath(self.job_dir)}
+                    for i in range(0, len(tickers), unit_size)]
+        self.queue.put(payloads)
+        return len(payloads)
+
+    # 모든 작업이 done/failed가 될 때까지 대기하며 lease가 만료된 작업을 다시 대기열로 보냄
+    def wait(self, poll=5.0, timeout=None, log=print):
+        started = time.monotonic()
+        last = None
+        while True:
+            requeued = self.queue.requeue_expired()
+            if requeued:
+                log(f'lease 만료 작업 {requeued}개 재시도')
+            counts = self.queue.counts()
+            if counts != last:
+                log(' '.join(f'{state}={count}' for state, count in sorted(counts.items())))
+                last = counts
+            if not counts.get('pending') and not counts.get('running'):
+                return counts
+            if timeout is not None and time.monotonic() - started > timeout:
+                raise TimeoutError(f'작업 미완료: {counts}')
+            time.sleep(poll)
+
+    # 작업 단위 순서(= Ticker.json 순서)대로 시그널 표와 PDF 조각을 합침
+    def assemble(self, signals_path=None):
+        from signal_store import SIGNALS_PATH, save_signal_table
+        from stock_analysis import PDF_PATHS, merge_pdfs
+        tables, shards, failures = [], [], {}
+        for unit in self.queue.units():
+            if unit['state'] != 'done':
+                for ticker in unit['payload']['tickers']:
+                    failures[ticker] = unit['error']
+                continue
+            result = unit['result']
+            failures.update(result['failures'])
+            if result['tickers']:
+                tables.append(pd.read_pickle(result['signals']))
+                shards.extend(result['pdfs'][ticker] for ticker in result['tickers'] if ticker in result['pdfs'])
+        for ticker, error in failures.items():
+            print(f"{ticker} 분석 실패: {error}")
+        if tables:
+            save_signal_table(signals_path or SIGNALS_PATH, pd.concat(tables))
+        if shards:
+            for name, path in PDF_PATHS.items():
+                merge_pdfs([shard[name] for shard in shards], path)
+        return failures
+
+    def run(self, ticker_company_dict, start_date, end_date, unit_size=UNIT_SIZE, render=True, fast_render=False,
+            poll=5.0, timeout=None):
+        self.submit(ticker_company_dict, start_date, end_date, unit_size, render, fast_render)
+        self.wait(poll, timeout)
+        return self.assemble()
+
+
+# ---- 워커 ----
+
+def worker_id():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+# 작업 단위 하나 - 다운로드, 티커별 계산/시각화 후 결과 파일을 job_dir/units/<id>.<시도> 아래에 저장
+def run_unit(unit, cache_dir=None, data_source=None, profile=False):
+    from plotting import pdf_pages
+    from stock_analysis import StockAnalyzer, PDF_PATHS
+    from signal_store import save_signals
+    payload = unit['payload']
+    analyzer = StockAnalyzer(payload['tickers'], data_source=data_source, cache_dir=cache_dir,
+                             fast_render=payload['fast_render'], profile=profile)
+    unit_dir = os.path.join(payload['job_dir'], 'units', f"{unit['id']:06d}.{unit['attempt']}")
+    shutil.rmtree(unit_dir, ignore_errors=True)
+    os.makedirs(unit_dir)
+
+    stock_frames = analyzer.download_many(list(payload['tickers']), payload['start_date'], payload['end_date'])
+    failures = {ticker: str(error) for ticker, error in analyzer.download_failures.items()}
+    results, pdfs = {}, {}
+    for index, ticker in enumerate(payload['tickers']):
+        if ticker not in stock_frames:
+            continue
+        shard_paths = None
+        try:
+            if payload['render']:
+                shard_paths = {name: os.path.join(unit_dir, f'{index:04d}_{name}.pdf') for name in PDF_PATHS}
+                shard_pdfs = {name: pdf_pages(path) for name, path in shard_paths.items()}
+                try:
+                    results[ticker] = analyzer.process_ticker(ticker, stock_frames[ticker], None, shard_pdfs)
+                finally:
+                    for pdf in shard_pdfs.values():
+                        pdf.close()
+            else:
+                results[ticker] = analyzer.process_ticker(ticker, stock_frames[ticker], None, None)
+        except Exception as e:
+            failures[ticker] = f'{type(e).__name__}: {e}'
+            results.pop(ticker, None)
+            continue
+        if shard_paths is not None:
+            pdfs[ticker] = shard_paths
+
+    signals_path = os.path.join(unit_dir, 'signals.pkl')
+    if results:
+        save_signals(signals_path, results)
+    return {'tickers': list(results), 'failures': failures, 'signals': signals_path, 'pdfs': pdfs}
+
+
+# 큐에서 작업을 가져와 처리 - 처리 중에는 별도 스레드가 lease를 연장
+# idle_exit=True이면 가져올 작업이 없을 때 종료, 아니면 poll초마다 다시 확인
+def run_worker(queue, lease=LEASE_SECONDS, poll=5.0, idle_exit=True, cache_dir=None, data_source=None, name=None,
+               log=print):
+    name = name or worker_id()
+    processed = 0
+    while True:
+        unit = queue.claim(name, lease)
+        if unit is None:
+            if idle_exit:
+                return processed
+            time.sleep(poll)
+            continue
+
+        stop = threading.Event()
+
+        def keep_lease():
+            while not stop.wait(lease / 3):
+                queue.heartbeat(unit['id'], name, lease)
+
+        keeper = threading.Thread(target=keep_lease, daemon=True)
+        keeper.start()
+        try:
+            result = run_unit(unit, cache_dir, data_source)
+        except Exception as e:
+            queue.fail(unit['id'], name, f'{type(e).__name__}: {e}')
+            log(f"작업 {unit['id']} 실패 (시도 {unit['attempt']}): {e}")
+        else:
+            queue.complete(unit['id'], name, result)
+            log(f"작업 {unit['id']} 완료: {len(result['tickers'])}개 티커, 실패 {len(result['failures'])}개")
+        finally:
+            stop.set()
+            keeper.join()
+        processed += 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='stock_lab 분산 분석 (코디네이터 / 워커)')
+    parser.add_argument('--queue', default=QUEUE_PATH, help='SQLite 작업 큐 경로 (모든 노드가 공유)')
+    subparsers = parser.add_subparsers(dest='role', required=True)
+
+    coordinator = subparsers.add_parser('coordinator', help='작업 등록, 진행 감시, result/ 조립')
+    coordinator.add_argument('--tickers', default='./Ticker.json')
+    coordinator.add_argument('--job-dir', default=JOB_DIR, help='워커 결과 디렉터리 (모든 노드가 공유)')
+    coordinator.add_argument('--unit-size', type=int, default=UNIT_SIZE)
+    coordinator.add_argument('--start-date', default='2020-01-01')
+    coordinator.add_argument('--end-date', default=datetime.datetime.now().strftime('%Y-%m-%d'))
+    coordinator.add_argument('--no-render', action='store_true')
+    coordinator.add_argument('--fast-render', action='store_true')
+    coordinator.add_argument('--poll', type=float, default=5.0)
+    coordinator.add_argument('--workers', type=int, default=0, help='코디네이터와 함께 실행할 로컬 워커 프로세스 수')
+
+    worker = subparsers.add_parser('worker', help='작업 처리')
+    worker.add_argument('--lease', type=float, default=LEASE_SECONDS)
+    worker.add_argument('--poll', type=float, default=5.0)
+    worker.add_argument('--wait', action='store_true', help='작업이 없어도 종료하지 않고 대기')
+    worker.add_argument('--cache-dir', help='OHLCV 캐시 디렉터리')
+    args = parser.parse_args(argv)
+
+    queue = SQLiteQueue(args.queue)
+    if args.role == 'worker':
+        run_worker(queue, args.lease, args.poll, idle_exit=not args.wait, cache_dir=args.cache_dir)
+        return 0
+
+    with open(args.tickers, 'r', encoding='utf-8') as f:
+        ticker_company_dict = json.load(f)
+    runner = Coordinator(queue, args.job_dir)
+    units = runner.submit(ticker_company_dict, args.start_date, args.end_date, args.unit_size,
+                          render=not args.no_render, fast_render=args.fast_render)
+    print(f'{len(ticker_company_dict)}개 티커 -> 작업 {units}개')
+    local_workers = [subprocess_worker(args.queue) for _ in range(args.workers)]
+    runner.wait(args.poll)
+    for process in local_workers:
+        process.wait()
+    runner.assemble()
+    return 0
+
+
+def subprocess_worker(queue_path):
+    return subprocess.Popen([sys.executable, os.path.abspath(__file__), '--queue', queue_path, 'worker'])
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,108 @@
+import os
+import json
+import numpy as np
+import pandas as pd
+
+# 증분 갱신 때 다시 받아 캐시와 비교하는 마지막 봉 수
+OVERLAP_BARS = 5
+
+
+# yfinance 데이터 소스 (기본값)
+class YFinanceSource:
+    name = 'yfinance'
+    rate_limit = 2.0  # 초당 최대 요청 수
+
+    # yf.download는 모듈 전역 결과(shared._DFS/_ERRORS)를 초기화하고 기다리므로 여러 스레드에서 동시에 부르면
+    # 서로의 결과를 지움 - 티커별 Ticker.history 사용 (download와 같은 컬럼: 수정주가 미적용, 배당/분할 컬럼 제외)
+    def fetch(self, ticker, start_date, end_date):
+        import yfinance as yf
+        return yf.Ticker(ticker).history(start=start_date, end=end_date, auto_adjust=False, actions=False)
+
+
+# 로컬 CSV 파일(<directory>/<ticker>.csv)을 읽는 데이터 소스 - 네트워크 없이 테스트할 때 사용
+class CsvDirectorySource:
+    name = 'csv'
+
+    def __init__(self, directory, rate_limit=None):
+        self.directory = directory
+        self.rate_limit = rate_limit
+
+    def fetch(self, ticker, start_date, end_date):
+        path = os.path.join(self.directory, f'{ticker}.csv')
+        data = pd.read_csv(path, index_col=0, parse_dates=True)
+        # yfinance와 동일하게 end_date는 포함하지 않음
+        mask = (data.index >= pd.Timestamp(start_date)) & (data.index < pd.Timestamp(end_date))
+        return data.loc[mask]
+
+
+# 티커별 OHLCV 이력을 컬럼 단위(.npz)로 디스크에 저장하고, 이후 실행에서는 마지막 날짜 이후만 받아서 이어 붙이는 캐시
+class OHLCVCache:
+    def __init__(self, source, cache_dir='cache', overlap_bars=OVERLAP_BARS):
+        self.source = source
+        self.cache_dir = cache_dir
+        self.overlap_bars = overlap_bars
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def cache_path(self, ticker):
+        return os.path.join(self.cache_dir, f'{ticker}.npz')
+
+    def read(self, ticker):
+        path = self.cache_path(ticker)
+        if not os.path.exists(path):
+            return None, None
+        with np.load(path, allow_pickle=False) as archive:
+            meta = json.loads(str(archive['meta']))
+            index = pd.DatetimeIndex(archive['index'].astype('datetime64[ns]'), name=meta['index_name'])
+            data = pd.DataFrame({column: archive[f'col_{i}'] for i, column in enumerate(meta['columns'])},
+                                index=index)
+        return data, meta
+
+    def write(self, ticker, data, meta):
+        meta = dict(meta, columns=[str(column) for column in data.columns], index_name=data.index.name)
+        arrays = {f'col_{i}': data[column].to_numpy() for i, column in enumerate(data.columns)}
+        arrays['index'] = data.index.values.astype('datetime64[ns]').astype(np.int64)
+        arrays['meta'] = np.array(json.dumps(meta))
+        # 중간에 중단되어도 캐시 파일이 깨지지 않도록 임시 파일에 쓴 후 교체
+        tmp_path = self.cache_path(ticker) + '.tmp.npz'
+        np.savez(tmp_path, **arrays)
+        os.replace(tmp_path, self.cache_path(ticker))
+
+    # 캐시의 마지막 봉들과 새로 받은 같은 날짜 봉의 값이 모두 같은지 (겹치는 날짜가 빠져 있어도 불일치)
+    @staticmethod
+    def matches(overlap, delta):
+        if not overlap.index.isin(delta.index).all():
+            return False
+        columns = [column for column in overlap.columns if column in delta.columns]
+        old = overlap[columns].to_numpy(dtype=float)
+        new = delta.loc[overlap.index, columns].to_numpy(dtype=float)
+        return bool(np.isclose(old, new, rtol=1e-9, atol=0, equal_nan=True).all())
+
+    def load(self, ticker, start_date, end_date):
+        start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+        cached, meta = self.read(ticker)
+
+        if cached is None or start < pd.Timestamp(meta['start']):
+            # 캐시가 없거나 요청 구간이 캐시 시작일보다 앞서면 전체 구간을 새로 받음
+            data = self.source.fetch(ticker, start_date, end_date)
+            # 빈 결과(일시적 오류일 수 있음)는 캐시하지 않음 - 재시도 때 다시 요청
+            if len(data):
+                self.write(ticker, data, {'start': str(start.date()), 'fetched_until': str(end.date())})
+        elif end > pd.Timestamp(meta['fetched_until']):
+            # 마지막 overlap_bars개 캐시 봉부터 증분 요청 - 겹치는 구간이 캐시와 다르면(분할/배당으로
+            # 과거 가격이 수정됨) 캐시 전체가 수정 전 가격이므로 전체 구간을 다시 받음
+            overlap = cached.iloc[-self.overlap_bars:]
+            fetch_start = overlap.index[0] if len(overlap) else pd.Timestamp(meta['start'])
+            delta = self.source.fetch(ticker, str(fetch_start.date()), end_date)
+            if len(delta) and not self.matches(overlap, delta):
+                data = self.source.fetch(ticker, meta['start'], end_date)
+            elif len(delta):
+                data = pd.concat([cached, delta[cached.columns] if len(cached.columns) else delta])
+                data = data[~data.index.duplicated(keep='last')].sort_index()
+            else:
+                data = cached
+            meta = dict(meta, fetched_until=str(end.date()))
+            self.write(ticker, data, meta)
+        else:
+            data = cached
+
+        return data.loc[(data.index >= start) & (data.index < end)].copy()
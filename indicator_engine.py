@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+from rolling_extrema import rolling_extrema
+
+
+# 티커 하나에 대한 지표 계산 엔진 - (시리즈, 지표, 파라미터) 키로 결과를 캐시하여
+# 여러 전략이 같은 rolling/ewm 계산을 한 번만 수행하도록 함
+class IndicatorEngine:
+    def __init__(self, data):
+        self.data = data
+        self.cache = {}
+        self.keys = {}
+
+    # source는 컬럼 이름, 캐시 키, 또는 이 엔진이 반환한 시리즈
+    def key_of(self, source):
+        if isinstance(source, (str, tuple)):
+            return source
+        return self.keys[id(source)]
+
+    def series(self, source):
+        key = self.key_of(source)
+        if isinstance(key, tuple):
+            return self.cache[key]
+        return self.data[key]
+
+    def get(self, key, compute):
+        if key not in self.cache:
+            result = compute()
+            self.cache[key] = result
+            self.keys[id(result)] = key
+        return self.cache[key]
+
+    def rolling(self, source, stat, window, min_periods=None):
+        key = (self.key_of(source), 'rolling_' + stat, window, min_periods)
+        if stat in ('max', 'min') and min_periods is None:
+            return self.rolling_many(source, stat, [window])[0]
+        return self.get(key, lambda: getattr(self.series(source).rolling(window=window, min_periods=min_periods), stat)())
+
+    # 이동 최대/최소를 여러 창 길이에 대해 O(n) 커널로 한 번에 계산하여 캐시
+    def rolling_many(self, source, stat, windows):
+        keys = [(self.key_of(source), 'rolling_' + stat, window, None) for window in windows]
+        missing = [window for window, key in zip(windows, keys) if key not in self.cache]
+        if missing:
+            series = self.series(source)
+            computed = rolling_extrema(series.to_numpy(dtype=float), missing, stats=(stat,))
+            for window in missing:
+                values = pd.Series(computed[(stat, window)], index=series.index, name=series.name)
+                self.get((self.key_of(source), 'rolling_' + stat, window, None), lambda: values)
+        return [self.cache[key] for key in keys]
+
+    def ewm(self, source, span, adjust=True):
+        key = (self.key_of(source), 'ewm', span, adjust)
+        return self.get(key, lambda: self.series(source).ewm(span=span, adjust=adjust).mean())
+
+    def diff(self, source, periods=1):
+        key = (self.key_of(source), 'diff', periods)
+        return self.get(key, lambda: self.series(source).diff(periods))
+
+    def shift(self, source, periods=1):
+        key = (self.key_of(source), 'shift', periods)
+        return self.get(key, lambda: self.series(source).shift(periods))
+
+    # 상승폭 / 하락폭 (RSI 계산용)
+    def gain(self, source, periods=1):
+        delta = self.diff(source, periods)
+        return self.get((self.key_of(source), 'gain', periods), lambda: delta.where(delta > 0, 0))
+
+    def loss(self, source, periods=1):
+        delta = self.diff(source, periods)
+        return self.get((self.key_of(source), 'loss', periods), lambda: -delta.where(delta < 0, 0))
+
+    def product(self, left, right):
+        key = (self.key_of(left), 'mul', self.key_of(right))
+        return self.get(key, lambda: self.series(left) * self.series(right))
+
+    # True Range (ADX 계산용)
+    def true_range(self):
+        def compute():
+            prev_close = self.shift('Close')
+            tr1 = self.data['High'] - self.data['Low']
+            tr2 = abs(self.data['High'] - prev_close)
+            tr3 = abs(self.data['Low'] - prev_close)
+            return pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
+        return self.get(('HLC', 'true_range'), compute)
+
+    # 방향성 지표 +DM / -DM (ADX 계산용)
+    def directional_movement(self):
+        def compute_plus():
+            delta_high, delta_low = self.diff('High'), self.diff('Low')
+            return pd.Series(np.where((delta_high > delta_low) & (delta_high > 0), delta_high, 0.0),
+                             index=self.data.index)
+
+        def compute_minus():
+            delta_high, delta_low = self.diff('High'), self.diff('Low')
+            return pd.Series(np.where((delta_low > delta_high) & (delta_low > 0), delta_low, 0.0),
+                             index=self.data.index)
+        return self.get(('HL', 'plus_dm'), compute_plus), self.get(('HL', 'minus_dm'), compute_minus)
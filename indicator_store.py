@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+
+
+# 티커 하나의 지표 결과 저장소 - 원본 OHLCV 프레임은 수정하지 않고 지표 컬럼을 별도 배열로 보관
+# 계산/전략/시각화 코드가 쓰는 DataFrame 연산(data['컬럼'] 읽기/쓰기, data.index, len)을 그대로 지원
+# 컬럼마다 연속된 1차원 배열 하나(dtype=float32 지정 시 절반 크기)를 두고, 읽을 때는 복사 없는 Series 뷰를 반환
+class IndicatorStore:
+    __slots__ = ('base', 'index', 'dtype', 'names', 'arrays', 'views')
+
+    def __init__(self, base, dtype=np.float64):
+        self.base = base
+        self.index = base.index
+        self.dtype = np.dtype(dtype)
+        self.names = {}
+        self.arrays = []
+        self.views = {}
+
+    @property
+    def columns(self):
+        return pd.Index(list(self.base.columns) + [name for name in self.names if name not in self.base.columns])
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, name):
+        return name in self.names or name in self.base.columns
+
+    def __getitem__(self, key):
+        if isinstance(key, list):
+            if all(name not in self.names for name in key):
+                return self.base[key]
+            return pd.DataFrame({name: self[name] for name in key}, index=self.index)
+        if key in self.names:
+            if key not in self.views:
+                self.views[key] = pd.Series(self.arrays[self.names[key]], index=self.index, name=key, copy=False)
+            return self.views[key]
+        return self.base[key]
+
+    # dtype이 같으면 입력 배열을 복사 없이 보관
+    # 같은 이름으로 다시 쓰면 새 배열로 교체 - 이전에 반환한 뷰의 값은 바뀌지 않음
+    def __setitem__(self, name, values):
+        if isinstance(values, pd.Series) and not values.index.equals(self.index):
+            values = values.reindex(self.index)
+        if np.ndim(values) == 0:
+            array = np.full(len(self.index), values, dtype=self.dtype)
+        else:
+            array = np.asarray(values, dtype=self.dtype)
+        if array.shape != (len(self.index),):
+            raise ValueError(f'{name}: expected {len(self.index)} values, got shape {array.shape}')
+        if name in self.names:
+            self.arrays[self.names[name]] = array
+            self.views.pop(name, None)
+        else:
+            self.names[name] = len(self.arrays)
+            self.arrays.append(array)
+
+    # 지표 배열이 차지하는 메모리 (원본 OHLCV 제외)
+    @property
+    def nbytes(self):
+        return sum(array.nbytes for array in self.arrays)
+
+    # 원본 OHLCV + 지표 컬럼을 하나의 DataFrame으로 (저장/내보내기용 - 복사 발생)
+    def to_frame(self):
+        base = self.base.drop(columns=[name for name in self.names if name in self.base.columns])
+        indicators = pd.DataFrame({name: self.arrays[position] for name, position in self.names.items()},
+                                  index=self.index)
+        return pd.concat([base, indicators], axis=1)
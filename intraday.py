@@ -0,0 +1,252 @@
+import argparse
+import sys
+import time
+import numpy as np
+import pandas as pd
+from pandas.tseries.frequencies import to_offset
+from bb_strategy import BollingerBandsStrategy
+from indicator_engine import IndicatorEngine
+from indicator_store import IndicatorStore
+from stock_analysis import StockAnalyzer
+
+CHUNK_ROWS = 1000000
+TIME_COLUMNS = ('Timestamp', 'Datetime', 'Date', 'Time')
+BAR_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume', 'VWAP', 'Trades']
+# 누적 상태 배열 순서: 구간 시작(ns), 시가, 고가, 저가, 종가, 거래량, 가격x거래량, 체결 수
+FIELDS = ('bucket', 'open', 'high', 'low', 'close', 'volume', 'pv', 'trades')
+
+# 분/틱 봉에서 쓰는 전략 - StockAnalyzer / 전략 클래스의 계산 메서드를 그대로 사용 (기본 파라미터)
+INTRADAY_SIGNALS = {
+    'macd': lambda a, data, engine: a.macd_strategy(a.calculate_macd(data, engine=engine)),
+    'rsi': lambda a, data, engine: a.rsi_strategy(data, 14, engine),
+    'bollinger': lambda a, data, engine: BollingerBandsStrategy(data, 20, 2, engine=engine).generate_signals(),
+    'vwma': lambda a, data, engine: a.vwma_strategy(a.calculate_vwma(data, engine=engine), engine),
+}
+
+
+# 봉 크기('1min', '5min', '1h', '1D' 등 고정 길이) -> 나노초
+def bar_nanos(freq):
+    try:
+        return to_offset(freq).nanos
+    except ValueError:
+        raise ValueError(f'고정 길이 봉 크기만 지원합니다: {freq}')
+
+
+# 시간순 틱/분봉 배열을 봉 구간별로 집계 - 입력이 정렬되어 있으므로 groupby 없이 구간 경계에서 reduceat
+# 같은 봉 안에서 순서가 바뀌어도 시가/종가가 틀리므로 구간이 아니라 시각 자체의 순서를 검사
+def aggregate_arrays(times, open_, high, low, close, volume, pv, trades, step, offset=0):
+    if len(times) > 1 and (times[1:] < times[:-1]).any():
+        raise ValueError('시간순으로 정렬된 입력만 집계할 수 있습니다')
+    bucket = (times - offset) // step * step + offset
+    starts = np.flatnonzero(np.concatenate([[True], bucket[1:] != bucket[:-1]]))
+    ends = np.concatenate([starts[1:], [len(bucket)]]) - 1
+    return [bucket[starts], open_[starts], np.maximum.reduceat(high, starts), np.minimum.reduceat(low, starts),
+            close[ends], np.add.reduceat(volume, starts), np.add.reduceat(pv, starts),
+            np.add.reduceat(trades, starts)]
+
+
+# 청크 단위 봉 집계기 - 마지막(아직 끝나지 않았을 수 있는) 봉 하나만 다음 청크로 넘김
+# update()는 완성된 봉만 반환하고, 입력이 끝나면 flush()로 마지막 봉을 반환
+# VWAP은 구간별 가격x거래량 합 / 거래량 합으로 누적 (봉 VWAP의 평균이 아님)
+class BarAggregator:
+    def __init__(self, freq='1min', offset=None):
+        self.freq = freq
+        self.step = bar_nanos(freq)
+        # 봉 시작 기준 (예: '9h'이면 일봉이 09:00에 시작)
+        self.offset = pd.Timedelta(offset).value if offset is not None else 0
+        self.partial = None
+        self.last_time = None
+        self.rows = 0
+
+    def update(self, times, open_, high, low, close, volume, pv, trades):
+        if not len(times):
+            return self.frame(None)
+        # 이전 청크의 마지막 시각보다 앞선 행이 있으면 오류
+        if self.last_time is not None and times[0] < self.last_time:
+            raise ValueError('시간순으로 정렬된 입력만 집계할 수 있습니다')
+        bars = aggregate_arrays(times, open_, high, low, close, volume, pv, trades, self.step, self.offset)
+        self.rows += len(times)
+        self.last_time = times[-1]
+        if self.partial is not None:
+            carry = self.partial
+            if bars[0][0] == carry[0][0]:
+                bars[1][0] = carry[1][0]
+                bars[2][0] = max(bars[2][0], carry[2][0])
+                bars[3][0] = min(bars[3][0], carry[3][0])
+                for i in (5, 6, 7):
+                    bars[i][0] += carry[i][0]
+            else:
+                bars = [np.concatenate([c, b]) for c, b in zip(carry, bars)]
+        self.partial = [values[-1:].copy() for values in bars]
+        return self.frame([values[:-1] for values in bars])
+
+    def flush(self):
+        bars, self.partial = self.partial, None
+        return self.frame(bars)
+
+    def frame(self, bars):
+        if bars is None:
+            bars = [np.zeros(0, dtype='i8')] + [np.zeros(0) for _ in FIELDS[1:]]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            vwap = np.where(bars[5] > 0, bars[6] / bars[5], np.nan)
+        index = pd.DatetimeIndex(bars[0].astype('datetime64[ns]'), name='Date')
+        return pd.DataFrame({'Open': bars[1], 'High': bars[2], 'Low': bars[3], 'Close': bars[4], 'Volume': bars[5],
+                             'VWAP': vwap, 'Trades': bars[7]}, index=index, columns=BAR_COLUMNS)
+
+
+# CSV 청크 -> 집계 입력 배열
+# 틱 파일: 시각, Price, Volume / 분봉 파일: 시각, Open, High, Low, Close, Volume[, VWAP][, Trades]
+# 분봉에 VWAP이 없으면 (고가+저가+종가)/3을 봉 내 평균 체결가로 사용
+def chunk_arrays(chunk, time_column, time_unit='ms', time_format=None, tz=None):
+    times = chunk[time_column]
+    if pd.api.types.is_numeric_dtype(times):
+        times = pd.to_datetime(times, unit=time_unit)
+    else:
+        times = pd.to_datetime(times, format=time_format)
+    if times.dt.tz is not None:
+        times = times.dt.tz_convert(tz or 'UTC').dt.tz_localize(None)
+    times = times.to_numpy(dtype='datetime64[ns]').view('i8')
+    volume = np.nan_to_num(chunk['Volume'].to_numpy(dtype=float))
+    if 'Price' in chunk:
+        price = chunk['Price'].to_numpy(dtype=float)
+        open_ = high = low = close = price
+        pv = price * volume
+        trades = np.ones(len(chunk))
+    else:
+        open_, high, low, close = (chunk[name].to_numpy(dtype=float) for name in ('Open', 'High', 'Low', 'Close'))
+        average = chunk['VWAP'].to_numpy(dtype=float) if 'VWAP' in chunk else (high + low + close) / 3
+        pv = average * volume
+        trades = chunk['Trades'].to_numpy(dtype=float) if 'Trades' in chunk else np.ones(len(chunk))
+    # 가격이 없는 행(체결 없음)은 제외
+    valid = ~np.isnan(close)
+    if not valid.all():
+        times, open_, high, low, close, volume, pv, trades = (
+            values[valid] for values in (times, open_, high, low, close, volume, pv, trades))
+    return times, open_, high, low, close, volume, pv, trades
+
+
+def time_column_of(columns, time_column=None):
+    if time_column is not None:
+        return time_column
+    for name in TIME_COLUMNS:
+        if name in columns:
+            return name
+    raise ValueError(f'시각 컬럼이 없습니다 ({", ".join(TIME_COLUMNS)} 중 하나 필요): {list(columns)}')
+
+
+# 파일을 chunk_rows 행씩 읽어 완성된 봉 DataFrame을 차례로 반환 - 메모리는 청크 하나 + 봉 하나
+# columns: 파일 컬럼명 -> 표준 컬럼명 (예: {'ts': 'Timestamp', 'px': 'Price', 'qty': 'Volume'})
+def stream_bars(path, freq='1min', chunk_rows=CHUNK_ROWS, offset=None, columns=None, time_column=None,
+                time_unit='ms', time_format=None, tz=None, aggregator=None):
+    aggregator = aggregator if aggregator is not None else BarAggregator(freq, offset)
+    for chunk in pd.read_csv(path, chunksize=chunk_rows):
+        if columns:
+            chunk = chunk.rename(columns=columns)
+        column = time_column_of(chunk.columns, time_column)
+        bars = aggregator.update(*chunk_arrays(chunk, column, time_unit, time_format, tz))
+        if len(bars):
+            yield bars
+    bars = aggregator.flush()
+    if len(bars):
+        yield bars
+
+
+# 봉 전체를 DataFrame 하나로 (StockAnalyzer 입력 형식: Date 인덱스, OHLCV 컬럼)
+def read_bars(path, freq='1min', **kwargs):
+    frames = list(stream_bars(path, freq, **kwargs))
+    return pd.concat(frames) if frames else BarAggregator(freq).frame(None)
+
+
+# 집계한 봉으로 전략 시그널 계산 - 일봉과 같은 StockAnalyzer 지표/전략 메서드 사용
+def intraday_signals(bars, strategies=None, analyzer=None):
+    analyzer = analyzer if analyzer is not None else StockAnalyzer({}, profile=False)
+    data = IndicatorStore(bars)
+    engine = IndicatorEngine(data)
+    return {name: INTRADAY_SIGNALS[name](analyzer, data, engine) for name in (strategies or INTRADAY_SIGNALS)}
+
+
+# ---- 집계 처리량 벤치마크 ----
+
+# 재현 가능한 합성 틱 파일 (초당 ticks_per_second건, 정규장 09:00~15:30)
+def write_synthetic_ticks(path, n_rows, ticks_per_second=10, seed=0, start='2024-01-02 09:00', chunk_rows=CHUNK_ROWS):
+    rng = np.random.default_rng(seed)
+    session = int(6.5 * 3600 * ticks_per_second)
+    price = 10000.0
+    written = 0
+    with open(path, 'w') as f:
+        f.write('Timestamp,Price,Volume\n')
+        while written < n_rows:
+            n = min(chunk_rows, n_rows - written)
+            tick = np.arange(written, written + n)
+            days, within = np.divmod(tick, session)
+            times = (pd.Timestamp(start).value // 10 ** 6 + days * 86400000 + within * 1000 // ticks_per_second)
+            prices = np.round(price * np.exp(np.cumsum(rng.normal(0, 0.0002, n))), 1)
+            price = prices[-1]
+            volume = rng.integers(1, 500, n)
+            pd.DataFrame({'Timestamp': times, 'Price': prices, 'Volume': volume}).to_csv(
+                f, header=False, index=False)
+            written += n
+
+
+# 파일 읽기를 포함한 전체 처리량과 집계만의 처리량 (행/초)
+def benchmark_aggregation(path, freqs=('1min', '5min', '1h', '1D'), chunk_rows=CHUNK_ROWS, log=print):
+    results = {}
+    for freq in freqs:
+        aggregator = BarAggregator(freq)
+        start = time.perf_counter()
+        bars = sum(len(frame) for frame in stream_bars(path, freq, chunk_rows, aggregator=aggregator))
+        seconds = time.perf_counter() - start
+        results[freq] = {'rows': aggregator.rows, 'bars': bars, 'seconds': round(seconds, 4),
+                         'rows_per_sec': int(aggregator.rows / seconds) if seconds > 0 else None}
+        log(f'{freq:<6} {aggregator.rows:>12,}행 -> {bars:>10,}봉 {seconds:8.3f}s '
+            f'{results[freq]["rows_per_sec"]:>14,} rows/s')
+
+    # CSV 파싱을 뺀 집계 자체의 처리량 (청크 하나를 메모리에 두고 반복)
+    chunk = next(iter(pd.read_csv(path, chunksize=chunk_rows)))
+    arrays = chunk_arrays(chunk, time_column_of(chunk.columns))
+    for freq in freqs:
+        aggregator = BarAggregator(freq)
+        start = time.perf_counter()
+        aggregator.update(*arrays)
+        aggregator.flush()
+        seconds = time.perf_counter() - start
+        results[f'{freq}/aggregate'] = {'rows': len(chunk), 'seconds': round(seconds, 6),
+                                        'rows_per_sec': int(len(chunk) / seconds) if seconds > 0 else None}
+        log(f'{freq:<6} 집계만 {len(chunk):>10,}행 {seconds:8.4f}s {results[f"{freq}/aggregate"]["rows_per_sec"]:>14,} rows/s')
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='틱/분봉 파일을 봉으로 집계')
+    parser.add_argument('path', nargs='?', help='틱/분봉 CSV (gzip 가능)')
+    parser.add_argument('--freq', default='5min', help="봉 크기 ('1min', '5min', '1h', '1D')")
+    parser.add_argument('--offset', help="봉 시작 기준 (예: '9h')")
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS)
+    parser.add_argument('--output', help='봉 CSV 저장 경로')
+    parser.add_argument('--signals', nargs='*', choices=list(INTRADAY_SIGNALS), help='봉으로 전략 시그널 계산')
+    parser.add_argument('--benchmark', type=int, metavar='ROWS', help='합성 틱 ROWS행으로 집계 처리량 측정')
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        import os
+        import tempfile
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'ticks.csv')
+            write_synthetic_ticks(path, args.benchmark, chunk_rows=args.chunk_rows)
+            benchmark_aggregation(path, chunk_rows=args.chunk_rows)
+        return 0
+    if not args.path:
+        parser.error('path 또는 --benchmark가 필요합니다')
+
+    bars = read_bars(args.path, args.freq, chunk_rows=args.chunk_rows, offset=args.offset)
+    print(f'{len(bars)}개 봉 ({bars.index.min()} ~ {bars.index.max()})')
+    if args.output:
+        bars.to_csv(args.output)
+    if args.signals is not None:
+        for name, signals in intraday_signals(bars, args.signals or None).items():
+            print(f'{name:<10} 매수 {int((signals["positions"] == 1).sum())}회, 매도 {int((signals["positions"] == -1).sum())}회')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,28 +1,34 @@
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import warnings
-warnings.filterwarnings('ignore')
+from indicator_engine import IndicatorEngine
+from signal_rules import SignalRules
+from plotting import pyplot
+
+# 이동평균 교차 매수 + RSI 과매수 구간 제외
+MA_RSI_RULES = '''
+buy when short_mavg > long_mavg
+flat when rsi > 70
+'''
 
 
 class MovingAverageRSIStrategy:
-    def __init__(self, data, short_window, long_window, rsi_window):
+    def __init__(self, data, short_window, long_window, rsi_window, engine=None):
         self.data = data
         self.short_window = short_window
         self.long_window = long_window
         self.rsi_window = rsi_window
+        self.engine = engine if engine is not None else IndicatorEngine(data)
 
     def calculate_moving_average(self):
-        self.data['short_mavg'] = self.data['Close'].rolling(window=self.short_window, min_periods=1).mean()
-        self.data['long_mavg'] = self.data['Close'].rolling(window=self.long_window, min_periods=1).mean()
+        self.data['short_mavg'] = self.engine.rolling('Close', 'mean', self.short_window, min_periods=1)
+        self.data['long_mavg'] = self.engine.rolling('Close', 'mean', self.long_window, min_periods=1)
 
     def calculate_rsi(self):
-        delta = self.data['Close'].diff(1)
-        gain = (delta.where(delta > 0, 0)).rolling(window=self.rsi_window, min_periods=1).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=self.rsi_window, min_periods=1).mean()
+        gain = self.engine.rolling(self.engine.gain('Close'), 'mean', self.rsi_window, min_periods=1)
+        loss = self.engine.rolling(self.engine.loss('Close'), 'mean', self.rsi_window, min_periods=1)
 
-        avg_gain = gain.ewm(span=self.rsi_window).mean()
-        avg_loss = loss.ewm(span=self.rsi_window).mean()
+        avg_gain = self.engine.ewm(gain, self.rsi_window)
+        avg_loss = self.engine.ewm(loss, self.rsi_window)
 
         rs = avg_gain / avg_loss
         self.data['rsi'] = 100 - (100 / (1 + rs))
@@ -31,23 +37,14 @@ class MovingAverageRSIStrategy:
         self.calculate_moving_average()
         self.calculate_rsi()
 
+        # 매매 시그널 및 포지션 변경 시그널 생성 (처음 short_window개 행은 시그널 없음)
         signals = pd.DataFrame(index=self.data.index)
-        signals['signal'] = 0.0
-
-        # 이동평균 교차 매매 시그널 생성
-        signals['signal'][self.short_window:] = np.where(
-            self.data['short_mavg'][self.short_window:] > self.data['long_mavg'][self.short_window:], 1.0, 0.0)
-
-        # RSI 조건 추가
-        signals['signal'][(self.data['rsi'] < 30) & (signals['signal'] == 1.0)] = 1.0
-        signals['signal'][(self.data['rsi'] > 70) & (signals['signal'] == 1.0)] = 0.0
-
-        # 포지션 변경 시그널 생성
-        signals['positions'] = signals['signal'].diff()
+        signals['signal'], signals['positions'] = SignalRules(MA_RSI_RULES, warmup=self.short_window).evaluate(self.data)
 
         return signals
 
     def plot_moving_average_rsi_strategy(self, stock_data, signals, company_name, pdf):
+        plt = pyplot()
         self.calculate_moving_average()  # Ensure moving averages are calculated
         plt.figure(figsize=(12, 6))
         plt.rcParams['font.family'] = 'Malgun Gothic'
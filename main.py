@@ -1,97 +1,88 @@
-import os
-import subprocess
 import sys
 import json
-import numpy as np
-import pandas as pd
-import FinanceDataReader as fdr
-from stock_analysis import  *
+from cli import main
 VERSION = '0.0.1'
 
+# (티커, 회사명, 섹터) - 시장/통화는 티커 접미사로 정함 (.KS: KOSPI/KRW, 그 외: NASDAQ/USD)
+TICKER_RECORDS = [
+    ('259960.KS', '크래프톤', '커뮤니케이션서비스'),
+    ('000270.KS', '기아자동차', '경기소비재'),
+    ('005930.KS', '삼성전자', '정보기술'),
+    ('000660.KS', 'SK하이닉스', '정보기술'),
+    ('011200.KS', 'HMM', '산업재'),
+    ('012330.KS', '현대모비스', '경기소비재'),
+    ('005935.KS', '삼성전자우', '정보기술'),
+    ('005380.KS', '현대차', '경기소비재'),
+    ('051900.KS', 'LG생활건강', '필수소비재'),
+    ('035420.KS', 'NAVER', '커뮤니케이션서비스'),
+    ('207940.KS', '삼성바이오로직스', '헬스케어'),
+    ('005490.KS', 'POSCO', '소재'),
+    ('006400.KS', '삼성SDI', '정보기술'),
+    ('028260.KS', '삼성물산', '산업재'),
+    ('051910.KS', 'LG화학', '소재'),
+    ('017670.KS', 'SK텔레콤', '커뮤니케이션서비스'),
+    ('015760.KS', '한국전력', '유틸리티'),
+    ('055550.KS', '신한지주', '금융'),
+    ('105560.KS', 'KB금융', '금융'),
+    ('034730.KS', 'SK', '산업재'),
+    ('032830.KS', '삼성생명', '금융'),
+    ('011170.KS', '롯데케미칼', '소재'),
+    ('096770.KS', 'SK이노베이션', '에너지'),
+    ('000810.KS', '삼성화재', '금융'),
+    ('018260.KS', '삼성에스디에스', '정보기술'),
+    ('003550.KS', 'LG', '산업재'),
+    ('086790.KS', '하나금융지주', '금융'),
+    ('010950.KS', 'S-Oil', '에너지'),
+    ('251270.KS', '넷마블', '커뮤니케이션서비스'),
+    ('030200.KS', 'KT', '커뮤니케이션서비스'),
+    ('009150.KS', '삼성전기', '정보기술'),
+    ('032640.KS', 'LG유플러스', '커뮤니케이션서비스'),
+    ('033780.KS', 'KT&G', '필수소비재'),
+    ('035720.KS', '카카오', '커뮤니케이션서비스'),
+    ('028050.KS', '삼성엔지니어링', '산업재'),
+    ('316140.KS', '우리금융지주', '금융'),
+    ('000720.KS', '현대건설', '산업재'),
+    ('086280.KS', '현대글로비스', '산업재'),
+    ('004020.KS', '현대제철', '소재'),
+    ('009540.KS', '현대중공업지주', '산업재'),
+    ('035250.KS', '강원랜드', '경기소비재'),
+    ('011780.KS', '금호석유', '소재'),
+    ('010130.KS', '고려아연', '소재'),
+    ('030000.KS', '제일기획', '커뮤니케이션서비스'),
+    ('004990.KS', '롯데지주', '산업재'),
+    ('024110.KS', '기업은행', '금융'),
+    ('002790.KS', '아모레G', '필수소비재'),
+    ('009830.KS', '한화솔루션', '소재'),
+    ('373220.KS', 'LG에너지솔루션', '산업재'),
+    ('066570.KS', 'LG전자', '경기소비재'),
+    ('011070.KS', 'LG이노텍', '정보기술'),
+    ('000880.KS', '한화', '산업재'),
+    ('272210.KS', '한화시스템', '산업재'),
+    ('012200.KS', '계양전기', '산업재'),
+    ('019490.KS', 'HL만도', '경기소비재'),
+    ('018880.KS', '한온시스템', '경기소비재'),
+    ('352820.KS', '하이브', '커뮤니케이션서비스'),
+    ('047810.KS', '한국항공우주', '산업재'),
+    ('079550.KS', 'LIG넥스원', '산업재'),
+    ('AAPL', 'Apple Inc.', '정보기술'),
+    ('MSFT', 'Microsoft Corporation', '정보기술'),
+    ('GOOG', 'Alphabet Inc.', '커뮤니케이션서비스'),
+    ('AMZN', 'Amazon.com Inc.', '경기소비재'),
+    # 다른 주식들의 정보는 생략했습니다.
+]
 
-def generate_tickers_json():
-    ticker_company_dict = {
-        '259960.KS': '크래프톤',
-        '000270.KS': '기아자동차',
-        '005930.KS': '삼성전자',
-        '000660.KS': 'SK하이닉스',
-        '011200.KS': 'HMM',
-        '012330.KS': '현대모비스',
-        '005935.KS': '삼성전자우',
-        '005380.KS': '현대차',
-        '051900.KS': 'LG화학',
-        '035420.KS': 'NAVER',
-        '207940.KS': '삼성바이오로직스',
-        '005490.KS': 'POSCO',
-        '006400.KS': '삼성SDI',
-        '028260.KS': '삼성물산',
-        '051910.KS': 'LG화학',
-        '017670.KS': 'SK텔레콤',
-        '015760.KS': '한국전력',
-        '055550.KS': '신한지주',
-        '105560.KS': 'KB금융',
-        '034730.KS': 'SK이노베이션',
-        '032830.KS': '삼성생명',
-        '011170.KS': '롯데케미칼',
-        '096770.KS': 'SK이노베이션',
-        '000810.KS': '삼성화재',
-        '000660.KS': 'SK하이닉스',
-        '018260.KS': '삼성에스디에스',
-        '003550.KS': 'LG',
-        '086790.KS': '하나금융지주',
-        '010950.KS': 'S-Oil',
-        '251270.KS': '넷마블',
-        '030200.KS': 'KT',
-        '009150.KS': '삼성전기',
-        '032640.KS': 'LG유플러스',
-        '033780.KS': 'KT&G',
-        '035720.KS': '카카오',
-        '000270.KS': '기아자동차',
-        '012330.KS': '현대모비스',
-        '028050.KS': '삼성엔지니어링',
-        '316140.KS': '우리금융지주',
-        '000720.KS': '현대건설',
-        '086280.KS': '현대글로비스',
-        '004020.KS': '현대제철',
-        '011200.KS': 'HMM',
-        '009540.KS': '현대중공업지주',
-        '035250.KS': '강원랜드',
-        '011780.KS': '금호석유',
-        '010130.KS': '고려아연',
-        '030000.KS': '제일기획',
-        '004990.KS': '롯데지주',
-        '024110.KS': '기업은행',
-        '002790.KS': '아모레G',
-        '004990.KS': '롯데지주',
-        '009830.KS': '한화솔루션',
-        '051910.KS': 'LG에너지솔루션',
-        '066570.KS': 'LG전자',
-        '011070.KS': 'LG이노텍',
-        '000880.KS': '한화',
-        '272210.KS': '한화시스템',
-        '012200.KS': '계양전기',
-        '019490.KS': 'HL만도',
-        '018880.KS': '한온시스템',
-        '352820.KS': '하이브',
-        '047810.KS': '한국항공우주',
-        '079550.KS': 'LIG넥스원',
-        'AAPL': 'Apple Inc.',
-        'MSFT': 'Microsoft Corporation',
-        'GOOG': 'Alphabet Inc.',
-        'AMZN': 'Amazon.com Inc.',
-        # 다른 주식들의 정보는 생략했습니다.
-    }
 
-    with open('./Ticker.json', 'w') as f:
+# 티커 레지스트리(Ticker.reg)와 기존 형식의 Ticker.json(ticker -> 회사명)을 함께 생성
+# 같은 티커가 두 번 들어 있으면 레지스트리 작성 단계에서 DuplicateTickerError
+def generate_tickers_json():
+    from ticker_registry import REGISTRY_PATH, build_registry, registry_records
+    build_registry(REGISTRY_PATH, registry_records(TICKER_RECORDS))
+    ticker_company_dict = {ticker: name for ticker, name, _ in TICKER_RECORDS}
+    with open('./Ticker.json', 'w', encoding='utf-8') as f:
         json.dump(ticker_company_dict, f, ensure_ascii=False, indent=4)
 
 
+# Ticker.json / Ticker.reg 갱신은 generate_tickers_json()을 직접 호출 (실행할 때마다 덮어쓰지 않음)
+# 실행 방법: python main.py [fetch|analyze|screen|render|backtest] ... (명령을 생략하면 analyze)
 if __name__ == "__main__":
-
-    generate_tickers_json()
-
-    with open('./Ticker.json', "r") as json_file:
-        json_data = json.load(json_file)
-
-    analyzer = StockAnalyzer(json_data)
-    analyzer.analyze_stocks()
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,203 @@
+import numpy as np
+import pandas as pd
+from rolling_extrema import rolling_max, rolling_min, rolling_extrema
+
+OHLCV_FIELDS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+# 전체 티커의 OHLCV를 날짜 x 티커 2차원 배열로 정렬한 패널
+# 티커마다 상장일/휴장일이 달라 빈 칸이 생기므로, 계산할 때는 각 열의 실제 거래일만 위로 모아(pack)
+# 티커 단독 계산과 같은 결과가 나오도록 한 뒤 원래 날짜 위치로 되돌림(unpack)
+class Panel:
+    def __init__(self, dates, tickers, fields, present):
+        self.dates = dates
+        self.tickers = list(tickers)
+        self.fields = fields
+        self.present = present
+        self.order = np.argsort(~present, axis=0, kind='stable')
+
+    @classmethod
+    def from_frames(cls, stock_frames, fields=OHLCV_FIELDS):
+        tickers = list(stock_frames.keys())
+        dates = pd.DatetimeIndex(sorted(set().union(*[frame.index for frame in stock_frames.values()])))
+        present = np.zeros((len(dates), len(tickers)), dtype=bool)
+        arrays = {field: np.full((len(dates), len(tickers)), np.nan) for field in fields}
+        for j, ticker in enumerate(tickers):
+            frame = stock_frames[ticker]
+            rows = dates.get_indexer(frame.index)
+            present[rows, j] = True
+            for field in fields:
+                arrays[field][rows, j] = frame[field].to_numpy(dtype=float)
+        return cls(dates, tickers, arrays, present)
+
+    def packed(self, field):
+        return self.pack(self.fields[field])
+
+    def pack(self, values):
+        return np.take_along_axis(values, self.order, axis=0)
+
+    def unpack(self, values):
+        result = np.empty_like(values)
+        np.put_along_axis(result, self.order, values, axis=0)
+        result[~self.present] = np.nan
+        return result
+
+    def to_frame(self, values):
+        return pd.DataFrame(values, index=self.dates, columns=self.tickers)
+
+
+# ---- 열 단위 커널 (입력은 pack된 T x N 배열) ----
+
+def shift(x, periods):
+    result = np.full_like(x, np.nan)
+    if periods > 0:
+        result[periods:] = x[:-periods]
+    elif periods < 0:
+        result[:periods] = x[-periods:]
+    else:
+        result[:] = x
+    return result
+
+
+def cumulative(x):
+    return np.vstack([np.zeros((1,) + x.shape[1:]), np.cumsum(x, axis=0)])
+
+
+# 누적합 배열에서 길이 window 구간의 합을 구함 (앞부분은 가능한 만큼만)
+def window_diff(cum, window):
+    start = np.maximum(np.arange(1, len(cum)) - window, 0)
+    return cum[1:] - cum[start]
+
+
+def rolling_moments(x, window, min_periods=None, second=False):
+    min_periods = window if min_periods is None else max(min_periods, 1)
+    valid = ~np.isnan(x)
+    # 누적합 오차를 줄이기 위해 열마다 첫 관측값을 기준으로 계산
+    first = np.take_along_axis(x, valid.argmax(axis=0)[None], axis=0)[0]
+    offset = np.where(valid.any(axis=0), first, 0.0)
+    deviation = np.where(valid, x - offset, 0.0)
+    count = window_diff(cumulative(valid.astype(float)), window)
+    total = window_diff(cumulative(deviation), window)
+    total_sq = window_diff(cumulative(deviation * deviation), window) if second else None
+    enough = count >= min_periods
+    return enough, count, total, total_sq, offset
+
+
+def rolling_sum(x, window, min_periods=None):
+    enough, count, total, _, offset = rolling_moments(x, window, min_periods)
+    return np.where(enough, total + count * offset, np.nan)
+
+
+def rolling_mean(x, window, min_periods=None):
+    enough, count, total, _, offset = rolling_moments(x, window, min_periods)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(enough, total / count + offset, np.nan)
+
+
+# 표본 표준편차 (ddof=1)
+def rolling_std(x, window, min_periods=None):
+    enough, count, total, total_sq, _ = rolling_moments(x, window, min_periods, second=True)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        var = (total_sq - total * total / count) / (count - 1)
+    return np.where(enough & (count > 1), np.sqrt(np.maximum(var, 0.0)), np.nan)
+
+
+# pandas ewm(span).mean()과 같은 재귀식 (ignore_na=False, min_periods=0)
+def ewm_mean(x, span, adjust=True):
+    alpha = 2.0 / (span + 1.0)
+    old_wt_factor = 1.0 - alpha
+    new_wt = 1.0 if adjust else alpha
+    result = np.full_like(x, np.nan)
+    weighted = x[0].copy()
+    old_wt = np.ones(x.shape[1:])
+    result[0] = weighted
+    for i in range(1, len(x)):
+        cur = x[i]
+        is_obs = ~np.isnan(cur)
+        has_weighted = ~np.isnan(weighted)
+        old_wt = np.where(has_weighted, old_wt * old_wt_factor, old_wt)
+        update = has_weighted & is_obs
+        with np.errstate(invalid='ignore'):
+            blended = (old_wt * weighted + new_wt * cur) / (old_wt + new_wt)
+        weighted = np.where(update & (weighted != cur), blended, weighted)
+        old_wt = np.where(update, old_wt + new_wt if adjust else 1.0, old_wt)
+        weighted = np.where(~has_weighted & is_obs, cur, weighted)
+        result[i] = weighted
+    return result
+
+
+# ---- 패널 지표 (StockAnalyzer의 단일 티커 계산과 같은 정의) ----
+
+def moving_average(panel, window):
+    return panel.unpack(rolling_mean(panel.packed('Close'), window))
+
+
+def bollinger_bands(panel, window, num_std=2):
+    close = panel.packed('Close')
+    mean, std = rolling_mean(close, window), rolling_std(close, window)
+    return panel.unpack(mean + num_std * std), panel.unpack(mean - num_std * std)
+
+
+def rsi(panel, window=14):
+    delta = np.diff(panel.packed('Close'), axis=0, prepend=np.nan)
+    # pandas의 delta.where(delta > 0, 0)과 같이 첫 행(NaN)도 0으로 처리
+    gain = rolling_mean(np.where(delta > 0, delta, 0.0), window)
+    loss = rolling_mean(np.where(delta < 0, -delta, 0.0), window)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return panel.unpack(100 - (100 / (1 + gain / loss)))
+
+
+def macd(panel, short_window=12, long_window=26, signal_window=9):
+    close = panel.packed('Close')
+    macd_line = ewm_mean(close, short_window, adjust=False) - ewm_mean(close, long_window, adjust=False)
+    signal_line = ewm_mean(macd_line, signal_window, adjust=False)
+    return {'MACD': panel.unpack(macd_line), 'Signal_line': panel.unpack(signal_line)}
+
+
+def vwma(panel, window=20):
+    close, volume = panel.packed('Close'), panel.packed('Volume')
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return panel.unpack(rolling_sum(close * volume, window) / rolling_sum(volume, window))
+
+
+def stochastic_oscillator(panel, window=14, smooth_window=3):
+    close = panel.packed('Close')
+    lowest_low = rolling_min(panel.packed('Low'), window)
+    highest_high = rolling_max(panel.packed('High'), window)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        percent_k = 100 * ((close - lowest_low) / (highest_high - lowest_low))
+    percent_d = rolling_mean(percent_k, smooth_window)
+    return {'%K': panel.unpack(percent_k), '%D': panel.unpack(percent_d)}
+
+
+# 선행/후행 스팬 이동폭은 기준선 기간 (StockAnalyzer.calculate_ichimoku_cloud와 같음)
+def ichimoku_cloud(panel, conversion_window=9, base_window=26, span_b_window=52):
+    high, low, close = panel.packed('High'), panel.packed('Low'), panel.packed('Close')
+    windows = [conversion_window, base_window, span_b_window]
+    highs = rolling_extrema(high, windows, stats=('max',))
+    lows = rolling_extrema(low, windows, stats=('min',))
+    conversion_line = (highs[('max', conversion_window)] + lows[('min', conversion_window)]) / 2
+    base_line = (highs[('max', base_window)] + lows[('min', base_window)]) / 2
+    leading_span_a = shift((conversion_line + base_line) / 2, base_window)
+    leading_span_b = shift((highs[('max', span_b_window)] + lows[('min', span_b_window)]) / 2, base_window)
+    lagging_span = shift(close, -base_window)
+    return {'Conversion_Line': panel.unpack(conversion_line), 'Base_Line': panel.unpack(base_line),
+            'Leading_Span_A': panel.unpack(leading_span_a), 'Leading_Span_B': panel.unpack(leading_span_b),
+            'Lagging_Span': panel.unpack(lagging_span)}
+
+
+def adx(panel, window=14):
+    high, low, close = panel.packed('High'), panel.packed('Low'), panel.packed('Close')
+    delta_high = np.diff(high, axis=0, prepend=np.nan)
+    delta_low = np.diff(low, axis=0, prepend=np.nan)
+    plus_dm = np.where((delta_high > delta_low) & (delta_high > 0), delta_high, 0.0)
+    minus_dm = np.where((delta_low > delta_high) & (delta_low > 0), delta_low, 0.0)
+    prev_close = shift(close, 1)
+    tr = np.fmax(np.fmax(high - low, np.abs(high - prev_close)), np.abs(low - prev_close))
+    atr = rolling_mean(tr, window)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        plus_di = 100 * (rolling_mean(plus_dm, window) / atr)
+        minus_di = 100 * (rolling_mean(minus_dm, window) / atr)
+        dx = (np.abs(plus_di - minus_di) / (plus_di + minus_di)) * 100
+    return {'ADX': panel.unpack(rolling_mean(dx, window)), 'Plus_DI': panel.unpack(plus_di),
+            'Minus_DI': panel.unpack(minus_di)}
@@ -0,0 +1,110 @@
+import itertools
+import numpy as np
+import pandas as pd
+from panel import ewm_mean
+
+
+# 누적합(prefix sum)으로 여러 창 길이의 이동평균을 한 번에 계산 - 창 길이마다 O(n)
+# full_window=True이면 rolling(window).mean(), False이면 rolling(window, min_periods=1).mean()과 같음
+# NaN은 건너뛰고 창 안의 유효값 개수를 따로 누적 (panel.rolling_moments와 같은 방식, 첫 유효값 기준으로 오차 감소)
+def moving_averages(values, windows, full_window=True):
+    valid = ~np.isnan(values)
+    offset = values[valid.argmax()] if valid.any() else 0.0
+    cumsum = np.concatenate([[0.0], np.cumsum(np.where(valid, values - offset, 0.0))])
+    counts = np.concatenate([[0], np.cumsum(valid)])
+    t = np.arange(1, len(values) + 1)
+    result = np.empty((len(windows), len(values)))
+    for i, window in enumerate(windows):
+        start = np.maximum(t - window, 0)
+        count = counts[t] - counts[start]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result[i] = np.where(count >= (window if full_window else 1),
+                                 (cumsum[t] - cumsum[start]) / count + offset, np.nan)
+    return result
+
+
+# MovingAverageRSIStrategy.calculate_rsi와 같은 정의의 RSI를 여러 창 길이에 대해 계산 (창 길이 x 시간)
+def rsi_matrix(values, windows):
+    delta = np.diff(values, prepend=np.nan)
+    gain = moving_averages(np.where(delta > 0, delta, 0.0), windows, full_window=False)
+    loss = moving_averages(np.where(delta < 0, -delta, 0.0), windows, full_window=False)
+    spans = np.asarray(windows, dtype=float)
+    avg_gain = ewm_mean(gain.T, spans).T
+    avg_loss = ewm_mean(loss.T, spans).T
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return 100 - (100 / (1 + avg_gain / avg_loss))
+
+
+# 파라미터 조합별 수익률, 승률(수익 거래 비율), 최대 낙폭 계산 - signal은 조합 x 시간 0/1 배열
+# 일간 수익률은 calculate_returns(pct_change)와 같이 결측 가격을 직전 가격으로 채워 계산
+def evaluate_signals(close, signal):
+    filled = pd.Series(close).ffill().to_numpy()
+    daily_returns = np.nan_to_num(np.diff(filled, prepend=np.nan) / np.concatenate([[np.nan], filled[:-1]]))
+    held = np.concatenate([np.zeros((len(signal), 1)), signal[:, :-1]], axis=1)
+    strategy_returns = daily_returns * held
+    log_equity = np.cumsum(np.log1p(strategy_returns), axis=1)
+    equity = np.exp(log_equity)
+    drawdown = equity / np.maximum.accumulate(equity, axis=1) - 1
+
+    # 거래별 손익: 진입 시점부터 청산 시점(또는 마지막 날)까지의 누적 로그수익
+    changes = np.diff(signal, axis=1, prepend=0)
+    entries = changes == 1
+    exits = changes == -1
+    exits[:, -1] |= signal[:, -1] == 1
+    entry_rows, entry_cols = np.nonzero(entries)
+    exit_rows, exit_cols = np.nonzero(exits)
+    trade_returns = log_equity[exit_rows, exit_cols] - log_equity[entry_rows, entry_cols]
+    trades = np.bincount(entry_rows, minlength=len(signal))
+    wins = np.bincount(entry_rows, weights=trade_returns > 0, minlength=len(signal))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        hit_rate = wins / trades
+
+    return {
+        'total_return': equity[:, -1] - 1,
+        'hit_rate': hit_rate,
+        'max_drawdown': drawdown.min(axis=1),
+        'trades': trades,
+    }
+
+
+# 단일 티커에 대해 (short, long, rsi) 그리드 전체를 한 번에 평가
+# rsi_windows가 None이면 StockAnalyzer.moving_average_cross_strategy, 아니면 MovingAverageRSIStrategy와 같은 시그널
+def sweep_ma_rsi(data, short_windows, long_windows, rsi_windows=None, rsi_upper=70):
+    close = data['Close'].to_numpy(dtype=float)
+    use_rsi = rsi_windows is not None
+    grid = [(short, long, rsi) for short, long, rsi in
+            itertools.product(short_windows, long_windows, rsi_windows if use_rsi else [None]) if short < long]
+    if not grid:
+        return pd.DataFrame(columns=['short_window', 'long_window', 'rsi_window',
+                                     'total_return', 'hit_rate', 'max_drawdown', 'trades'])
+    shorts, longs, rsis = (list(column) for column in zip(*grid))
+
+    windows = sorted(set(shorts) | set(longs))
+    window_index = {window: i for i, window in enumerate(windows)}
+    averages = moving_averages(close, windows, full_window=not use_rsi)
+
+    short_mavg = averages[[window_index[window] for window in shorts]]
+    long_mavg = averages[[window_index[window] for window in longs]]
+    signal = (short_mavg > long_mavg) & (np.arange(len(close))[None, :] >= np.asarray(shorts)[:, None])
+
+    if use_rsi:
+        rsi_list = sorted(set(rsis))
+        rsi_index = {window: i for i, window in enumerate(rsi_list)}
+        rsi_values = rsi_matrix(close, rsi_list)[[rsi_index[window] for window in rsis]]
+        signal &= ~(rsi_values > rsi_upper)
+
+    metrics = evaluate_signals(close, signal.astype(np.int8))
+    result = pd.DataFrame({'short_window': shorts, 'long_window': longs, 'rsi_window': rsis})
+    for name, values in metrics.items():
+        result[name] = values
+    return result
+
+
+# 전체 티커에 대해 그리드를 평가하여 하나의 결과 테이블로 합침
+def sweep_universe(stock_frames, short_windows, long_windows, rsi_windows=None, rsi_upper=70):
+    results = []
+    for ticker, data in stock_frames.items():
+        result = sweep_ma_rsi(data, short_windows, long_windows, rsi_windows, rsi_upper)
+        result.insert(0, 'ticker', ticker)
+        results.append(result)
+    return pd.concat(results, ignore_index=True)
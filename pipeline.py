@@ -0,0 +1,115 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from batch_downloader import BatchDownloader, DownloadError
+from plotting import pdf_pages
+from stock_analysis import StockAnalyzer, PDF_PATHS
+
+DONE = None
+
+
+# 다운로드 -> 계산 -> 시각화를 크기가 제한된 큐로 연결한 파이프라인 실행
+# - 다운로드: 스레드 풀에서 최대 fetch_workers개 동시 요청 (재시도/rate limit은 download_many와 동일)
+# - 계산: compute_workers > 1이면 프로세스 풀, 아니면 전용 스레드 하나
+# - 시각화: matplotlib은 스레드 안전하지 않으므로 전용 스레드 하나에서 티커 순서대로 PDF에 기록
+# 큐가 가득 차면 앞 단계가 기다리므로(backpressure) 메모리에 올라가는 티커 수가 제한되고,
+# 전체 실행 시간은 단계별 시간의 합 대신 가장 느린 단계의 시간에 가까워짐
+# 결과 순서와 PDF 페이지 순서는 순차 실행(run_tickers)과 같음
+class Pipeline:
+    def __init__(self, analyzer, fetch_workers=8, compute_workers=None, queue_size=4, retries=3, backoff=1.0):
+        self.analyzer = analyzer
+        self.fetch_workers = fetch_workers
+        self.compute_workers = compute_workers
+        self.queue_size = queue_size
+        self.retries = retries
+        self.backoff = backoff
+        self.failures = {}
+
+    # tickers 순서대로 ticker -> 시그널 표를 반환 (다운로드 실패 티커는 self.failures에 기록)
+    def run(self, tickers, start_date, end_date, render=True):
+        return asyncio.run(self.run_async(list(tickers), start_date, end_date, render))
+
+    async def run_async(self, tickers, start_date, end_date, render=True):
+        analyzer = self.analyzer
+        downloader = BatchDownloader(lambda ticker: analyzer.download_stock_data(ticker, start_date, end_date)[0],
+                                     retries=self.retries, backoff=self.backoff)
+        # 다운로드 큐는 동시 요청 수만큼, 계산 큐는 queue_size만큼 앞서 나갈 수 있음
+        fetched = asyncio.Queue(max(self.queue_size, self.fetch_workers))
+        computed = asyncio.Queue(self.queue_size)
+        self.failures = {}
+        results = {}
+        pdfs = {name: pdf_pages(path) for name, path in PDF_PATHS.items()} if render else None
+        processes = self.compute_workers is not None and self.compute_workers > 1
+        try:
+            with ThreadPoolExecutor(self.fetch_workers) as fetch_pool, \
+                    (ProcessPoolExecutor(self.compute_workers) if processes else ThreadPoolExecutor(1)) as compute_pool, \
+                    ThreadPoolExecutor(1) as render_pool:
+                await asyncio.gather(
+                    self.fetch_stage(tickers, downloader, fetch_pool, fetched),
+                    self.compute_stage(fetched, computed, compute_pool, processes),
+                    self.render_stage(computed, render_pool, pdfs, results))
+        finally:
+            if render:
+                with analyzer.profiler.stage('pdf_write'):
+                    for pdf in pdfs.values():
+                        pdf.close()
+        return results
+
+    async def fetch_stage(self, tickers, downloader, pool, fetched):
+        loop = asyncio.get_event_loop()
+        for ticker in tickers:
+            await fetched.put((ticker, loop.run_in_executor(pool, downloader.fetch_with_retry, ticker)))
+        await fetched.put(DONE)
+
+    async def compute_stage(self, fetched, computed, pool, processes):
+        loop = asyncio.get_event_loop()
+        analyzer = self.analyzer
+        while True:
+            item = await fetched.get()
+            if item is DONE:
+                await computed.put(DONE)
+                return
+            ticker, download = item
+            try:
+                stock_data = await download
+            except DownloadError as e:
+                self.failures[ticker] = e
+                print(f"{ticker} 주식 데이터 다운로드 실패: {e}")
+                continue
+            if processes:
+                computation = loop.run_in_executor(pool, compute_worker, ticker, stock_data,
+                                                   analyzer.indicator_dtype, analyzer.profiler.enabled)
+            else:
+                computation = loop.run_in_executor(pool, self.compute, ticker, stock_data)
+            await computed.put((ticker, computation))
+
+    async def render_stage(self, computed, pool, pdfs, results):
+        loop = asyncio.get_event_loop()
+        analyzer = self.analyzer
+        while True:
+            item = await computed.get()
+            if item is DONE:
+                return
+            ticker, computation = item
+            stock_data, signals, records = await computation
+            analyzer.profiler.extend(records)
+            results[ticker] = await loop.run_in_executor(pool, self.finish, ticker, stock_data, signals, pdfs)
+            print(f"{analyzer.ticker_company_dict.get(ticker, ticker)} 주식 데이터의 Ticker: {ticker}")
+
+    def compute(self, ticker, stock_data):
+        with self.analyzer.profiler.stage('compute', rows=len(stock_data), ticker=ticker):
+            stock_data, signals = self.analyzer.compute_ticker(stock_data)
+        return stock_data, signals, []
+
+    # 시각화(pdfs가 있을 때) 후 시그널 표 - 계산은 이미 끝났으므로 process_ticker는 시각화부터 수행
+    def finish(self, ticker, stock_data, signals, pdfs):
+        with self.analyzer.profiler.stage('ticker', rows=len(stock_data), ticker=ticker):
+            return self.analyzer.process_ticker(ticker, stock_data, signals, pdfs)
+
+
+# 프로세스 풀 워커 - 티커 하나의 지표/시그널 계산
+# 반환값: (IndicatorStore, 전략별 시그널, 단계별 프로파일 기록)
+def compute_worker(ticker, stock_data, indicator_dtype, profile=True):
+    analyzer = StockAnalyzer({}, profile=profile, indicator_dtype=indicator_dtype)
+    with analyzer.profiler.stage('compute', rows=len(stock_data), ticker=ticker):
+        stock_data, signals = analyzer.compute_ticker(stock_data)
+    return stock_data, signals, analyzer.profiler.records
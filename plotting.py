@@ -0,0 +1,16 @@
+import sys
+
+
+# matplotlib은 시각화 단계에서 처음 필요할 때 불러옴 (fetch/screen/backtest는 matplotlib 없이 시작)
+def pyplot():
+    if 'matplotlib.pyplot' not in sys.modules:
+        import matplotlib
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def pdf_pages(path):
+    pyplot()
+    from matplotlib.backends.backend_pdf import PdfPages
+    return PdfPages(path)
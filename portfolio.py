@@ -0,0 +1,125 @@
+import numpy as np
+import pandas as pd
+from backtest import TRADING_DAYS, backtest_matrix
+
+ALLOCATIONS = ('equal', 'vol', 'top_n')
+
+
+# 리밸런싱 날짜의 행 번호 - freq: 'W', 'M', 'Q', 'Y' 같은 pandas 기간 또는 봉 수(int)
+def rebalance_rows(dates, freq='M'):
+    if isinstance(freq, int):
+        return np.arange(0, len(dates), freq)
+    periods = pd.DatetimeIndex(dates).to_period(freq).asi8
+    return np.flatnonzero(np.diff(periods, prepend=periods[0] - 1) != 0)
+
+
+# 리밸런싱 날짜별 목표 비중 (리밸런싱 횟수 x 티커)
+# 보유 대상: 해당 날짜의 시그널 > 0이고 가격이 있는 티커
+# equal: 동일 비중 / vol: 최근 vol_window 변동성의 역수에 비례 / top_n: 시그널 강도 상위 top_n개 동일 비중
+# 한 종목 비중은 max_weight 이하, 주식 비중 합은 1 - min_cash 이하 (남는 부분은 현금)
+def target_weights(signal, prices, rows, allocation='equal', top_n=None, strength=None, volatility=None,
+                   max_weight=1.0, min_cash=0.0):
+    if allocation not in ALLOCATIONS:
+        raise ValueError(f'allocation은 {ALLOCATIONS} 중 하나: {allocation}')
+    if allocation == 'top_n' and top_n is None:
+        raise ValueError("allocation='top_n'에는 top_n이 필요합니다")
+    eligible = (np.nan_to_num(signal[rows]) > 0) & ~np.isnan(prices[rows])
+    if allocation == 'top_n' or top_n is not None:
+        score = np.where(eligible, np.nan_to_num(strength[rows] if strength is not None else signal[rows]), -np.inf)
+        # 같은 강도면 앞 티커 우선 (stable 정렬)
+        rank = np.argsort(np.argsort(-score, axis=1, kind='stable'), axis=1, kind='stable')
+        eligible &= rank < (top_n if top_n is not None else eligible.shape[1])
+    if allocation == 'vol':
+        raw = np.where(eligible, 1 / volatility[rows], 0.0)
+        raw[~np.isfinite(raw)] = 0.0
+    else:
+        raw = eligible.astype(float)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        weights = np.nan_to_num(raw / raw.sum(axis=1, keepdims=True))
+    weights = np.minimum(weights, max_weight)
+    invested = weights.sum(axis=1, keepdims=True)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        scale = np.where(invested > 1 - min_cash, (1 - min_cash) / invested, 1.0)
+    return weights * scale
+
+
+# 전체 유니버스 포트폴리오 시뮬레이션 (날짜 x 티커 배열 연산, 티커 반복 없음)
+# prices, signal: 날짜 x 티커 - signal은 그날 종가에 알 수 있는 값이며 리밸런싱 날짜 종가에 목표 비중으로 거래
+# 리밸런싱 사이에는 비중이 가격 변화에 따라 변함(drift) - 구간 내 포트폴리오 가치는
+#   V_t = V_k * (현금 비중 + sum_i w_k,i * P_t,i / P_k,i)   (k: 직전 리밸런싱 날짜)
+# 이고, 리밸런싱 날짜의 V_k는 구간별 증가율과 거래 비용의 누적곱으로 한 번에 계산
+def simulate(prices, signal, allocation='equal', rebalance='M', top_n=None, strength=None, vol_window=20,
+             max_weight=1.0, min_cash=0.0, commission=0.0, slippage=0.0, dates=None, tickers=None,
+             initial_capital=1.0, periods_per_year=TRADING_DAYS):
+    prices = np.asarray(prices, dtype=float)
+    signal = np.asarray(signal, dtype=float)
+    n_dates, n_tickers = prices.shape
+    # 날짜 없이 기간 문자열로 리밸런싱하면 행 번호가 1970년 타임스탬프로 해석되어 리밸런싱이 한 번뿐이 됨
+    if dates is None and not isinstance(rebalance, int):
+        raise ValueError(f"기간 단위 리밸런싱({rebalance!r})에는 dates가 필요합니다 (또는 rebalance에 봉 수 지정)")
+    dates = pd.DatetimeIndex(dates) if dates is not None else pd.RangeIndex(n_dates)
+    # 휴장/거래정지 칸은 직전 가격으로 평가 (상장 전은 NaN으로 남아 매수 대상에서 제외)
+    filled = pd.DataFrame(prices).ffill().to_numpy()
+    volatility = None
+    if allocation == 'vol':
+        returns = pd.DataFrame(filled).pct_change()
+        volatility = returns.rolling(vol_window, min_periods=2).std().to_numpy()
+
+    rows = rebalance_rows(dates, rebalance)
+    weights = target_weights(signal, prices, rows, allocation, top_n, strength, volatility, max_weight, min_cash)
+    cash_weight = 1 - weights.sum(axis=1)
+
+    # 날짜마다 직전 리밸런싱 번호 (첫 리밸런싱 전은 전액 현금)
+    period = np.searchsorted(rows, np.arange(n_dates), side='right') - 1
+    active = period >= 0
+    period = np.maximum(period, 0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        holdings = filled / filled[rows][period]
+        holdings *= weights[period]
+    np.nan_to_num(holdings, copy=False)
+    growth = np.where(active, cash_weight[period] + holdings.sum(axis=1), 1.0)
+
+    # 다음 리밸런싱 날짜까지 drift된 비중과 새 목표 비중의 차이가 회전율
+    with np.errstate(invalid='ignore', divide='ignore'):
+        drifted = np.nan_to_num(weights[:-1] * (filled[rows[1:]] / filled[rows[:-1]]))
+    period_growth = cash_weight[:-1] + drifted.sum(axis=1)
+    before = np.vstack([np.zeros((1, n_tickers)), drifted / period_growth[:, None]])
+    turnover_at = np.abs(weights - before).sum(axis=1)
+    cost = turnover_at * (commission + slippage)
+    # 리밸런싱 날짜의 (거래 후) 가치: 구간별 증가율 x (1 - 비용)의 누적곱
+    value_at = initial_capital * np.cumprod(np.concatenate([[1.0], period_growth]) * (1 - cost))
+    equity = np.where(active, value_at[period] * growth, initial_capital)
+    holdings /= growth[:, None]
+    holdings[~active] = 0.0
+    position_weights = holdings
+    exposure = position_weights.sum(axis=1)
+
+    turnover = np.zeros(n_dates)
+    turnover[rows] = turnover_at
+    metrics = backtest_matrix(equity[:, None], np.ones((n_dates, 1)), periods_per_year=periods_per_year)['metrics']
+    years = max(n_dates, 1) / periods_per_year
+    metrics = {name: float(values[0]) for name, values in metrics.items() if name not in ('turnover', 'exposure')}
+    metrics.update({'turnover': float(turnover.sum() / years), 'exposure': float(exposure.mean()),
+                    'positions': float((position_weights > 0).sum(axis=1).mean()), 'rebalances': int(len(rows))})
+
+    columns = tickers if tickers is not None else range(n_tickers)
+    return {
+        'equity': pd.Series(equity, index=dates, name='equity'),
+        'exposure': pd.Series(exposure, index=dates, name='exposure'),
+        'turnover': pd.Series(turnover, index=dates, name='turnover'),
+        'weights': pd.DataFrame(position_weights, index=dates, columns=columns),
+        'metrics': metrics,
+    }
+
+
+# 전략 하나의 전체 티커 시그널(screener.STRATEGY_SIGNALS 패널 계산)로 포트폴리오 시뮬레이션
+# stock_frames: ticker -> OHLCV (Ticker.json 전체 티커)
+def backtest_portfolio(stock_frames, strategy='ma', **kwargs):
+    from panel import Panel
+    from screener import STRATEGY_SIGNALS
+    stock_panel = Panel.from_frames(stock_frames)
+    signal, _ = STRATEGY_SIGNALS[strategy](stock_panel)
+    # 휴장일에는 직전 시그널 유지
+    signal = pd.DataFrame(signal).ffill().to_numpy()
+    return simulate(stock_panel.fields['Close'], signal, dates=stock_panel.dates, tickers=stock_panel.tickers,
+                    **kwargs)
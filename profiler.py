@@ -0,0 +1,222 @@
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+PROFILE_JSON_PATH = 'result/profile.json'
+PROFILE_PROM_PATH = 'result/profile.prom'
+# 환경 변수로 켜는 프로파일링 훅
+# STOCK_LAB_CPROFILE=<경로>: 실행 전체를 cProfile로 기록 (pstats 형식, 워커 작업은 경로 뒤에 .<pid>.<번호>)
+# STOCK_LAB_SAMPLE_INTERVAL=<초>: 메인 스레드 스택 샘플링 (collapsed stack 형식, flamegraph.pl 입력)
+CPROFILE_ENV = 'STOCK_LAB_CPROFILE'
+SAMPLE_INTERVAL_ENV = 'STOCK_LAB_SAMPLE_INTERVAL'
+SAMPLE_PATH_ENV = 'STOCK_LAB_SAMPLE_PATH'
+SAMPLE_PATH = 'result/profile_samples.txt'
+# STOCK_LAB_TRACE_MEMORY=1: 단계별 메모리 peak를 tracemalloc으로 기록 (할당마다 비용이 있어 기본은 꺼짐)
+TRACE_MEMORY_ENV = 'STOCK_LAB_TRACE_MEMORY'
+
+
+# 프로세스 시작 이후 최대 메모리 사용량(RSS high-water mark, bytes) - 단계별 값이 아님, resource 모듈이 없으면 None
+def process_max_rss_bytes():
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 bytes 단위
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+
+# 단계별 계측 - stage()를 중첩하면 바깥 단계의 라벨(ticker 등)을 이어받음
+# 기록 항목: 단계 경로, 라벨, wall time, CPU time(스레드 기준), 처리 행 수, 프로세스 RSS high-water mark,
+# trace_memory이면 단계 peak 메모리 (tracemalloc - 단계 시작 시점보다 늘어난 Python/numpy 할당의 최댓값)
+# tracemalloc peak는 프로세스 전체에 하나이므로 단계에 들어가고 나올 때 reset_peak()로 구간을 나누고
+# 안쪽 단계의 peak를 바깥 단계에 합침 (reset_peak가 없는 Python 3.8 이하에서는 기록하지 않음,
+# 여러 스레드가 동시에 단계를 실행하면 서로의 할당이 섞임)
+class Profiler:
+    def __init__(self, enabled=True, trace_memory=None):
+        self.enabled = enabled
+        if trace_memory is None:
+            trace_memory = bool(os.environ.get(TRACE_MEMORY_ENV))
+        self.trace_memory = trace_memory and hasattr(tracemalloc, 'reset_peak')
+        self.records = []
+        self.local = threading.local()
+
+    def stack(self):
+        if not hasattr(self.local, 'stack'):
+            self.local.stack = []
+        return self.local.stack
+
+    # with profiler.stage(...) as frame: 처리 행 수를 나중에 알게 되면 frame['rows']에 기록
+    @contextmanager
+    def stage(self, name, rows=None, **labels):
+        if not self.enabled:
+            yield {}
+            return
+        stack = self.stack()
+        parent = stack[-1] if stack else {'path': '', 'labels': {}}
+        frame = {'path': f"{parent['path']}/{name}" if parent['path'] else name,
+                 'labels': dict(parent['labels'], **labels), 'rows': rows}
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            current, peak = tracemalloc.get_traced_memory()
+            if 'memory_peak' in parent:
+                parent['memory_peak'] = max(parent['memory_peak'], peak)
+            tracemalloc.reset_peak()
+            frame['memory_start'] = frame['memory_peak'] = current
+        stack.append(frame)
+        wall_start, cpu_start = time.perf_counter(), time.thread_time()
+        try:
+            yield frame
+        finally:
+            wall, cpu = time.perf_counter() - wall_start, time.thread_time() - cpu_start
+            stack.pop()
+            peak_bytes = None
+            if 'memory_start' in frame:
+                frame['memory_peak'] = max(frame['memory_peak'], tracemalloc.get_traced_memory()[1])
+                peak_bytes = frame['memory_peak'] - frame['memory_start']
+                if 'memory_peak' in parent:
+                    parent['memory_peak'] = max(parent['memory_peak'], frame['memory_peak'])
+                tracemalloc.reset_peak()
+            self.records.append({'stage': name, 'path': frame['path'], 'labels': frame['labels'],
+                                 'wall_seconds': wall, 'cpu_seconds': cpu, 'rows': frame['rows'],
+                                 'peak_memory_bytes': peak_bytes, 'process_max_rss_bytes': process_max_rss_bytes(),
+                                 'pid': os.getpid()})
+
+    # 워커 프로세스에서 수집한 기록을 현재 단계 아래로 합침
+    def extend(self, records):
+        if not self.enabled or not records:
+            return
+        stack = self.stack()
+        parent = stack[-1] if stack else {'path': '', 'labels': {}}
+        for record in records:
+            path = f"{parent['path']}/{record['path']}" if parent['path'] else record['path']
+            self.records.append(dict(record, path=path, labels=dict(parent['labels'], **record['labels'])))
+
+    # 단계 경로 + 전략별 합계
+    def summary(self):
+        totals = {}
+        for record in self.records:
+            key = (record['path'], record['labels'].get('strategy'))
+            total = totals.setdefault(key, {'path': key[0], 'strategy': key[1], 'count': 0, 'wall_seconds': 0.0,
+                                            'cpu_seconds': 0.0, 'rows': 0})
+            total['count'] += 1
+            total['wall_seconds'] += record['wall_seconds']
+            total['cpu_seconds'] += record['cpu_seconds']
+            total['rows'] += record['rows'] or 0
+        return sorted(totals.values(), key=lambda total: -total['wall_seconds'])
+
+    def to_json(self):
+        return {'records': self.records, 'summary': self.summary()}
+
+    def to_prometheus(self, prefix='stock_lab'):
+        metrics = [
+            ('stage_wall_seconds', 'Wall time per stage', 'wall_seconds'),
+            ('stage_cpu_seconds', 'CPU time per stage (thread CPU time of the process running the stage)',
+             'cpu_seconds'),
+            ('stage_rows', 'Rows processed per stage', 'rows'),
+            ('stage_peak_memory_bytes', 'Peak traced allocations during the stage above its starting level '
+             '(tracemalloc, STOCK_LAB_TRACE_MEMORY=1)', 'peak_memory_bytes'),
+            ('process_max_rss_bytes', 'Process RSS high-water mark since process start, sampled at the end of the '
+             'stage (not per stage)', 'process_max_rss_bytes'),
+        ]
+        lines = []
+        for metric, description, field in metrics:
+            lines.append(f'# HELP {prefix}_{metric} {description}')
+            lines.append(f'# TYPE {prefix}_{metric} gauge')
+            for record in self.records:
+                if record[field] is not None:
+                    labels = dict(record['labels'], stage=record['path'], pid=record['pid'])
+                    lines.append(f'{prefix}_{metric}{{{prometheus_labels(labels)}}} {record[field]}')
+        for metric, field in (('stage_wall_seconds_total', 'wall_seconds'), ('stage_cpu_seconds_total', 'cpu_seconds')):
+            lines.append(f'# TYPE {prefix}_{metric} counter')
+            for total in self.summary():
+                labels = {'stage': total['path']}
+                if total['strategy'] is not None:
+                    labels['strategy'] = total['strategy']
+                lines.append(f'{prefix}_{metric}{{{prometheus_labels(labels)}}} {total[field]}')
+        return '\n'.join(lines) + '\n'
+
+    def export(self, json_path=PROFILE_JSON_PATH, prometheus_path=PROFILE_PROM_PATH):
+        if not self.enabled:
+            return
+        if json_path:
+            with open(json_path, 'w') as f:
+                json.dump(self.to_json(), f, indent=2)
+        if prometheus_path:
+            with open(prometheus_path, 'w') as f:
+                f.write(self.to_prometheus())
+
+
+def prometheus_labels(labels):
+    escape = lambda value: str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return ','.join(f'{key}="{escape(value)}"' for key, value in sorted(labels.items()))
+
+
+# 메인 스레드 스택을 주기적으로 수집하는 샘플링 프로파일러
+class StackSampler:
+    def __init__(self, interval, thread_id=None):
+        self.interval = interval
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.samples = Counter()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f'{os.path.basename(code.co_filename)}:{code.co_name}')
+                frame = frame.f_back
+            if stack:
+                self.samples[';'.join(reversed(stack))] += 1
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+
+    def write(self, path):
+        with open(path, 'w') as f:
+            for stack, count in self.samples.most_common():
+                f.write(f'{stack} {count}\n')
+
+
+def suffixed_path(path, suffix):
+    return f'{path}.{suffix}' if suffix is not None else path
+
+
+# 환경 변수에 따라 cProfile / 스택 샘플링을 켜고 끝나면 결과를 저장
+# suffix: 워커 작업마다 결과 파일을 나누기 위한 접미사
+@contextmanager
+def profiling_hooks(suffix=None):
+    cprofile_path = os.environ.get(CPROFILE_ENV)
+    sample_interval = os.environ.get(SAMPLE_INTERVAL_ENV)
+    profile = cProfile.Profile() if cprofile_path else None
+    sampler = StackSampler(float(sample_interval)) if sample_interval else None
+    if profile is not None:
+        profile.enable()
+    if sampler is not None:
+        sampler.start()
+    try:
+        yield
+    finally:
+        if sampler is not None:
+            sampler.stop()
+            sampler.write(suffixed_path(os.environ.get(SAMPLE_PATH_ENV, SAMPLE_PATH), suffix))
+        if profile is not None:
+            profile.disable()
+            profile.dump_stats(suffixed_path(cprofile_path, suffix))
@@ -0,0 +1,139 @@
+import hashlib
+import importlib.util
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+import pandas as pd
+
+RESULT_CACHE_DIR = 'result_cache'
+SIGNALS_FILE = 'signals.pkl'
+# 결과에 영향을 주는 모듈 - 소스가 바뀌면 모든 캐시 항목이 무효화됨
+CODE_MODULES = ['stock_analysis', 'ma_rsi_strategy', 'bb_strategy', 'indicator_engine', 'indicator_store',
+                'rolling_extrema', 'signal_rules', 'signal_store', 'chart_renderer']
+
+_code_version = None
+
+
+# 계산/시각화 코드의 버전 (모듈 소스의 해시) - 모듈을 import하지 않고 소스 파일만 읽음
+# (chart_renderer를 import하면 시각화 없는 실행에서도 matplotlib을 불러옴)
+def code_version():
+    global _code_version
+    if _code_version is None:
+        digest = hashlib.sha256()
+        for name in CODE_MODULES:
+            with open(importlib.util.find_spec(name).origin, 'rb') as f:
+                digest.update(name.encode() + b'\0' + f.read())
+        _code_version = digest.hexdigest()
+    return _code_version
+
+
+# 티커 결과 캐시 키 - OHLCV 내용(인덱스 포함) + 결과에 영향을 주는 옵션 + 코드 버전
+def result_key(ticker, stock_data, params):
+    digest = hashlib.sha256()
+    digest.update(code_version().encode())
+    digest.update(repr((ticker, sorted(params.items()), [str(column) for column in stock_data.columns])).encode())
+    digest.update(pd.util.hash_pandas_object(stock_data, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+# 티커별 계산/시각화 결과를 내용 해시로 저장하는 캐시
+# 항목 하나 = <키>/signals.pkl + 전략별 한 티커 PDF 조각 - 임시 디렉터리에 모두 쓴 후 이름을 바꿔 등록하므로
+# 중간에 중단되어도 완성된 항목만 남고, 다시 실행하면 완료된 티커는 캐시에서 바로 읽음
+class ResultCache:
+    def __init__(self, cache_dir=RESULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+        os.makedirs(os.path.join(cache_dir, 'tmp'), exist_ok=True)
+
+    def entry_dir(self, key):
+        return os.path.join(self.cache_dir, key[:2], key)
+
+    def pdf_paths(self, key, names):
+        return {name: os.path.join(self.entry_dir(key), f'{name}.pdf') for name in names}
+
+    def contains(self, key, pdf_names=()):
+        paths = [os.path.join(self.entry_dir(key), SIGNALS_FILE)] + list(self.pdf_paths(key, pdf_names).values())
+        return all(os.path.exists(path) for path in paths)
+
+    # 읽을 때마다 항목 디렉터리의 수정 시각을 갱신 - prune의 마지막 사용 시각
+    def load(self, key):
+        os.utime(self.entry_dir(key))
+        return pd.read_pickle(os.path.join(self.entry_dir(key), SIGNALS_FILE))
+
+    # run_ticker_shard 결과(임시 디렉터리의 PDF 조각 + 시그널 표)를 항목으로 등록
+    def commit(self, key, tmp_dir, shard_paths, frame):
+        if shard_paths is not None:
+            for name, path in shard_paths.items():
+                os.replace(path, os.path.join(tmp_dir, f'{name}.pdf'))
+        frame.to_pickle(os.path.join(tmp_dir, SIGNALS_FILE))
+        target = self.entry_dir(key)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        if os.path.exists(target):
+            shutil.rmtree(target)
+        os.replace(tmp_dir, target)
+
+    def tmp_dir(self, key):
+        path = os.path.join(self.cache_dir, 'tmp', f'{key}.{os.getpid()}')
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path)
+        return path
+
+    # max_age_days일 동안 쓰지 않은 항목과 중단된 실행의 오래된 임시 파일 삭제 (명시적으로 호출할 때만)
+    # 일부 티커만 실행(--select, --market)해도 나머지 티커의 항목은 남음
+    def prune(self, max_age_days):
+        cutoff = time.time() - max_age_days * 86400
+        removed = 0
+        for prefix in os.listdir(self.cache_dir):
+            directory = os.path.join(self.cache_dir, prefix)
+            for key in os.listdir(directory):
+                path = os.path.join(directory, key)
+                if os.path.getmtime(path) < cutoff:
+                    shutil.rmtree(path, ignore_errors=True)
+                    removed += prefix != 'tmp'
+            if prefix != 'tmp' and not os.listdir(directory):
+                os.rmdir(directory)
+        return removed
+
+
+# StockAnalyzer.run_tickers의 캐시 버전 - 바뀐 티커만 계산/시각화하고 출력 PDF는 캐시된 조각을 이어 붙여 만듦
+# inputs: ticker -> (stock_data, None)
+def run_cached(analyzer, cache, inputs, workers=None, render=True):
+    from stock_analysis import PDF_PATHS, run_ticker_shard, merge_pdfs
+    profiler = analyzer.profiler
+    pdf_names = list(PDF_PATHS) if render else []
+    with profiler.stage('result_cache_lookup', rows=len(inputs)):
+        keys = {ticker: result_key(ticker, stock_data, {'company_name': analyzer.ticker_company_dict.get(ticker, ticker),
+                                                        'fast_render': analyzer.fast_render,
+                                                        'indicator_dtype': str(np.dtype(analyzer.indicator_dtype))})
+                for ticker, (stock_data, _) in inputs.items()}
+        misses = [ticker for ticker in inputs if not cache.contains(keys[ticker], pdf_names)]
+    print(f'결과 캐시: {len(inputs) - len(misses)}개 재사용, {len(misses)}개 계산')
+
+    tmp_dirs = {ticker: cache.tmp_dir(keys[ticker]) for ticker in misses}
+    shard_args = [(index, ticker, analyzer.ticker_company_dict.get(ticker, ticker), inputs[ticker][0], None,
+                   tmp_dirs[ticker] if render else None, analyzer.fast_render, profiler.enabled,
+                   analyzer.indicator_dtype)
+                  for index, ticker in enumerate(misses)]
+    # 티커가 끝날 때마다 바로 등록 - 중단 후 재실행하면 등록된 티커는 다시 계산하지 않음
+    if workers is not None and workers > 1 and len(misses) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(run_ticker_shard, *args): args[1] for args in shard_args}
+            for future in as_completed(futures):
+                ticker = futures[future]
+                shard_paths, frame, records = future.result()
+                profiler.extend(records)
+                cache.commit(keys[ticker], tmp_dirs[ticker], shard_paths, frame)
+    else:
+        for args in shard_args:
+            shard_paths, frame, records = run_ticker_shard(*args)
+            profiler.extend(records)
+            cache.commit(keys[args[1]], tmp_dirs[args[1]], shard_paths, frame)
+
+    with profiler.stage('result_cache_load', rows=len(inputs)):
+        results = {ticker: cache.load(keys[ticker]) for ticker in inputs}
+    if render:
+        with profiler.stage('pdf_write'):
+            for name, path in PDF_PATHS.items():
+                merge_pdfs([cache.pdf_paths(keys[ticker], [name])[name] for ticker in inputs], path)
+    return results
@@ -0,0 +1,43 @@
+import numpy as np
+
+
+# van Herk / Gil-Werman 이동 최대/최소 - 창 길이와 상관없이 원소당 비교 3번, O(n)
+# 결과는 pandas rolling(window).max()/min()과 동일 (창 안에 NaN이 있거나 데이터가 부족하면 NaN)
+def _rolling_extremum(values, window, ufunc, fill):
+    n = values.shape[0]
+    rest = values.shape[1:]
+    if window > n:
+        return np.full(values.shape, np.nan)
+    # 앞쪽 window-1개는 NaN으로 채워 데이터가 부족한 구간은 NaN이 되도록 하고,
+    # 뒤쪽은 블록 크기의 배수가 되도록 항등원(-inf/+inf)으로 채움
+    length = n + window - 1
+    blocks = -(-length // window)
+    padded = np.empty((blocks * window,) + rest)
+    padded[:window - 1] = np.nan
+    padded[window - 1:length] = values
+    padded[length:] = fill
+
+    shaped = padded.reshape((blocks, window) + rest)
+    prefix = ufunc.accumulate(shaped, axis=1).reshape(padded.shape)
+    suffix = ufunc.accumulate(shaped[:, ::-1], axis=1)[:, ::-1].reshape(padded.shape)
+    return ufunc(suffix[:n], prefix[window - 1:window - 1 + n])
+
+
+def rolling_max(values, window):
+    return _rolling_extremum(np.asarray(values, dtype=float), window, np.maximum, -np.inf)
+
+
+def rolling_min(values, window):
+    return _rolling_extremum(np.asarray(values, dtype=float), window, np.minimum, np.inf)
+
+
+# 여러 창 길이를 한 번에 계산 - 입력 변환은 한 번만 하고 창 길이별로 O(n) 패스를 수행
+def rolling_extrema(values, windows, stats=('max', 'min')):
+    values = np.asarray(values, dtype=float)
+    kernels = {'max': (np.maximum, -np.inf), 'min': (np.minimum, np.inf)}
+    result = {}
+    for stat in stats:
+        ufunc, fill = kernels[stat]
+        for window in windows:
+            result[(stat, window)] = _rolling_extremum(values, window, ufunc, fill)
+    return result
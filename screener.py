@@ -0,0 +1,134 @@
+import datetime
+import math
+import numpy as np
+import pandas as pd
+import panel
+from panel import Panel
+from signal_rules import SignalRules
+from bb_strategy import BOLLINGER_RULES
+from ma_rsi_strategy import MA_RSI_RULES
+from stock_analysis import (MA_CROSS_RULES, RSI_RULES, MACD_RULES, STOCHASTIC_RULES, VWMA_RULES, ICHIMOKU_RULES,
+                            ADX_RULES)
+
+SCREEN_PATH = 'result/screen.csv'
+SCREEN_COLUMNS = ['ticker', 'name', 'strategy', 'action', 'bars_ago', 'date', 'close', 'signal']
+# 전략별로 마지막 봉의 시그널을 전체 이력으로 계산한 값과 같게 만드는 데 필요한 과거 봉 수
+# 지수평활(MACD, MA+RSI의 RSI)은 span의 5배 이상이면 초기값의 영향이 1e-5 이하로 줄어듦
+STRATEGY_WARMUP = {
+    'ma': 200,
+    'rsi': 14 + 1,
+    'ma_rsi': max(200, 5 * 14),
+    'macd': 5 * (26 + 9),
+    'stochastic': 14 + 3,
+    'vwma': 20,
+    'ichimoku': 52 + 26,
+    'adx': 3 * 14,
+    'bollinger': 20,
+}
+
+
+def smoothed_rsi(stock_panel, window=14):
+    delta = np.diff(stock_panel.packed('Close'), axis=0, prepend=np.nan)
+    gain = panel.rolling_mean(np.where(delta > 0, delta, 0.0), window, min_periods=1)
+    loss = panel.rolling_mean(np.where(delta < 0, -delta, 0.0), window, min_periods=1)
+    avg_gain, avg_loss = panel.ewm_mean(gain, window), panel.ewm_mean(loss, window)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return stock_panel.unpack(100 - (100 / (1 + avg_gain / avg_loss)))
+
+
+def moving_average(stock_panel, window, min_periods=None):
+    return stock_panel.unpack(panel.rolling_mean(stock_panel.packed('Close'), window, min_periods))
+
+
+def stochastic_signals(stock_panel):
+    stochastic = panel.stochastic_oscillator(stock_panel)
+    return SignalRules(STOCHASTIC_RULES).evaluate_panel(stock_panel, k=stochastic['%K'], d=stochastic['%D'])
+
+
+def bollinger_signals(stock_panel):
+    upper_band, lower_band = panel.bollinger_bands(stock_panel, 20, 2)
+    return SignalRules(BOLLINGER_RULES).evaluate_panel(stock_panel, upper_band=upper_band, lower_band=lower_band)
+
+
+# 패널 전체 티커의 전략별 (signal, positions) - StockAnalyzer.generate_all_signals와 같은 파라미터/규칙
+STRATEGY_SIGNALS = {
+    'ma': lambda p: SignalRules(MA_CROSS_RULES, warmup=50).evaluate_panel(
+        p, short_mavg=moving_average(p, 50), long_mavg=moving_average(p, 200)),
+    'rsi': lambda p: SignalRules(RSI_RULES).evaluate_panel(p, rsi=panel.rsi(p, 14)),
+    'ma_rsi': lambda p: SignalRules(MA_RSI_RULES, warmup=50).evaluate_panel(
+        p, short_mavg=moving_average(p, 50, 1), long_mavg=moving_average(p, 200, 1), rsi=smoothed_rsi(p, 14)),
+    'macd': lambda p: SignalRules(MACD_RULES).evaluate_panel(p, **panel.macd(p)),
+    'stochastic': stochastic_signals,
+    'vwma': lambda p: SignalRules(VWMA_RULES).evaluate_panel(p, VWMA=panel.vwma(p, 20), SMA=moving_average(p, 20)),
+    'ichimoku': lambda p: SignalRules(ICHIMOKU_RULES).evaluate_panel(p, **panel.ichimoku_cloud(p)),
+    'adx': lambda p: SignalRules(ADX_RULES).evaluate_panel(p, **panel.adx(p)),
+    'bollinger': bollinger_signals,
+}
+
+
+def lookback_bars(strategies, max_age=0):
+    # 마지막 max_age + 1개 봉의 포지션 변화(직전 봉과의 차이)까지 계산
+    return max(STRATEGY_WARMUP[strategy] for strategy in strategies) + max_age + 1
+
+
+# 필요한 봉 수를 담을 만큼의 시작일 (주말 + 공휴일 여유)
+def trailing_start(end_date, bars):
+    end = pd.Timestamp(end_date)
+    return (end - pd.Timedelta(days=math.ceil(bars * 7 / 5 * 1.1) + 14)).strftime('%Y-%m-%d')
+
+
+# 티커별 최근 max_age개 봉 안에서 발생한 매수/매도 전환 표
+# stock_frames: ticker -> OHLCV (필요한 과거 봉만 있으면 충분)
+def screen_frames(stock_frames, strategies=None, max_age=0, names=None):
+    frames = {ticker: frame for ticker, frame in stock_frames.items() if len(frame)}
+    if not frames:
+        return pd.DataFrame(columns=SCREEN_COLUMNS + ['score'])
+    return screen_panel(Panel.from_frames(frames), strategies, max_age, names)
+
+
+# 패널(예: UniverseStore.panel())을 바로 스크리닝 - 패널은 필요한 과거 봉만 있으면 충분
+def screen_panel(stock_panel, strategies=None, max_age=0, names=None):
+    strategies = list(strategies or STRATEGY_SIGNALS)
+    names = names or {}
+    columns = SCREEN_COLUMNS
+    tickers = np.array(stock_panel.tickers, dtype=object)
+    close = stock_panel.packed('Close')
+    # 티커마다 마지막 max_age + 1개 거래일 (pack된 배열에서 각 열의 실제 거래일은 위쪽에 모여 있음)
+    counts = stock_panel.present.sum(axis=0)
+    recent = [(age, np.flatnonzero(counts > age)) for age in range(max_age + 1)]
+    parts = []
+    for strategy in strategies:
+        signal, positions = (stock_panel.pack(values) for values in STRATEGY_SIGNALS[strategy](stock_panel))
+        for age, cols in recent:
+            rows = counts[cols] - 1 - age
+            change = positions[rows, cols]
+            fresh = ~np.isnan(change) & (change != 0)
+            rows, cols, change = rows[fresh], cols[fresh], change[fresh]
+            parts.append(pd.DataFrame({
+                'ticker': tickers[cols], 'name': [names.get(ticker, ticker) for ticker in tickers[cols]],
+                'strategy': strategy, 'action': np.where(change > 0, 'buy', 'sell'), 'bars_ago': age,
+                'date': stock_panel.dates[stock_panel.order[rows, cols]], 'close': close[rows, cols],
+                'signal': signal[rows, cols],
+            }, columns=columns))
+
+    table = pd.concat(parts, ignore_index=True)
+    # 티커 점수: 최근 매수 전환 수 - 매도 전환 수 (여러 전략이 같은 방향으로 매수 전환한 티커가 위, 매도는 아래)
+    direction = pd.Series(np.where(table['action'] == 'buy', 1, -1), index=table.index)
+    table['score'] = direction.groupby(table['ticker']).transform('sum')
+    table = table.sort_values(['score', 'ticker', 'bars_ago', 'strategy'], ascending=[False, True, True, True],
+                              kind='mergesort')
+    return table.reset_index(drop=True)
+
+
+# 전략별 필요한 최근 구간만 다운로드(캐시)하여 스크리닝
+def screen(analyzer, tickers=None, strategies=None, max_age=0, end_date=None):
+    strategies = list(strategies or STRATEGY_SIGNALS)
+    tickers = list(tickers if tickers is not None else analyzer.ticker_company_dict.keys())
+    end_date = end_date or datetime.datetime.now().strftime('%Y-%m-%d')
+    bars = lookback_bars(strategies, max_age)
+    with analyzer.profiler.stage('download_many') as stage:
+        stock_frames = analyzer.download_many(tickers, trailing_start(end_date, bars), end_date)
+        stage['rows'] = sum(len(frame) for frame in stock_frames.values())
+    stock_frames = {ticker: frame.tail(bars) for ticker, frame in stock_frames.items()}
+    with analyzer.profiler.stage('screen', rows=sum(len(frame) for frame in stock_frames.values())):
+        return screen_frames(stock_frames, strategies, max_age, analyzer.ticker_company_dict)
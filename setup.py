@@ -18,6 +18,7 @@ setup(
         'matplotlib',
         'plotly',
         'mplfinance',
+        'pypdf',
     ],
     author='Ddangkwon',
     author_email='semi109502@gmail.com',
@@ -0,0 +1,160 @@
+import ast
+import sys
+from functools import lru_cache
+import numpy as np
+
+# 매매 규칙 언어 - 한 줄에 하나씩 '<동작> when <조건>'
+#   buy when short_mavg > long_mavg
+#   flat when rsi > 70
+# 동작: buy(1), sell(-1), flat(0) / 조건에 맞는 행이 없으면 0, 여러 규칙에 맞으면 아래 규칙이 우선
+# 조건: 컬럼 이름, 숫자, 사칙연산, 비교(연쇄 비교 포함), and / or / not, 괄호
+# 컬럼 이름은 그대로 찾고, 없으면 첫 글자를 대문자로 바꿔 찾음 (close -> Close)
+ACTIONS = {'buy': 1.0, 'sell': -1.0, 'flat': 0.0}
+
+_BINARY_OPS = (ast.Add, ast.Sub, ast.Mult, ast.Div)
+_COMPARE_OPS = (ast.Gt, ast.GtE, ast.Lt, ast.LtE, ast.Eq, ast.NotEq)
+# Python 3.7의 ast.parse는 숫자를 ast.Num으로 만듦
+_NUMBER_NODES = (ast.Constant, ast.Num) if sys.version_info < (3, 8) else (ast.Constant,)
+
+
+class RuleError(ValueError):
+    pass
+
+
+def parse_rules(text):
+    lines = text.splitlines() if isinstance(text, str) else list(text)
+    rules = []
+    for line in lines:
+        line = line.split('#', 1)[0].strip()
+        if not line:
+            continue
+        action, sep, condition = line.partition(' when ')
+        if not sep or action.strip() not in ACTIONS:
+            raise RuleError(f"규칙 형식 오류 ('<buy|sell|flat> when <조건>'): {line}")
+        rules.append((action.strip(), condition.strip()))
+    if not rules:
+        raise RuleError('규칙이 없습니다')
+    return rules
+
+
+# 조건식의 AST를 NumPy 배열 연산으로 변환 (and/or/not -> &/|/~, 연쇄 비교 -> 비교 결과의 &)
+class _ConditionTransformer(ast.NodeTransformer):
+    def __init__(self):
+        self.names = []
+
+    def generic_visit(self, node):
+        allowed = (ast.Expression, ast.BoolOp, ast.BinOp, ast.UnaryOp, ast.Compare, ast.Name, ast.Load,
+                   ast.And, ast.Or, ast.Not, ast.USub, ast.UAdd) + _NUMBER_NODES + _BINARY_OPS + _COMPARE_OPS
+        if not isinstance(node, allowed):
+            raise RuleError(f'지원하지 않는 표현식: {ast.dump(node)}')
+        return super().generic_visit(node)
+
+    def visit_Constant(self, node):
+        value = node.value if isinstance(node, ast.Constant) else node.n
+        if not isinstance(value, (int, float)) or isinstance(value, bool):
+            raise RuleError(f'숫자만 사용할 수 있습니다: {value!r}')
+        return node
+
+    visit_Num = visit_Constant
+
+    def visit_Name(self, node):
+        if node.id not in self.names:
+            self.names.append(node.id)
+        return ast.Name(id=f'_v{self.names.index(node.id)}', ctx=ast.Load())
+
+    def visit_BoolOp(self, node):
+        self.generic_visit(node)
+        op = ast.BitAnd() if isinstance(node.op, ast.And) else ast.BitOr()
+        result = node.values[0]
+        for value in node.values[1:]:
+            result = ast.BinOp(left=result, op=op, right=value)
+        return result
+
+    def visit_UnaryOp(self, node):
+        self.generic_visit(node)
+        if isinstance(node.op, ast.Not):
+            return ast.UnaryOp(op=ast.Invert(), operand=node.operand)
+        return node
+
+    def visit_Compare(self, node):
+        self.generic_visit(node)
+        operands = [node.left] + node.comparators
+        result = None
+        for left, op, right in zip(operands, node.ops, operands[1:]):
+            compare = ast.Compare(left=left, ops=[op], comparators=[right])
+            result = compare if result is None else ast.BinOp(left=result, op=ast.BitAnd(), right=compare)
+        return result
+
+
+# 전체 규칙을 where(조건N, 값N, ... where(조건1, 값1, 0.0)) 하나의 식으로 컴파일
+@lru_cache(maxsize=None)
+def compile_rules(text):
+    transformer = _ConditionTransformer()
+    expression = ast.Constant(value=0.0)
+    for action, condition in parse_rules(text):
+        try:
+            tree = ast.parse(condition, mode='eval')
+        except SyntaxError as e:
+            raise RuleError(f'조건식 오류: {condition}') from e
+        test = transformer.visit(tree).body
+        expression = ast.Call(func=ast.Name(id='_where', ctx=ast.Load()),
+                              args=[test, ast.Constant(value=ACTIONS[action]), expression], keywords=[])
+    tree = ast.fix_missing_locations(ast.Expression(body=expression))
+    return compile(tree, '<signal rules>', 'eval'), tuple(transformer.names)
+
+
+def lookup(data, name, values):
+    if name in values:
+        return values[name]
+    for key in (name, name[:1].upper() + name[1:]):
+        try:
+            return data[key]
+        except KeyError:
+            continue
+    raise RuleError(f'컬럼 없음: {name}')
+
+
+# 시그널 배열의 포지션 변화 (pandas diff와 같이 첫 행은 NaN) - 2차원이면 열(티커)마다 계산
+def positions(signal):
+    return np.diff(signal, axis=0, prepend=np.nan)
+
+
+# 컴파일된 매매 규칙 - warmup: 앞쪽 warmup개 행은 조건과 관계없이 0
+class SignalRules:
+    def __init__(self, rules, warmup=0):
+        self.text = rules if isinstance(rules, str) else '\n'.join(rules)
+        self.code, self.names = compile_rules(self.text)
+        self.warmup = warmup
+
+    # data: 컬럼 이름으로 꺼낼 수 있는 DataFrame / IndicatorStore / dict (값은 1차원 또는 날짜 x 티커 2차원)
+    # values: data에 없는 추가 입력 (예: 따로 계산한 밴드)
+    # 반환값: (signal, positions) 배열
+    def evaluate(self, data, **values):
+        namespace = {f'_v{i}': np.asarray(lookup(data, name, values), dtype=float) for i, name in enumerate(self.names)}
+        namespace['_where'] = np.where
+        with np.errstate(invalid='ignore', divide='ignore'):
+            signal = np.asarray(eval(self.code, {'__builtins__': {}}, namespace), dtype=float)
+        if signal.ndim == 0:
+            raise RuleError('조건에 컬럼이 하나 이상 필요합니다')
+        signal[:self.warmup] = 0.0
+        return signal, positions(signal)
+
+    # 패널 전체 티커에 대해 평가 - warmup은 티커마다 첫 거래일부터 적용
+    # values는 panel 지표 함수의 결과(날짜 x 티커)이며, 나머지 이름은 패널 OHLCV 필드에서 찾음
+    def evaluate_panel(self, panel, **values):
+        packed = {name: panel.pack(value) for name, value in values.items()}
+        signal, signal_positions = self.evaluate(PanelFields(panel), **packed)
+        return panel.unpack(signal), panel.unpack(signal_positions)
+
+    def __repr__(self):
+        return f'SignalRules({self.text!r}, warmup={self.warmup})'
+
+
+class PanelFields:
+    def __init__(self, panel):
+        self.panel = panel
+
+    def __getitem__(self, field):
+        if field not in self.panel.fields:
+            raise KeyError(field)
+        return self.panel.packed(field)
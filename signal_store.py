@@ -0,0 +1,53 @@
+import pandas as pd
+from indicator_store import IndicatorStore
+
+SIGNALS_PATH = 'result/signals.csv.gz'
+
+
+# 티커 하나의 계산 결과(OHLCV + 지표 컬럼 + 전략별 시그널)를 하나의 표로 합침
+# 전략 시그널 컬럼은 '<전략>:<컬럼>' 형식
+def signals_to_frame(stock_data, signals):
+    frames = [stock_data.to_frame() if isinstance(stock_data, IndicatorStore) else stock_data]
+    for strategy, strategy_signals in signals.items():
+        frames.append(strategy_signals.add_prefix(f'{strategy}:'))
+    return pd.concat(frames, axis=1)
+
+
+def frame_to_signals(frame):
+    stock_columns = [column for column in frame.columns if ':' not in column]
+    signals = {}
+    for column in frame.columns:
+        if ':' in column:
+            strategy, name = column.split(':', 1)
+            signals.setdefault(strategy, []).append((column, name))
+    stock_data = frame[stock_columns].copy()
+    return stock_data, {strategy: frame[[column for column, _ in columns]].set_axis([name for _, name in columns], axis=1)
+                        for strategy, columns in signals.items()}
+
+
+# 모든 티커가 실패해 결과가 없으면 빈 표를 저장 (이전 실행의 표가 남지 않도록)
+def save_signals(path, frames_by_ticker):
+    if not frames_by_ticker:
+        print(f'저장할 시그널이 없습니다 (성공한 티커 없음): {path}')
+        save_signal_table(path, pd.DataFrame(index=pd.MultiIndex.from_arrays([[], []], names=['ticker', 'Date'])))
+        return
+    save_signal_table(path, pd.concat(frames_by_ticker, names=['ticker', 'Date']))
+
+
+# (ticker, Date) 인덱스의 시그널 표를 그대로 저장 (여러 실행 결과를 이어 붙인 표)
+def save_signal_table(path, table):
+    if path.endswith('.pkl'):
+        table.to_pickle(path)
+    else:
+        table.to_csv(path)
+
+
+def load_signals(path):
+    if path.endswith('.pkl'):
+        table = pd.read_pickle(path)
+    else:
+        table = pd.read_csv(path, index_col=[0, 1], parse_dates=[1])
+    results = {}
+    for ticker in table.index.get_level_values(0).unique():
+        results[ticker] = frame_to_signals(table.xs(ticker, level=0))
+    return results
@@ -1,20 +1,74 @@
 import numpy as np
 import pandas as pd
-import yfinance as yf
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_pdf import PdfPages
 import datetime
-import mplfinance as mpf
-import warnings
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from ma_rsi_strategy import *
-warnings.filterwarnings('ignore')
+from bb_strategy import BollingerBandsStrategy
+from data_cache import YFinanceSource, OHLCVCache
+from batch_downloader import BatchDownloader, RateLimitedSource
+from indicator_engine import IndicatorEngine
+from indicator_store import IndicatorStore
+from plotting import pyplot, pdf_pages
+from signal_store import SIGNALS_PATH, signals_to_frame, save_signals, load_signals
+from profiler import Profiler, profiling_hooks
+from signal_rules import SignalRules
+from result_cache import ResultCache, run_cached
+
+# 전략별 매매 규칙 (signal_rules 규칙 언어)
+MA_CROSS_RULES = 'buy when short_mavg > long_mavg'
+RSI_RULES = '''
+sell when rsi > 70
+buy when rsi < 30
+'''
+MACD_RULES = 'buy when MACD > Signal_line'
+STOCHASTIC_RULES = '''
+buy when k > d and k < 20
+sell when k < d and k > 80
+'''
+VWMA_RULES = 'buy when VWMA > SMA'
+ICHIMOKU_RULES = 'buy when Conversion_Line > Base_Line and Close > Leading_Span_A and Close > Leading_Span_B'
+# ADX 규칙의 추세 강도 기준값은 파라미터 (walk-forward 그리드에서 조정)
+ADX_THRESHOLD = 25
+ADX_RULES_TEMPLATE = '''
+buy when Plus_DI > Minus_DI and ADX > {threshold}
+sell when Plus_DI < Minus_DI and ADX > {threshold}
+'''
+ADX_RULES = ADX_RULES_TEMPLATE.format(threshold=ADX_THRESHOLD)
+
+# 전략별 결과 PDF 경로
+PDF_PATHS = {
+    'ma': 'result/stock_analysis.pdf',
+    'mplfinance': 'result/stock_analysis_v2.pdf',
+    'rsi': 'result/stock_analysis_v3.pdf',
+    'ma_rsi': 'result/stock_analysis_v4.pdf',
+    'macd': 'result/stock_analysis_macd.pdf',
+    'stochastic': 'result/stock_analysis_stochastic.pdf',
+    'vwma': 'result/stock_analysis_vwma.pdf',
+    'ichimoku': 'result/stock_analysis_ichimoku.pdf',
+    'adx': 'result/stock_analysis_adx.pdf',
+}
 
 
 class StockAnalyzer:
-    def __init__(self, ticker_company_dict):
+    def __init__(self, ticker_company_dict, data_source=None, cache_dir=None, fast_render=False, profile=True,
+                 indicator_dtype=np.float64, result_cache_dir=None):
         self.ticker_company_dict = ticker_company_dict
+        # 지표 컬럼 저장 dtype (np.float32로 지정하면 지표 메모리가 절반)
+        self.indicator_dtype = indicator_dtype
+        # 단계(다운로드/계산/시각화/PDF 저장)별 실행 시간, 처리 행 수, 메모리 기록
+        self.profiler = Profiler(enabled=profile)
+        # fast_render=True이면 figure 재사용 + 다운샘플링 렌더러(chart_renderer) 사용
+        self.fast_render = fast_render
+        data_source = data_source if data_source is not None else YFinanceSource()
+        # 소스별 rate limit 적용 (같은 소스는 하나의 limiter를 공유)
+        rate_limit = getattr(data_source, 'rate_limit', None)
+        self.data_source = RateLimitedSource(data_source, rate_limit) if rate_limit else data_source
+        # cache_dir를 지정하면 로컬 OHLCV 캐시를 거쳐 증분 데이터만 다운로드
+        self.cache = OHLCVCache(self.data_source, cache_dir) if cache_dir is not None else None
+        # result_cache_dir를 지정하면 OHLCV/코드가 바뀐 티커만 다시 계산/시각화 (result_cache.ResultCache)
+        self.result_cache = ResultCache(result_cache_dir) if result_cache_dir is not None else None
 
     def save_tickers(self, tickers):
         with open('tickers.txt', 'w') as file:
@@ -29,27 +83,37 @@ class StockAnalyzer:
         return tickers
 
     def download_stock_data(self, ticker, start_date, end_date):
-        stock_data = yf.download(ticker, start=start_date, end=end_date)
+        with self.profiler.stage('download', ticker=ticker) as stage:
+            if self.cache is not None:
+                stock_data = self.cache.load(ticker, start_date, end_date)
+            else:
+                stock_data = self.data_source.fetch(ticker, start_date, end_date)
+            stage['rows'] = len(stock_data) if stock_data is not None else 0
         return stock_data, ticker
 
-    def calculate_moving_average(self, data, window):
-        return data['Close'].rolling(window=window).mean()
+    def download_many(self, tickers, start_date, end_date, max_workers=8, retries=3, backoff=1.0):
+        downloader = BatchDownloader(lambda ticker: self.download_stock_data(ticker, start_date, end_date)[0],
+                                     max_workers=max_workers, retries=retries, backoff=backoff)
+        stock_frames, self.download_failures = downloader.run(tickers)
+        return stock_frames
 
-    def calculate_bollinger_bands(self, data, window):
-        rolling_mean = data['Close'].rolling(window=window).mean()
-        rolling_std = data['Close'].rolling(window=window).std()
+    def calculate_moving_average(self, data, window, engine=None):
+        engine = engine if engine is not None else IndicatorEngine(data)
+        return engine.rolling('Close', 'mean', window)
+
+    def calculate_bollinger_bands(self, data, window, engine=None):
+        engine = engine if engine is not None else IndicatorEngine(data)
+        rolling_mean = engine.rolling('Close', 'mean', window)
+        rolling_std = engine.rolling('Close', 'std', window)
         upper_band = rolling_mean + (2 * rolling_std)
         lower_band = rolling_mean - (2 * rolling_std)
         return upper_band, lower_band
 
-    def moving_average_cross_strategy(self, data, short_window, long_window):
+    def moving_average_cross_strategy(self, data, short_window, long_window, engine=None):
         signals = pd.DataFrame(index=data.index)
-        signals['short_mavg'] = self.calculate_moving_average(data, short_window)
-        signals['long_mavg'] = self.calculate_moving_average(data, long_window)
-        signals['signal'] = 0.0
-        signals['signal'][short_window:] = np.where(
-            signals['short_mavg'][short_window:] > signals['long_mavg'][short_window:], 1.0, 0.0)
-        signals['positions'] = signals['signal'].diff()
+        signals['short_mavg'] = self.calculate_moving_average(data, short_window, engine)
+        signals['long_mavg'] = self.calculate_moving_average(data, long_window, engine)
+        signals['signal'], signals['positions'] = SignalRules(MA_CROSS_RULES, warmup=short_window).evaluate(signals)
         return signals
 
     def calculate_returns(self, signals, data):
@@ -61,19 +125,19 @@ class StockAnalyzer:
         returns['strategy_returns'] = returns['daily_returns'] * returns['signal'].shift(1)
         return returns
 
-    def rsi_strategy(self, data, window):
+    def rsi_strategy(self, data, window, engine=None):
+        engine = engine if engine is not None else IndicatorEngine(data)
         signals = pd.DataFrame(index=data.index)
-        delta = data['Close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
+        gain = engine.rolling(engine.gain('Close'), 'mean', window)
+        loss = engine.rolling(engine.loss('Close'), 'mean', window)
         RS = gain / loss
         RSI = 100 - (100 / (1 + RS))
-        signals['signal'] = np.where(RSI > 70, -1.0, 0.0)  # Sell when RSI is above 70
-        signals['signal'] = np.where(RSI < 30, 1.0, signals['signal'])  # Buy when RSI is below 30
-        signals['positions'] = signals['signal'].diff()
+        # Sell when RSI is above 70, Buy when RSI is below 30
+        signals['signal'], signals['positions'] = SignalRules(RSI_RULES).evaluate(signals, rsi=RSI)
         return signals
 
     def plot_rsi_strategy(self, stock_data, signals, company_name, pdf):
+        plt = pyplot()
         plt.figure(figsize=(12, 6))
         plt.plot(stock_data['Close'], label='Close Price')
         plt.title(f'RSI Strategy - {company_name}')
@@ -93,6 +157,7 @@ class StockAnalyzer:
         plt.close()
 
     def plot_graph(self, stock_data, signals, company_name, upper_band, lower_band, pdf, returns):
+        plt = pyplot()
         plt.figure(figsize=(12, 6))
         plt.rcParams['font.family'] = 'Malgun Gothic'
         plt.rcParams['axes.unicode_minus'] = False
@@ -112,8 +177,8 @@ class StockAnalyzer:
         # 전략 수익률 플롯
         buy_dates = returns[returns['positions'] == 1.0].index
         sell_dates = returns[returns['positions'] == -1.0].index
-        plt.scatter(buy_dates, stock_data.loc[buy_dates]['Close'], marker='^', s=100, color='c', label='Buy Signal(Sub)')
-        plt.scatter(sell_dates, stock_data.loc[sell_dates]['Close'], marker='v', s=100, color='y', label='Sell Signal(Sub)')
+        plt.scatter(buy_dates, stock_data['Close'][buy_dates], marker='^', s=100, color='c', label='Buy Signal(Sub)')
+        plt.scatter(sell_dates, stock_data['Close'][sell_dates], marker='v', s=100, color='y', label='Sell Signal(Sub)')
 
         plt.title(f'Moving Average Crossover Strategy - {company_name}')
         plt.xlabel('Date')
@@ -124,36 +189,41 @@ class StockAnalyzer:
         plt.close()
 
     def plot_mplfinance(self, stock_data, signals, company_name, upper_band, lower_band, pdf, returns):
+        plt = pyplot()
+        import mplfinance as mpf
         ap_upper = mpf.make_addplot(upper_band, linestyle='--', color='black')
         ap_lower = mpf.make_addplot(lower_band, linestyle='--', color='black')
         ap_short_mavg = mpf.make_addplot(signals['short_mavg'], color='red')
         ap_long_mavg = mpf.make_addplot(signals['long_mavg'], color='blue')
 
         # 데이터 플롯
-        fig, ax = mpf.plot(stock_data, type='candle', addplot=[ap_upper, ap_lower, ap_short_mavg, ap_long_mavg],
+        fig, ax = mpf.plot(stock_data[['Open', 'High', 'Low', 'Close']], type='candle', addplot=[ap_upper, ap_lower, ap_short_mavg, ap_long_mavg],
                            title=f'Moving Average Crossover Strategy - {company_name}', volume=False, style='charles',
                            warn_too_much_data=1000000, returnfig=True)
         # PDF에 저장
         pdf.savefig(fig)
 
     # 1. MACD 전략
-    def calculate_macd(self, data, short_window=12, long_window=26, signal_window=9):
-        data['EMA_short'] = data['Close'].ewm(span=short_window, adjust=False).mean()
-        data['EMA_long'] = data['Close'].ewm(span=long_window, adjust=False).mean()
-        data['MACD'] = data['EMA_short'] - data['EMA_long']
-        data['Signal_line'] = data['MACD'].ewm(span=signal_window, adjust=False).mean()
+    def calculate_macd(self, data, short_window=12, long_window=26, signal_window=9, engine=None):
+        engine = engine if engine is not None else IndicatorEngine(data)
+        ema_short = engine.ewm('Close', short_window, adjust=False)
+        ema_long = engine.ewm('Close', long_window, adjust=False)
+        macd = engine.get(('Close', 'macd', short_window, long_window), lambda: ema_short - ema_long)
+        data['EMA_short'] = ema_short
+        data['EMA_long'] = ema_long
+        data['MACD'] = macd
+        data['Signal_line'] = engine.ewm(macd, signal_window, adjust=False)
         return data
 
     def macd_strategy(self, data):
         signals = pd.DataFrame(index=data.index)
         signals['MACD'] = data['MACD']
         signals['Signal_line'] = data['Signal_line']
-        signals['signal'] = 0.0
-        signals['signal'] = np.where(signals['MACD'] > signals['Signal_line'], 1.0, 0.0)
-        signals['positions'] = signals['signal'].diff()
+        signals['signal'], signals['positions'] = SignalRules(MACD_RULES).evaluate(signals)
         return signals
 
     def plot_macd_strategy(self, data, signals, company_name, pdf):
+        plt = pyplot()
         plt.figure(figsize=(12, 8))
         plt.subplot(2, 1, 1)
         plt.title(f'MACD Strategy - {company_name}')
@@ -177,24 +247,26 @@ class StockAnalyzer:
         plt.close()
 
     # 2. 스토캐스틱 오실레이터 전략
-    def calculate_stochastic_oscillator(self, data, window=14, smooth_window=3):
-        data['Lowest_Low'] = data['Low'].rolling(window=window).min()
-        data['Highest_High'] = data['High'].rolling(window=window).max()
-        data['%K'] = 100 * ((data['Close'] - data['Lowest_Low']) / (data['Highest_High'] - data['Lowest_Low']))
-        data['%D'] = data['%K'].rolling(window=smooth_window).mean()
+    def calculate_stochastic_oscillator(self, data, window=14, smooth_window=3, engine=None):
+        engine = engine if engine is not None else IndicatorEngine(data)
+        data['Lowest_Low'] = engine.rolling('Low', 'min', window)
+        data['Highest_High'] = engine.rolling('High', 'max', window)
+        percent_k = engine.get(('HLC', 'stochastic_k', window),
+                               lambda: 100 * ((data['Close'] - data['Lowest_Low']) / (data['Highest_High'] - data['Lowest_Low'])))
+        data['%K'] = percent_k
+        data['%D'] = engine.rolling(percent_k, 'mean', smooth_window)
         return data
 
     def stochastic_oscillator_strategy(self, data):
         signals = pd.DataFrame(index=data.index)
         signals['%K'] = data['%K']
         signals['%D'] = data['%D']
-        signals['signal'] = 0.0
-        signals['signal'] = np.where((signals['%K'] > signals['%D']) & (signals['%K'] < 20), 1.0, 0.0)
-        signals['signal'] = np.where((signals['%K'] < signals['%D']) & (signals['%K'] > 80), -1.0, signals['signal'])
-        signals['positions'] = signals['signal'].diff()
+        signals['signal'], signals['positions'] = SignalRules(STOCHASTIC_RULES).evaluate(
+            signals, k=signals['%K'], d=signals['%D'])
         return signals
 
     def plot_stochastic_oscillator_strategy(self, data, signals, company_name, pdf):
+        plt = pyplot()
         plt.figure(figsize=(12, 8))
         plt.subplot(2, 1, 1)
         plt.title(f'Stochastic Oscillator Strategy - {company_name}')
@@ -220,23 +292,24 @@ class StockAnalyzer:
         plt.close()
 
     # 3. 볼륨 가중 이동 평균(VWMA) 전략
-    def calculate_vwma(self, data, window=20):
-        price_volume = data['Close'] * data['Volume']
-        vwma = price_volume.rolling(window=window).sum() / data['Volume'].rolling(window=window).sum()
+    def calculate_vwma(self, data, window=20, engine=None):
+        engine = engine if engine is not None else IndicatorEngine(data)
+        price_volume = engine.product('Close', 'Volume')
+        vwma = engine.rolling(price_volume, 'sum', window) / engine.rolling('Volume', 'sum', window)
         data['VWMA'] = vwma
         return data
 
-    def vwma_strategy(self, data):
-        data['SMA'] = data['Close'].rolling(window=20).mean()
+    def vwma_strategy(self, data, engine=None):
+        engine = engine if engine is not None else IndicatorEngine(data)
+        data['SMA'] = engine.rolling('Close', 'mean', 20)
         signals = pd.DataFrame(index=data.index)
         signals['VWMA'] = data['VWMA']
         signals['SMA'] = data['SMA']
-        signals['signal'] = 0.0
-        signals['signal'] = np.where(signals['VWMA'] > signals['SMA'], 1.0, 0.0)
-        signals['positions'] = signals['signal'].diff()
+        signals['signal'], signals['positions'] = SignalRules(VWMA_RULES).evaluate(signals)
         return signals
 
     def plot_vwma_strategy(self, data, signals, company_name, pdf):
+        plt = pyplot()
         plt.figure(figsize=(12, 6))
         plt.title(f'VWMA Strategy - {company_name}')
         plt.plot(data['Close'], label='Close Price')
@@ -254,20 +327,19 @@ class StockAnalyzer:
         plt.close()
 
     # 4. 일목균형표(Ichimoku Cloud) 전략
-    def calculate_ichimoku_cloud(self, data):
-        high9 = data['High'].rolling(window=9).max()
-        low9 = data['Low'].rolling(window=9).min()
-        data['Conversion_Line'] = (high9 + low9) / 2
-
-        high26 = data['High'].rolling(window=26).max()
-        low26 = data['Low'].rolling(window=26).min()
-        data['Base_Line'] = (high26 + low26) / 2
-
-        data['Leading_Span_A'] = ((data['Conversion_Line'] + data['Base_Line']) / 2).shift(26)
-        high52 = data['High'].rolling(window=52).max()
-        low52 = data['Low'].rolling(window=52).min()
-        data['Leading_Span_B'] = ((high52 + low52) / 2).shift(26)
-        data['Lagging_Span'] = data['Close'].shift(-26)
+    # 전환선/기준선/선행스팬B 기간 (기본 9/26/52) - 선행/후행 스팬 이동폭은 기준선 기간
+    def calculate_ichimoku_cloud(self, data, conversion_window=9, base_window=26, span_b_window=52, engine=None):
+        engine = engine if engine is not None else IndicatorEngine(data)
+        # 세 기간의 이동 최고가/최저가를 한 번에 계산
+        windows = [conversion_window, base_window, span_b_window]
+        high_conversion, high_base, high_span_b = engine.rolling_many('High', 'max', windows)
+        low_conversion, low_base, low_span_b = engine.rolling_many('Low', 'min', windows)
+        data['Conversion_Line'] = (high_conversion + low_conversion) / 2
+        data['Base_Line'] = (high_base + low_base) / 2
+
+        data['Leading_Span_A'] = ((data['Conversion_Line'] + data['Base_Line']) / 2).shift(base_window)
+        data['Leading_Span_B'] = ((high_span_b + low_span_b) / 2).shift(base_window)
+        data['Lagging_Span'] = data['Close'].shift(-base_window)
         return data
 
     def ichimoku_strategy(self, data):
@@ -276,14 +348,11 @@ class StockAnalyzer:
         signals['Base_Line'] = data['Base_Line']
         signals['Leading_Span_A'] = data['Leading_Span_A']
         signals['Leading_Span_B'] = data['Leading_Span_B']
-        signals['signal'] = 0.0
-        signals['signal'] = np.where((data['Conversion_Line'] > data['Base_Line']) &
-                                     (data['Close'] > data['Leading_Span_A']) &
-                                     (data['Close'] > data['Leading_Span_B']), 1.0, 0.0)
-        signals['positions'] = signals['signal'].diff()
+        signals['signal'], signals['positions'] = SignalRules(ICHIMOKU_RULES).evaluate(data)
         return signals
 
     def plot_ichimoku_strategy(self, data, signals, company_name, pdf):
+        plt = pyplot()
         plt.figure(figsize=(12, 6))
         plt.title(f'Ichimoku Cloud Strategy - {company_name}')
         plt.plot(data['Close'], label='Close Price')
@@ -307,18 +376,12 @@ class StockAnalyzer:
         plt.close()
 
     # 5. 평균 방향성 지수(ADX) 전략
-    def calculate_adx(self, data, window=14):
-        delta_high = data['High'].diff()
-        delta_low = data['Low'].diff()
-        plus_dm = np.where((delta_high > delta_low) & (delta_high > 0), delta_high, 0.0)
-        minus_dm = np.where((delta_low > delta_high) & (delta_low > 0), delta_low, 0.0)
-        tr1 = data['High'] - data['Low']
-        tr2 = abs(data['High'] - data['Close'].shift())
-        tr3 = abs(data['Low'] - data['Close'].shift())
-        tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        atr = tr.rolling(window=window).mean()
-        plus_di = 100 * (pd.Series(plus_dm).rolling(window=window).mean() / atr)
-        minus_di = 100 * (pd.Series(minus_dm).rolling(window=window).mean() / atr)
+    def calculate_adx(self, data, window=14, engine=None):
+        engine = engine if engine is not None else IndicatorEngine(data)
+        plus_dm, minus_dm = engine.directional_movement()
+        atr = engine.rolling(engine.true_range(), 'mean', window)
+        plus_di = 100 * (engine.rolling(plus_dm, 'mean', window) / atr)
+        minus_di = 100 * (engine.rolling(minus_dm, 'mean', window) / atr)
         dx = (abs(plus_di - minus_di) / (plus_di + minus_di)) * 100
         adx = dx.rolling(window=window).mean()
         data['ADX'] = adx
@@ -326,18 +389,18 @@ class StockAnalyzer:
         data['Minus_DI'] = minus_di
         return data
 
-    def adx_strategy(self, data):
+    def adx_strategy(self, data, threshold=ADX_THRESHOLD):
         signals = pd.DataFrame(index=data.index)
         signals['ADX'] = data['ADX']
         signals['Plus_DI'] = data['Plus_DI']
         signals['Minus_DI'] = data['Minus_DI']
-        signals['signal'] = 0.0
-        signals['signal'] = np.where((signals['Plus_DI'] > signals['Minus_DI']) & (signals['ADX'] > 25), 1.0, 0.0)
-        signals['signal'] = np.where((signals['Plus_DI'] < signals['Minus_DI']) & (signals['ADX'] > 25), -1.0, signals['signal'])
-        signals['positions'] = signals['signal'].diff()
+        # 차트(plot_adx_strategy, chart_renderer)가 규칙과 같은 기준선을 그리도록 시그널 표에 기록
+        signals['ADX_threshold'] = float(threshold)
+        signals['signal'], signals['positions'] = SignalRules(ADX_RULES_TEMPLATE.format(threshold=threshold)).evaluate(signals)
         return signals
 
     def plot_adx_strategy(self, data, signals, company_name, pdf):
+        plt = pyplot()
         plt.figure(figsize=(12, 8))
         plt.subplot(2, 1, 1)
         plt.title(f'ADX Strategy - {company_name}')
@@ -353,109 +416,233 @@ class StockAnalyzer:
 
         plt.subplot(2, 1, 2)
         plt.plot(signals['ADX'], label='ADX', color='orange')
-        plt.axhline(25, color='gray', linestyle='--')
+        plt.axhline(signals['ADX_threshold'].iloc[0], color='gray', linestyle='--')
         plt.legend()
         plt.grid(True)
 
         pdf.savefig()
         plt.close()
 
+    # 티커 하나에 대한 전체 전략 시그널 계산
+    # DataFrame을 넘기면 지표 컬럼은 IndicatorStore에 기록되고 원본 프레임은 수정되지 않음
+    def generate_all_signals(self, stock_data, engine=None):
+        if not isinstance(stock_data, IndicatorStore):
+            stock_data = IndicatorStore(stock_data, dtype=self.indicator_dtype)
+        engine = engine if engine is not None else IndicatorEngine(stock_data)
+        strategies = {
+            'ma': lambda: self.moving_average_cross_strategy(stock_data, 50, 200, engine),
+            'rsi': lambda: self.rsi_strategy(stock_data, window=14, engine=engine),
+            'ma_rsi': lambda: MovingAverageRSIStrategy(stock_data, short_window=50, long_window=200, rsi_window=14,
+                                                       engine=engine).generate_signals(),
+            'macd': lambda: self.macd_strategy(self.calculate_macd(stock_data, engine=engine)),
+            'stochastic': lambda: self.stochastic_oscillator_strategy(
+                self.calculate_stochastic_oscillator(stock_data, engine=engine)),
+            'vwma': lambda: self.vwma_strategy(self.calculate_vwma(stock_data, engine=engine), engine),
+            'ichimoku': lambda: self.ichimoku_strategy(self.calculate_ichimoku_cloud(stock_data, engine=engine)),
+            'adx': lambda: self.adx_strategy(self.calculate_adx(stock_data, engine=engine)),
+            'bollinger': lambda: BollingerBandsStrategy(stock_data, window=20, num_std=2,
+                                                        engine=engine).generate_signals(),
+        }
+        signals = {}
+        for strategy, generate in strategies.items():
+            with self.profiler.stage('strategy', rows=len(stock_data), strategy=strategy):
+                signals[strategy] = generate()
+        return signals
+
+    # 티커 하나에 대한 계산 단계 - 지표 컬럼(IndicatorStore)과 전략별 시그널을 반환
+    def compute_ticker(self, stock_data):
+        # 지표 컬럼은 원본 OHLCV 대신 IndicatorStore에 기록
+        stock_data = IndicatorStore(stock_data, dtype=self.indicator_dtype)
+        # 티커 단위 지표 캐시 - 전략들이 같은 rolling 계산 결과를 공유
+        engine = IndicatorEngine(stock_data)
+        signals = self.generate_all_signals(stock_data, engine)
+
+        # 이동평균 교차 차트에 함께 그리는 볼린저 밴드
+        upper_band, lower_band = self.calculate_bollinger_bands(stock_data, 50, engine)
+        signals['ma'] = signals['ma'].assign(upper_band=upper_band, lower_band=lower_band)
+        return stock_data, signals
+
+    # 티커 하나에 대한 시각화 단계 - compute_ticker 결과(또는 저장된 결과)로 전략별 PDF 페이지를 그림
+    def render_ticker(self, ticker, stock_data, signals, pdfs):
+        company_name = self.ticker_company_dict.get(ticker, ticker)
+        if self.fast_render:
+            from chart_renderer import get_renderer
+            renderer = get_renderer()
+            for strategy in PDF_PATHS:
+                with self.profiler.stage('plot', rows=len(stock_data), strategy=strategy):
+                    renderer.render_strategy(strategy, company_name, stock_data, signals, pdfs)
+            return
+
+        # 이동평균 교차 전략 및 전략 수익률
+        signals_ma = signals['ma']
+        upper_band, lower_band = signals_ma['upper_band'], signals_ma['lower_band']
+        returns = self.calculate_returns(signals_ma, stock_data)
+
+        plots = {
+            'ma': lambda: self.plot_graph(stock_data, signals_ma, company_name, upper_band, lower_band, pdfs['ma'],
+                                          returns),
+            # mplfinance 패키지를 사용한 플롯
+            'mplfinance': lambda: self.plot_mplfinance(stock_data, signals_ma, company_name, upper_band, lower_band,
+                                                       pdfs['mplfinance'], returns),
+            'rsi': lambda: self.plot_rsi_strategy(stock_data, signals['rsi'], company_name, pdfs['rsi']),
+            'ma_rsi': lambda: MovingAverageRSIStrategy(stock_data, short_window=50, long_window=200, rsi_window=14)
+                .plot_moving_average_rsi_strategy(stock_data, signals['ma_rsi'], company_name, pdfs['ma_rsi']),
+            'macd': lambda: self.plot_macd_strategy(stock_data, signals['macd'], company_name, pdfs['macd']),
+            'stochastic': lambda: self.plot_stochastic_oscillator_strategy(stock_data, signals['stochastic'],
+                                                                           company_name, pdfs['stochastic']),
+            'vwma': lambda: self.plot_vwma_strategy(stock_data, signals['vwma'], company_name, pdfs['vwma']),
+            'ichimoku': lambda: self.plot_ichimoku_strategy(stock_data, signals['ichimoku'], company_name,
+                                                            pdfs['ichimoku']),
+            'adx': lambda: self.plot_adx_strategy(stock_data, signals['adx'], company_name, pdfs['adx']),
+        }
+        for strategy, plot in plots.items():
+            with self.profiler.stage('plot', rows=len(stock_data), strategy=strategy):
+                plot()
+
+    # 티커 하나에 대한 전략 계산 및 시각화
+    def analyze_ticker(self, ticker, stock_data, pdfs):
+        stock_data, signals = self.compute_ticker(stock_data)
+        self.render_ticker(ticker, stock_data, signals, pdfs)
+        return stock_data, signals
+
     # 전체 주식 분석 실행
-    def analyze_stocks(self):
+    # workers를 지정하면 티커를 프로세스 풀에 분산하고, render=False이면 PDF 없이 시그널 표만 저장
+    # pipelined=True이면 다운로드/계산/시각화 단계를 겹쳐서 실행 (pipeline.Pipeline, 결과는 순차 실행과 동일)
+    # 실행이 끝나면 단계별 프로파일을 result/profile.json, result/profile.prom으로 저장
+    def analyze_stocks(self, workers=None, render=True, signals_path=SIGNALS_PATH, pipelined=False):
         current_date = datetime.datetime.now().strftime('%Y-%m-%d')
         start_date = '2020-01-01'
         end_date = current_date
 
-        # 기존 PDF 파일들
-        pdf_path = 'result/stock_analysis.pdf'
-        pdf = PdfPages(pdf_path)
-        pdf_path_v2 = 'result/stock_analysis_v2.pdf'
-        pdf_v2 = PdfPages(pdf_path_v2)
-        pdf_path_v3 = 'result/stock_analysis_v3.pdf'
-        pdf_v3 = PdfPages(pdf_path_v3)
-        pdf_path_v4 = 'result/stock_analysis_v4.pdf'
-        pdf_v4 = PdfPages(pdf_path_v4)
-
-        # 새로운 전략을 위한 PDF 파일
-        pdf_path_macd = 'result/stock_analysis_macd.pdf'
-        pdf_macd = PdfPages(pdf_path_macd)
-        pdf_path_stochastic = 'result/stock_analysis_stochastic.pdf'
-        pdf_stochastic = PdfPages(pdf_path_stochastic)
-        pdf_path_vwma = 'result/stock_analysis_vwma.pdf'
-        pdf_vwma = PdfPages(pdf_path_vwma)
-        pdf_path_ichimoku = 'result/stock_analysis_ichimoku.pdf'
-        pdf_ichimoku = PdfPages(pdf_path_ichimoku)
-        pdf_path_adx = 'result/stock_analysis_adx.pdf'
-        pdf_adx = PdfPages(pdf_path_adx)
-
-        for ticker in self.ticker_company_dict.keys():
-            stock_data, company_name = self.download_stock_data(ticker, start_date, end_date)
-
-            # 이동평균 교차 전략 파라미터 설정
-            short_window = 50
-            long_window = 200
-
-            # 이동평균 교차 전략 계산
-            signals = self.moving_average_cross_strategy(stock_data, short_window, long_window)
-
-            # 볼린저 밴드 계산
-            upper_band, lower_band = self.calculate_bollinger_bands(stock_data, short_window)
-
-            # 전략 수익률 계산
-            returns = self.calculate_returns(signals, stock_data)
-
-            self.plot_graph(stock_data, signals, self.ticker_company_dict[ticker], upper_band, lower_band, pdf, returns)
-            # mplfinance 패키지를 사용한 플롯
-            self.plot_mplfinance(stock_data, signals, self.ticker_company_dict[ticker], upper_band, lower_band, pdf_v2, returns)
-
-            # RSI 전략 계산 및 시각화
-            signals_rsi = self.rsi_strategy(stock_data, window=14)
-            self.plot_rsi_strategy(stock_data, signals_rsi, self.ticker_company_dict[ticker], pdf_v3)
-            # MovingAverageRSIStrategy 클래스의 인스턴스 생성
-            signals_ma_rsi_strategy = MovingAverageRSIStrategy(stock_data, short_window=50, long_window=200,
-                                                               rsi_window=14)
-
-            # 이동평균과 RSI를 융합한 전략 계산
-            signals_ma_rsi = signals_ma_rsi_strategy.generate_signals()
-
-            # 그래프 그리기
-            signals_ma_rsi_strategy.plot_moving_average_rsi_strategy(stock_data, signals_ma_rsi, self.ticker_company_dict[ticker], pdf_v4)
-
-            # MACD 전략 계산 및 시각화
-            stock_data_macd = self.calculate_macd(stock_data)
-            signals_macd = self.macd_strategy(stock_data_macd)
-            self.plot_macd_strategy(stock_data_macd, signals_macd, self.ticker_company_dict[ticker], pdf_macd)
-
-            # 스토캐스틱 오실레이터 전략 계산 및 시각화
-            stock_data_stochastic = self.calculate_stochastic_oscillator(stock_data)
-            signals_stochastic = self.stochastic_oscillator_strategy(stock_data_stochastic)
-            self.plot_stochastic_oscillator_strategy(stock_data_stochastic, signals_stochastic, self.ticker_company_dict[ticker], pdf_stochastic)
-
-            # VWMA 전략 계산 및 시각화
-            stock_data_vwma = self.calculate_vwma(stock_data)
-            signals_vwma = self.vwma_strategy(stock_data_vwma)
-            self.plot_vwma_strategy(stock_data_vwma, signals_vwma, self.ticker_company_dict[ticker], pdf_vwma)
-
-            # 일목균형표 전략 계산 및 시각화
-            stock_data_ichimoku = self.calculate_ichimoku_cloud(stock_data)
-            signals_ichimoku = self.ichimoku_strategy(stock_data_ichimoku)
-            self.plot_ichimoku_strategy(stock_data_ichimoku, signals_ichimoku, self.ticker_company_dict[ticker], pdf_ichimoku)
-
-            # ADX 전략 계산 및 시각화
-            stock_data_adx = self.calculate_adx(stock_data)
-            signals_adx = self.adx_strategy(stock_data_adx)
-            self.plot_adx_strategy(stock_data_adx, signals_adx, self.ticker_company_dict[ticker], pdf_adx)
+        if pipelined:
+            from pipeline import Pipeline
+            with profiling_hooks(), self.profiler.stage('analyze_stocks'):
+                pipeline = Pipeline(self, compute_workers=workers)
+                results = pipeline.run(self.ticker_company_dict.keys(), start_date, end_date, render)
+                self.download_failures = pipeline.failures
+                with self.profiler.stage('save_signals'):
+                    save_signals(signals_path, results)
+            self.profiler.export()
+            return
+
+        with profiling_hooks(), self.profiler.stage('analyze_stocks'):
+            # 전체 티커를 동시에 다운로드
+            with self.profiler.stage('download_many') as stage:
+                stock_frames = self.download_many(list(self.ticker_company_dict.keys()), start_date, end_date)
+                stage['rows'] = sum(len(stock_data) for stock_data in stock_frames.values())
+
+            inputs = {}
+            for ticker in self.ticker_company_dict.keys():
+                if ticker not in stock_frames:
+                    print(f"{ticker} 주식 데이터 다운로드 실패: {self.download_failures[ticker]}")
+                    continue
+                inputs[ticker] = (stock_frames[ticker], None)
+
+            if self.result_cache is not None:
+                results = run_cached(self, self.result_cache, inputs, workers, render)
+            else:
+                results = self.run_tickers(inputs, workers, render)
+            with self.profiler.stage('save_signals'):
+                save_signals(signals_path, results)
+        self.profiler.export()
+
+    # 최근 시그널 전환 스크리닝 - 전략별로 필요한 최근 구간만 불러와 계산하고 순위 표를 저장
+    def screen_stocks(self, strategies=None, max_age=0, end_date=None, path=None):
+        from screener import SCREEN_PATH, screen
+        with profiling_hooks(), self.profiler.stage('screen_stocks'):
+            table = screen(self, strategies=strategies, max_age=max_age, end_date=end_date)
+            table.to_csv(path or SCREEN_PATH, index=False)
+        self.profiler.export()
+        return table
+
+    # 저장된 시그널 표로부터 PDF만 다시 생성
+    def render_stocks(self, signals_path=SIGNALS_PATH, workers=None):
+        with profiling_hooks(), self.profiler.stage('render_stocks'):
+            with self.profiler.stage('load_signals'):
+                inputs = load_signals(signals_path)
+            self.run_tickers(inputs, workers, render=True)
+        self.profiler.export()
+
+    # inputs: ticker -> (stock_data, signals) - signals가 None이면 계산 단계부터 수행
+    def run_tickers(self, inputs, workers=None, render=True):
+        if workers is not None and workers > 1:
+            return self.run_tickers_parallel(inputs, workers, render)
+
+        pdfs = {name: pdf_pages(path) for name, path in PDF_PATHS.items()} if render else None
+        results = {}
+        for ticker, (stock_data, signals) in inputs.items():
+            with self.profiler.stage('ticker', rows=len(stock_data), ticker=ticker):
+                results[ticker] = self.process_ticker(ticker, stock_data, signals, pdfs)
 
             # 선택된 ticker 출력
-            print(f"{self.ticker_company_dict[ticker]} 주식 데이터의 Ticker: {ticker}")
+            print(f"{self.ticker_company_dict.get(ticker, ticker)} 주식 데이터의 Ticker: {ticker}")
 
         # PDF 파일 닫기
-        pdf_adx.close()
-        pdf_ichimoku.close()
-        pdf_vwma.close()
-        pdf_macd.close()
-        pdf_stochastic.close()
-        pdf_v4.close()
-        pdf_v3.close()
-        pdf_v2.close()
-        pdf.close()
+        if render:
+            with self.profiler.stage('pdf_write'):
+                for pdf in pdfs.values():
+                    pdf.close()
+        return results
+
+    # 티커 하나의 계산(signals가 None일 때) / 시각화(pdfs가 있을 때) 후 시그널 표를 반환
+    def process_ticker(self, ticker, stock_data, signals, pdfs):
+        if signals is None:
+            with self.profiler.stage('compute', rows=len(stock_data)):
+                stock_data, signals = self.compute_ticker(stock_data)
+        if pdfs is not None:
+            with self.profiler.stage('render', rows=len(stock_data)):
+                self.render_ticker(ticker, stock_data, signals, pdfs)
+        with self.profiler.stage('signals_to_frame', rows=len(stock_data)):
+            return signals_to_frame(stock_data, signals)
+
+    def run_tickers_parallel(self, inputs, workers, render):
+        with tempfile.TemporaryDirectory() as shard_dir:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(run_ticker_shard, index, ticker, self.ticker_company_dict.get(ticker, ticker),
+                                           stock_data, signals, shard_dir if render else None, self.fast_render,
+                                           self.profiler.enabled, self.indicator_dtype)
+                           for index, (ticker, (stock_data, signals)) in enumerate(inputs.items())]
+                shards = [future.result() for future in futures]
+            # 워커에서 기록한 단계별 프로파일을 합침
+            for _, _, records in shards:
+                self.profiler.extend(records)
+
+            # 티커 순서대로 전략별 PDF 조각을 병합
+            if render:
+                with self.profiler.stage('pdf_write'):
+                    for name, path in PDF_PATHS.items():
+                        merge_pdfs([shard_paths[name] for shard_paths, _, _ in shards], path)
+        return {ticker: frame for ticker, (_, frame, _) in zip(inputs, shards)}
+
+
+# 프로세스 풀 워커 - 티커 하나를 계산하고, shard_dir가 있으면 전략별 PDF 조각으로 저장
+# 반환값: (PDF 조각 경로, 시그널 표, 단계별 프로파일 기록)
+def run_ticker_shard(index, ticker, company_name, stock_data, signals, shard_dir, fast_render=False, profile=True,
+                     indicator_dtype=np.float64):
+    analyzer = StockAnalyzer({ticker: company_name}, fast_render=fast_render, profile=profile,
+                             indicator_dtype=indicator_dtype)
+    profiler = analyzer.profiler
+    shard_paths = None
+    with profiling_hooks(suffix=f'{os.getpid()}.{index}'), profiler.stage('ticker', rows=len(stock_data), ticker=ticker):
+        if shard_dir is None:
+            frame = analyzer.process_ticker(ticker, stock_data, signals, None)
+        else:
+            shard_paths = {name: os.path.join(shard_dir, f'{index:06d}_{name}.pdf') for name in PDF_PATHS}
+            pdfs = {name: pdf_pages(path) for name, path in shard_paths.items()}
+            try:
+                frame = analyzer.process_ticker(ticker, stock_data, signals, pdfs)
+            finally:
+                with profiler.stage('pdf_write'):
+                    for pdf in pdfs.values():
+                        pdf.close()
+    print(f"{company_name} 주식 데이터의 Ticker: {ticker}")
+    return shard_paths, frame, profiler.records
+
+
+def merge_pdfs(paths, output_path):
+    from pypdf import PdfWriter
+    writer = PdfWriter()
+    for path in paths:
+        writer.append(path)
+    with open(output_path, 'wb') as f:
+        writer.write(f)
@@ -0,0 +1,311 @@
+import math
+from collections import deque
+
+NAN = float('nan')
+
+
+# ---- 기본 구성 요소 ----
+
+# 이동 구간 합계/개수 (Kahan 보정) - pandas rolling(window, min_periods).mean()/sum()과 같은 결과
+class RollingSum:
+    def __init__(self, window, min_periods=None):
+        self.window = window
+        self.min_periods = window if min_periods is None else max(min_periods, 1)
+        self.values = deque()
+        self.total = 0.0
+        self.compensation = 0.0
+        self.count = 0
+
+    def _add(self, x):
+        y = x - self.compensation
+        t = self.total + y
+        self.compensation = (t - self.total) - y
+        self.total = t
+
+    def update(self, x):
+        self.values.append(x)
+        if not math.isnan(x):
+            self._add(x)
+            self.count += 1
+        if len(self.values) > self.window:
+            old = self.values.popleft()
+            if not math.isnan(old):
+                self._add(-old)
+                self.count -= 1
+        if self.count == 0:
+            self.total, self.compensation = 0.0, 0.0
+
+    def sum(self):
+        return self.total if self.count >= self.min_periods else NAN
+
+    def mean(self):
+        return self.total / self.count if self.count >= self.min_periods else NAN
+
+
+# 단조 덱을 이용한 이동 최대/최소 - 갱신당 amortized O(1), 창 안에 NaN이 있으면 NaN
+class RollingExtremum:
+    def __init__(self, window, stat='max'):
+        self.window = window
+        self.better = (lambda a, b: a >= b) if stat == 'max' else (lambda a, b: a <= b)
+        self.candidates = deque()
+        self.index = -1
+        self.last_nan = -window
+
+    def update(self, x):
+        self.index += 1
+        if math.isnan(x):
+            self.last_nan = self.index
+        else:
+            while self.candidates and self.better(x, self.candidates[-1][1]):
+                self.candidates.pop()
+            self.candidates.append((self.index, x))
+        while self.candidates and self.candidates[0][0] <= self.index - self.window:
+            self.candidates.popleft()
+        if self.index < self.window - 1 or self.last_nan > self.index - self.window:
+            return NAN
+        return self.candidates[0][1]
+
+
+# pandas ewm(span, adjust).mean()과 같은 재귀식 (ignore_na=False, min_periods=0)
+class EMA:
+    def __init__(self, span, adjust=False):
+        alpha = 2.0 / (span + 1.0)
+        self.old_wt_factor = 1.0 - alpha
+        self.new_wt = 1.0 if adjust else alpha
+        self.adjust = adjust
+        self.weighted = None
+        self.old_wt = 1.0
+
+    def update(self, x):
+        if self.weighted is None:
+            self.weighted = x
+        elif not math.isnan(self.weighted):
+            self.old_wt *= self.old_wt_factor
+            if not math.isnan(x):
+                if self.weighted != x:
+                    self.weighted = (self.old_wt * self.weighted + self.new_wt * x) / (self.old_wt + self.new_wt)
+                self.old_wt = self.old_wt + self.new_wt if self.adjust else 1.0
+        elif not math.isnan(x):
+            self.weighted = x
+        return self.weighted
+
+
+# ---- 지표 (update는 StockAnalyzer의 배치 계산과 같은 컬럼 이름의 dict를 반환) ----
+
+class StreamingIndicator:
+    fields = ('Close',)
+
+    # 과거 데이터로 한 번 초기화 - 이후에는 update로 봉 단위 갱신
+    def seed(self, data):
+        output = None
+        for bar in data[list(self.fields)].to_dict('records'):
+            output = self.update(bar)
+        return output
+
+
+class SMA(StreamingIndicator):
+    def __init__(self, window, min_periods=None, name='SMA'):
+        self.rolling = RollingSum(window, min_periods)
+        self.name = name
+
+    def update(self, bar):
+        self.rolling.update(bar['Close'])
+        return {self.name: self.rolling.mean()}
+
+
+class MACD(StreamingIndicator):
+    def __init__(self, short_window=12, long_window=26, signal_window=9):
+        self.ema_short = EMA(short_window)
+        self.ema_long = EMA(long_window)
+        self.ema_signal = EMA(signal_window)
+
+    def update(self, bar):
+        ema_short = self.ema_short.update(bar['Close'])
+        ema_long = self.ema_long.update(bar['Close'])
+        macd = ema_short - ema_long
+        return {'EMA_short': ema_short, 'EMA_long': ema_long, 'MACD': macd,
+                'Signal_line': self.ema_signal.update(macd)}
+
+
+# StockAnalyzer.rsi_strategy의 RSI (단순 이동평균)
+class RSI(StreamingIndicator):
+    def __init__(self, window=14):
+        self.gain = RollingSum(window)
+        self.loss = RollingSum(window)
+        self.prev_close = NAN
+
+    def update_averages(self, close):
+        delta = close - self.prev_close
+        self.prev_close = close
+        self.gain.update(delta if delta > 0 else 0.0)
+        self.loss.update(-delta if delta < 0 else 0.0)
+        return self.gain.mean(), self.loss.mean()
+
+    def update(self, bar):
+        gain, loss = self.update_averages(bar['Close'])
+        return {'RSI': rsi_value(gain, loss)}
+
+
+# MovingAverageRSIStrategy.calculate_rsi의 RSI (min_periods=1 이동평균 후 지수평활)
+class SmoothedRSI(RSI):
+    def __init__(self, window=14):
+        self.gain = RollingSum(window, min_periods=1)
+        self.loss = RollingSum(window, min_periods=1)
+        self.avg_gain = EMA(window, adjust=True)
+        self.avg_loss = EMA(window, adjust=True)
+        self.prev_close = NAN
+
+    def update(self, bar):
+        gain, loss = self.update_averages(bar['Close'])
+        return {'rsi': rsi_value(self.avg_gain.update(gain), self.avg_loss.update(loss))}
+
+
+def rsi_value(gain, loss):
+    if math.isnan(gain) or math.isnan(loss):
+        return NAN
+    if loss == 0:
+        return NAN if gain == 0 else 100.0
+    return 100 - (100 / (1 + gain / loss))
+
+
+# 볼린저 밴드 - 이동 구간 Welford 분산 (표본 표준편차, ddof=1)
+class BollingerBands(StreamingIndicator):
+    def __init__(self, window=20, num_std=2):
+        self.window = window
+        self.num_std = num_std
+        self.values = deque()
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, bar):
+        x = bar['Close']
+        self.values.append(x)
+        if not math.isnan(x):
+            self.count += 1
+            delta = x - self.mean
+            self.mean += delta / self.count
+            self.m2 += delta * (x - self.mean)
+        if len(self.values) > self.window:
+            old = self.values.popleft()
+            if not math.isnan(old):
+                self.count -= 1
+                if self.count == 0:
+                    self.mean, self.m2 = 0.0, 0.0
+                else:
+                    delta = old - self.mean
+                    self.mean -= delta / self.count
+                    self.m2 -= delta * (old - self.mean)
+        if self.count < self.window:
+            return {'Upper_Band': NAN, 'Lower_Band': NAN}
+        std = math.sqrt(max(self.m2, 0.0) / (self.count - 1)) if self.count > 1 else NAN
+        return {'Upper_Band': self.mean + self.num_std * std, 'Lower_Band': self.mean - self.num_std * std}
+
+
+class VWMA(StreamingIndicator):
+    fields = ('Close', 'Volume')
+
+    def __init__(self, window=20):
+        self.price_volume = RollingSum(window)
+        self.volume = RollingSum(window)
+
+    def update(self, bar):
+        self.price_volume.update(bar['Close'] * bar['Volume'])
+        self.volume.update(float(bar['Volume']))
+        volume = self.volume.sum()
+        return {'VWMA': self.price_volume.sum() / volume if volume else NAN}
+
+
+class StochasticOscillator(StreamingIndicator):
+    fields = ('High', 'Low', 'Close')
+
+    def __init__(self, window=14, smooth_window=3):
+        self.lowest_low = RollingExtremum(window, 'min')
+        self.highest_high = RollingExtremum(window, 'max')
+        self.percent_d = RollingSum(smooth_window)
+
+    def update(self, bar):
+        lowest_low = self.lowest_low.update(bar['Low'])
+        highest_high = self.highest_high.update(bar['High'])
+        value_range = highest_high - lowest_low
+        percent_k = 100 * ((bar['Close'] - lowest_low) / value_range) if value_range else NAN
+        self.percent_d.update(percent_k)
+        return {'Lowest_Low': lowest_low, 'Highest_High': highest_high, '%K': percent_k,
+                '%D': self.percent_d.mean()}
+
+
+# 일목균형표 - 후행스팬(Lagging_Span)은 미래 종가가 필요하므로 스트리밍에서는 제공하지 않음
+class IchimokuCloud(StreamingIndicator):
+    fields = ('High', 'Low')
+
+    def __init__(self, conversion_window=9, base_window=26, span_b_window=52):
+        self.windows = (conversion_window, base_window, span_b_window)
+        self.highs = [RollingExtremum(window, 'max') for window in self.windows]
+        self.lows = [RollingExtremum(window, 'min') for window in self.windows]
+        # 선행스팬은 기준선 기간만큼 전의 값을 사용
+        self.pending = deque([(NAN, NAN)] * base_window)
+
+    def update(self, bar):
+        high = [rolling.update(bar['High']) for rolling in self.highs]
+        low = [rolling.update(bar['Low']) for rolling in self.lows]
+        conversion_line = (high[0] + low[0]) / 2
+        base_line = (high[1] + low[1]) / 2
+        self.pending.append(((conversion_line + base_line) / 2, (high[2] + low[2]) / 2))
+        leading_span_a, leading_span_b = self.pending.popleft()
+        return {'Conversion_Line': conversion_line, 'Base_Line': base_line,
+                'Leading_Span_A': leading_span_a, 'Leading_Span_B': leading_span_b}
+
+
+# StockAnalyzer.calculate_adx와 같은 정의 (단순 이동평균 기반)
+class ADX(StreamingIndicator):
+    fields = ('High', 'Low', 'Close')
+
+    def __init__(self, window=14):
+        self.atr = RollingSum(window)
+        self.plus_dm = RollingSum(window)
+        self.minus_dm = RollingSum(window)
+        self.dx = RollingSum(window)
+        self.prev = None
+
+    def update(self, bar):
+        high, low, close = bar['High'], bar['Low'], bar['Close']
+        if self.prev is None:
+            plus_dm = minus_dm = 0.0
+            tr = high - low
+        else:
+            prev_high, prev_low, prev_close = self.prev
+            delta_high, delta_low = high - prev_high, low - prev_low
+            plus_dm = delta_high if (delta_high > delta_low) and (delta_high > 0) else 0.0
+            minus_dm = delta_low if (delta_low > delta_high) and (delta_low > 0) else 0.0
+            candidates = [value for value in (high - low, abs(high - prev_close), abs(low - prev_close))
+                          if not math.isnan(value)]
+            tr = max(candidates) if candidates else NAN
+        self.prev = (high, low, close)
+
+        self.atr.update(tr)
+        self.plus_dm.update(plus_dm)
+        self.minus_dm.update(minus_dm)
+        atr = self.atr.mean()
+        plus_di = 100 * (self.plus_dm.mean() / atr) if atr else NAN
+        minus_di = 100 * (self.minus_dm.mean() / atr) if atr else NAN
+        di_sum = plus_di + minus_di
+        self.dx.update((abs(plus_di - minus_di) / di_sum) * 100 if di_sum else NAN)
+        return {'ADX': self.dx.mean(), 'Plus_DI': plus_di, 'Minus_DI': minus_di}
+
+
+# 티커 하나에 대한 기본 지표 묶음 - analyze_stocks와 같은 파라미터
+class StreamingIndicatorSet(StreamingIndicator):
+    fields = ('High', 'Low', 'Close', 'Volume')
+
+    def __init__(self):
+        self.indicators = [
+            SMA(50, name='short_mavg'), SMA(200, name='long_mavg'), SMA(20),
+            MACD(), RSI(14), SmoothedRSI(14), BollingerBands(50, 2), VWMA(20),
+            StochasticOscillator(), IchimokuCloud(), ADX(),
+        ]
+
+    def update(self, bar):
+        output = {}
+        for indicator in self.indicators:
+            output.update(indicator.update(bar))
+        return output
@@ -0,0 +1,70 @@
+import os
+import sys
+import pandas as pd
+import pytest
+
+# 저장소 루트의 모듈(stock_analysis, panel, ...)을 그대로 import
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmark import synthetic_ohlcv
+
+
+# 합성 OHLCV 3개 티커 - 휴장일/NaN 행 포함, 상장일과 가격 규모가 서로 다름
+@pytest.fixture(scope='session')
+def stock_frames():
+    frames = {
+        'AAA': synthetic_ohlcv(700, seed=1, start='2020-01-02'),
+        'BBB': synthetic_ohlcv(500, seed=2, start='2020-09-01'),
+        'CCC': synthetic_ohlcv(650, seed=3, start='2020-01-02'),
+    }
+    frames['CCC'][['Open', 'High', 'Low', 'Close', 'Adj Close']] *= 1000
+    return frames
+
+
+# 네트워크 없는 데이터 소스 - 메모리의 프레임을 CsvDirectorySource와 같은 규칙(end_date 미포함)으로 잘라 반환
+# requests에 (ticker, start_date, end_date) 호출 기록
+class FrameSource:
+    name = 'frames'
+    rate_limit = None
+
+    def __init__(self, frames):
+        self.frames = {ticker: frame.copy() for ticker, frame in frames.items()}
+        self.requests = []
+
+    def fetch(self, ticker, start_date, end_date):
+        self.requests.append((ticker, str(start_date), str(end_date)))
+        frame = self.frames[ticker]
+        return frame.loc[(frame.index >= pd.Timestamp(start_date)) & (frame.index < pd.Timestamp(end_date))]
+
+
+@pytest.fixture
+def frame_source(stock_frames):
+    return FrameSource(stock_frames)
+
+
+# analyze_stocks 실행용 작업 디렉터리 - stock_frames를 CSV 소스로 저장하고 result/ 아래에 결과를 씀
+@pytest.fixture
+def workdir(tmp_path, monkeypatch, stock_frames):
+    source_dir = tmp_path / 'source'
+    source_dir.mkdir()
+    for ticker, frame in stock_frames.items():
+        frame.to_csv(source_dir / f'{ticker}.csv')
+    (tmp_path / 'result').mkdir()
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+# run_analysis(name, **analyze_stocks 옵션) -> (정렬된 시그널 표, analyzer) - PDF 없이 실행
+@pytest.fixture
+def run_analysis(workdir):
+    from data_cache import CsvDirectorySource
+    from stock_analysis import StockAnalyzer
+
+    def run(name, result_cache_dir=None, **kwargs):
+        analyzer = StockAnalyzer({'AAA': 'a', 'BBB': 'b', 'CCC': 'c'},
+                                 data_source=CsvDirectorySource(str(workdir / 'source')),
+                                 result_cache_dir=result_cache_dir)
+        path = str(workdir / 'result' / f'{name}.pkl')
+        analyzer.analyze_stocks(render=False, signals_path=path, **kwargs)
+        return pd.read_pickle(path).sort_index(), analyzer
+    return run
@@ -0,0 +1,69 @@
+import time
+import pandas as pd
+import pytest
+from batch_downloader import BatchDownloader, DownloadError, RateLimiter
+from stock_analysis import StockAnalyzer
+
+
+# 처음 failures번은 오류 또는 빈 결과, 이후 데이터를 반환하는 fetch
+class FlakyFetch:
+    def __init__(self, source, failures, empty=False):
+        self.source = source
+        self.failures = failures
+        self.empty = empty
+        self.calls = 0
+
+    def __call__(self, ticker):
+        self.calls += 1
+        if self.calls <= self.failures:
+            if self.empty:
+                return pd.DataFrame()
+            raise ConnectionError('temporary')
+        return self.source.fetch(ticker, '2020-01-01', '2030-01-01')
+
+
+@pytest.mark.parametrize('empty', [False, True])
+def test_retries_transient_failures(frame_source, stock_frames, empty):
+    fetch = FlakyFetch(frame_source, 2, empty)
+    data = BatchDownloader(fetch, retries=2, backoff=0).fetch_with_retry('AAA')
+    pd.testing.assert_frame_equal(data, stock_frames['AAA'])
+    assert fetch.calls == 3
+
+
+@pytest.mark.parametrize('empty', [False, True])
+def test_gives_up_after_retries(frame_source, empty):
+    fetch = FlakyFetch(frame_source, 10, empty)
+    with pytest.raises(DownloadError):
+        BatchDownloader(fetch, retries=2, backoff=0).fetch_with_retry('AAA')
+    assert fetch.calls == 3
+
+
+# 티커별 프레임으로 나눠 반환 - 실패한 티커는 failures에 기록하고 나머지는 계속 진행
+def test_download_many(frame_source, stock_frames):
+    analyzer = StockAnalyzer({}, data_source=frame_source, profile=False)
+    frames = analyzer.download_many(['AAA', 'ZZZ', 'BBB', 'CCC'], '2020-06-01', '2021-06-01', max_workers=3,
+                                    retries=1, backoff=0)
+    assert list(frames) == ['AAA', 'BBB', 'CCC']
+    assert list(analyzer.download_failures) == ['ZZZ']
+    for ticker, frame in frames.items():
+        source = stock_frames[ticker]
+        pd.testing.assert_frame_equal(frame, source.loc['2020-06-01':'2021-05-31'])
+
+
+# 캐시를 거친 다운로드도 같은 결과이고, 두 번째 실행은 소스에 요청하지 않음
+def test_download_many_through_cache(tmp_path, frame_source, stock_frames):
+    analyzer = StockAnalyzer({}, data_source=frame_source, cache_dir=str(tmp_path), profile=False)
+    first = analyzer.download_many(list(stock_frames), '2020-01-01', '2022-01-01', backoff=0)
+    requests = len(frame_source.requests)
+    second = analyzer.download_many(list(stock_frames), '2020-01-01', '2022-01-01', backoff=0)
+    assert len(frame_source.requests) == requests
+    for ticker in stock_frames:
+        pd.testing.assert_frame_equal(first[ticker], second[ticker], check_freq=False)
+
+
+def test_rate_limiter_spacing():
+    limiter = RateLimiter(50)
+    start = time.monotonic()
+    for _ in range(6):
+        limiter.acquire()
+    assert time.monotonic() - start >= 5 / 50 * 0.9
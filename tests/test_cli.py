@@ -0,0 +1,71 @@
+import datetime
+import json
+import os
+import subprocess
+import sys
+import pytest
+from cli import cmd_analyze, cmd_screen, parse_args, select_tickers
+from data_cache import CsvDirectorySource, OHLCVCache
+from ticker_registry import TickerRegistry
+
+REGISTRY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Ticker.reg')
+
+
+# 명령을 생략하면 analyze 기본 옵션
+def test_default_command():
+    args = parse_args([])
+    assert args.command == 'analyze' and args.func is cmd_analyze
+    assert args.select is None and not args.no_render
+
+
+# --select는 하위 명령 뒤에서 받고, 뒤따르는 옵션과 섞이지 않음
+def test_select_after_command():
+    args = parse_args(['analyze', '--select', 'AAPL', 'MSFT', '--no-render'])
+    assert args.func is cmd_analyze
+    assert args.select == ['AAPL', 'MSFT'] and args.no_render
+    args = parse_args(['screen', '--max-age', '3', '--select', 'AAPL'])
+    assert args.func is cmd_screen
+    assert args.select == ['AAPL'] and args.max_age == 3
+
+
+# --allocation top_n은 다운로드 전에 --top-n 누락을 알림
+def test_backtest_top_n_requires_count():
+    with pytest.raises(SystemExit):
+        parse_args(['backtest', '--allocation', 'top_n'])
+    assert parse_args(['backtest', '--allocation', 'top_n', '--top-n', '5']).top_n == 5
+
+
+# README 예시: 레지스트리 조건도 하위 명령 뒤에서 받음
+def test_registry_filters_after_command():
+    args = parse_args(['analyze', '--market', 'KOSPI', '--sector', '금융', '--no-render'])
+    assert args.func is cmd_analyze
+    assert args.market == ['KOSPI'] and args.sector == ['금융'] and args.no_render
+    args = parse_args(['screen', '--name-prefix', '삼성', '--market', 'KOSPI', 'KOSDAQ'])
+    assert args.func is cmd_screen
+    assert args.name_prefix == '삼성' and args.market == ['KOSPI', 'KOSDAQ']
+
+
+def test_select_tickers_from_registry():
+    args = parse_args(['analyze', '--registry', REGISTRY, '--market', 'KOSPI', '--sector', '금융'])
+    tickers = select_tickers(args)
+    registry = TickerRegistry(REGISTRY)
+    assert tickers and all(registry.get(ticker).sector == '금융' for ticker in tickers)
+    assert all(registry.get(ticker).market == 'KOSPI' for ticker in tickers)
+
+
+# 시각화 없는 실행은 matplotlib을 불러오지 않음 (OHLCV 캐시를 미리 채워 네트워크 없이 실행)
+@pytest.mark.parametrize('options', [['--pipelined'], ['--result-cache', 'result_cache']])
+def test_no_render_skips_matplotlib(workdir, options):
+    end_date = datetime.datetime.now().strftime('%Y-%m-%d')
+    cache = OHLCVCache(CsvDirectorySource(str(workdir / 'source')), str(workdir / 'cache'))
+    for ticker in ('AAA', 'BBB'):
+        cache.load(ticker, '2020-01-01', end_date)
+    with open(workdir / 'tickers.json', 'w') as f:
+        json.dump({'AAA': 'a', 'BBB': 'b'}, f)
+    argv = ['analyze', '--tickers', 'tickers.json', '--cache-dir', 'cache', '--no-render'] + options
+    script = (f'import sys, cli; cli.main({argv!r}); '
+              'print(sorted(name for name in sys.modules if name.split(".")[0] == "matplotlib"))')
+    output = subprocess.run([sys.executable, '-c', script], cwd=str(workdir), capture_output=True, text=True,
+                            env=dict(os.environ, PYTHONPATH=os.path.dirname(REGISTRY)), check=True).stdout
+    assert output.strip().splitlines()[-1] == '[]'
+    assert os.path.exists(workdir / 'result' / 'signals.csv.gz')
@@ -0,0 +1,33 @@
+import datetime
+import pandas as pd
+from cluster import Coordinator, SQLiteQueue, run_worker
+from data_cache import CsvDirectorySource
+
+
+# 코디네이터/워커(SQLite 큐)로 나누어 실행한 시그널 표 == 직렬 실행 결과
+def test_cluster_matches_serial(run_analysis, workdir):
+    serial, _ = run_analysis('serial')
+    queue = SQLiteQueue(str(workdir / 'result' / 'queue.sqlite'))
+    coordinator = Coordinator(queue, str(workdir / 'result' / 'job'))
+    end_date = datetime.datetime.now().strftime('%Y-%m-%d')
+    assert coordinator.submit({'AAA': 'a', 'BBB': 'b', 'CCC': 'c'}, '2020-01-01', end_date, unit_size=2,
+                              render=False) == 2
+    assert run_worker(queue, data_source=CsvDirectorySource(str(workdir / 'source')), log=lambda message: None) == 2
+    assert coordinator.wait(poll=0) == {'done': 2}
+    path = str(workdir / 'result' / 'cluster.pkl')
+    assert coordinator.assemble(path) == {}
+    pd.testing.assert_frame_equal(pd.read_pickle(path).sort_index(), serial)
+
+
+# lease가 만료된 작업은 다시 대기열로, 늦게 끝난 이전 워커의 완료 기록은 무시, 시도 횟수를 넘으면 failed
+def test_expired_lease_is_requeued(tmp_path):
+    queue = SQLiteQueue(str(tmp_path / 'queue.sqlite'), max_attempts=2)
+    queue.put([{'tickers': {'AAA': 'a'}}])
+    assert queue.claim('dead', lease=-1)['attempt'] == 1
+    assert queue.requeue_expired() == 1
+    unit = queue.claim('alive', lease=-1)
+    assert unit['attempt'] == 2
+    assert not queue.complete(unit['id'], 'dead', {})
+    assert queue.requeue_expired() == 1
+    assert queue.counts() == {'failed': 1}
+    assert queue.claim('late') is None
@@ -0,0 +1,62 @@
+import os
+import pandas as pd
+from data_cache import OHLCVCache
+
+START = '2020-01-01'
+
+
+def expected(frame, start_date, end_date):
+    return frame.loc[(frame.index >= pd.Timestamp(start_date)) & (frame.index < pd.Timestamp(end_date))]
+
+
+def test_incremental_load(tmp_path, frame_source, stock_frames):
+    cache = OHLCVCache(frame_source, str(tmp_path))
+    frame = stock_frames['AAA']
+    middle, end = str(frame.index[400].date()), str(frame.index[-1].date())
+    pd.testing.assert_frame_equal(cache.load('AAA', START, middle), expected(frame, START, middle), check_freq=False)
+
+    # 마지막 OVERLAP_BARS개 캐시 봉부터 이어서 받음
+    pd.testing.assert_frame_equal(cache.load('AAA', START, end), expected(frame, START, end), check_freq=False)
+    cached = expected(frame, START, middle)
+    assert frame_source.requests[-1] == ('AAA', str(cached.index[-cache.overlap_bars].date()), end)
+
+    # 받은 구간 안의 요청은 디스크 캐시만 사용 (새 인스턴스)
+    requests = len(frame_source.requests)
+    reopened = OHLCVCache(frame_source, str(tmp_path))
+    pd.testing.assert_frame_equal(reopened.load('AAA', START, middle), expected(frame, START, middle),
+                                  check_freq=False)
+    assert len(frame_source.requests) == requests
+
+
+# 겹치는 구간의 가격이 바뀌면(분할/배당 수정) 캐시 시작일부터 전체를 다시 받음
+def test_overlap_mismatch_refetches(tmp_path, frame_source, stock_frames):
+    cache = OHLCVCache(frame_source, str(tmp_path))
+    frame = stock_frames['BBB']
+    middle, end = str(frame.index[300].date()), str(frame.index[-1].date())
+    cache.load('BBB', START, middle)
+    adjusted = frame.copy()
+    adjusted[['Open', 'High', 'Low', 'Close', 'Adj Close']] /= 2
+    frame_source.frames['BBB'] = adjusted
+
+    pd.testing.assert_frame_equal(cache.load('BBB', START, end), expected(adjusted, START, end), check_freq=False)
+    assert frame_source.requests[-1] == ('BBB', START, end)
+    reopened = OHLCVCache(frame_source, str(tmp_path))
+    pd.testing.assert_frame_equal(reopened.load('BBB', START, middle), expected(adjusted, START, middle),
+                                  check_freq=False)
+
+
+# 겹치는 구간이 같으면 새 봉만 이어 붙임 (전체 재요청 없음)
+def test_overlap_match_appends(tmp_path, frame_source, stock_frames):
+    cache = OHLCVCache(frame_source, str(tmp_path))
+    frame = stock_frames['CCC']
+    middle, end = str(frame.index[300].date()), str(frame.index[-1].date())
+    cache.load('CCC', START, middle)
+    cache.load('CCC', START, end)
+    assert [request[1] for request in frame_source.requests] == [START, str(frame.index[300 - cache.overlap_bars].date())]
+
+
+# 빈 결과는 캐시하지 않아 다음 요청에서 다시 받음
+def test_empty_fetch_not_cached(tmp_path, frame_source):
+    cache = OHLCVCache(frame_source, str(tmp_path))
+    assert len(cache.load('AAA', '2030-01-01', '2030-02-01')) == 0
+    assert not os.path.exists(cache.cache_path('AAA'))
@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+import pytest
+from intraday import intraday_signals, read_bars
+from stock_analysis import StockAnalyzer
+
+
+@pytest.fixture(scope='module')
+def bars_csv(tmp_path_factory, stock_frames):
+    path = tmp_path_factory.mktemp('intraday') / 'AAA.csv'
+    stock_frames['AAA'][['Open', 'High', 'Low', 'Close', 'Volume']].to_csv(path)
+    return str(path)
+
+
+# 작은 청크로 나누어 집계한 봉 == pandas resample (거래가 없는 구간 제외)
+@pytest.mark.parametrize('freq', ['1D', '5D'])
+def test_chunked_bars_match_resample(bars_csv, stock_frames, freq):
+    data = stock_frames['AAA'].dropna()
+    bars = read_bars(bars_csv, freq, chunk_rows=97)
+    resampled = data.resample(freq, origin='epoch')
+    expected = pd.DataFrame({'Open': resampled['Open'].first(), 'High': resampled['High'].max(),
+                             'Low': resampled['Low'].min(), 'Close': resampled['Close'].last(),
+                             'Volume': resampled['Volume'].sum(), 'Trades': resampled['Close'].count()})
+    expected = expected[expected['Trades'] > 0]
+    expected.index.name = 'Date'
+    typical = (data['High'] + data['Low'] + data['Close']) / 3 * data['Volume']
+    expected['VWAP'] = typical.resample(freq, origin='epoch').sum().reindex(expected.index) / expected['Volume']
+    pd.testing.assert_frame_equal(bars, expected[bars.columns].astype(float), check_freq=False)
+
+
+# 일봉을 1D로 집계한 봉의 시그널 == 일봉 StockAnalyzer 시그널
+def test_intraday_signals_match_daily(bars_csv, stock_frames):
+    analyzer = StockAnalyzer({}, profile=False)
+    data = stock_frames['AAA'].dropna()
+    signals = intraday_signals(read_bars(bars_csv, '1D'), ['macd', 'rsi'])
+    expected = {'macd': analyzer.macd_strategy(analyzer.calculate_macd(data.copy())),
+                'rsi': analyzer.rsi_strategy(data.copy(), 14)}
+    for name, reference in expected.items():
+        for column in ('signal', 'positions'):
+            np.testing.assert_array_equal(signals[name][column].to_numpy(), reference[column].to_numpy(),
+                                          err_msg=f'{name} {column}')
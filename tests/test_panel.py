@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+import panel
+from panel import Panel
+from screener import STRATEGY_SIGNALS
+from stock_analysis import StockAnalyzer
+
+
+@pytest.fixture(scope='module')
+def stock_panel(stock_frames):
+    return Panel.from_frames(stock_frames)
+
+
+def assert_column(stock_panel, values, ticker, expected, name):
+    got = stock_panel.to_frame(values)[ticker].reindex(expected.index)
+    np.testing.assert_allclose(got.to_numpy(), np.asarray(expected, dtype=float), rtol=1e-7, atol=1e-6,
+                               equal_nan=True, err_msg=f'{name} {ticker}')
+
+
+# 패널 커널 지표 == 티커별 StockAnalyzer 지표 (상장일/휴장일이 서로 다른 티커)
+def test_indicators_match_per_ticker(stock_frames, stock_panel):
+    analyzer = StockAnalyzer({}, profile=False)
+    upper_band, lower_band = panel.bollinger_bands(stock_panel, 50)
+    kernels = dict(panel.macd(stock_panel), VWMA=panel.vwma(stock_panel),
+                   **panel.stochastic_oscillator(stock_panel), **panel.ichimoku_cloud(stock_panel),
+                   **panel.adx(stock_panel))
+    for ticker, frame in stock_frames.items():
+        data = frame.copy()
+        assert_column(stock_panel, panel.moving_average(stock_panel, 50), ticker,
+                      analyzer.calculate_moving_average(data, 50), 'ma')
+        upper, lower = analyzer.calculate_bollinger_bands(data, 50)
+        assert_column(stock_panel, upper_band, ticker, upper, 'upper_band')
+        assert_column(stock_panel, lower_band, ticker, lower, 'lower_band')
+        for calculate in (analyzer.calculate_macd, analyzer.calculate_vwma, analyzer.calculate_stochastic_oscillator,
+                          analyzer.calculate_ichimoku_cloud, analyzer.calculate_adx):
+            calculate(data)
+        for name, values in kernels.items():
+            assert_column(stock_panel, values, ticker, data[name], name)
+
+
+# 패널 규칙 평가 시그널 == generate_all_signals 시그널
+def test_signals_match_per_ticker(stock_frames, stock_panel):
+    analyzer = StockAnalyzer({}, profile=False)
+    expected = {ticker: analyzer.generate_all_signals(frame) for ticker, frame in stock_frames.items()}
+    for strategy, signals in STRATEGY_SIGNALS.items():
+        signal, positions = (stock_panel.to_frame(values) for values in signals(stock_panel))
+        for ticker in stock_frames:
+            reference = expected[ticker][strategy]
+            pd.testing.assert_series_equal(signal[ticker].reindex(reference.index), reference['signal'],
+                                           check_names=False, obj=f'{strategy} {ticker} signal')
+            pd.testing.assert_series_equal(positions[ticker].reindex(reference.index), reference['positions'],
+                                           check_names=False, obj=f'{strategy} {ticker} positions')
+
+
+# walk-forward 그리드의 일목균형표 기간도 패널 커널과 StockAnalyzer가 같은 값을 냄
+def test_ichimoku_windows_match_per_ticker(stock_frames, stock_panel):
+    analyzer = StockAnalyzer({}, profile=False)
+    kernels = panel.ichimoku_cloud(stock_panel, 7, 22, 44)
+    for ticker, frame in stock_frames.items():
+        data = frame.copy()
+        analyzer.calculate_ichimoku_cloud(data, 7, 22, 44)
+        for name, values in kernels.items():
+            assert_column(stock_panel, values, ticker, data[name], name)
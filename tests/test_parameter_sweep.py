@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+from benchmark import synthetic_ohlcv
+from ma_rsi_strategy import MovingAverageRSIStrategy
+from parameter_sweep import moving_averages, sweep_ma_rsi
+from stock_analysis import StockAnalyzer
+
+GRID = [(5, 20, 7), (20, 50, 14), (50, 200, 14), (10, 100, 21)]
+
+
+# 거래정지/결측 봉(NaN 행)이 있는 데이터
+@pytest.fixture(scope='module')
+def data():
+    frame = synthetic_ohlcv(1500, seed=4, nan_rate=0.005)
+    assert frame['Close'].isna().sum() >= 3
+    return frame
+
+
+def reference_metrics(analyzer, data, signals):
+    returns = analyzer.calculate_returns(signals, data)
+    equity = (1 + returns['strategy_returns'].fillna(0)).cumprod()
+    return {'total_return': equity.iloc[-1] - 1, 'max_drawdown': (equity / equity.cummax() - 1).min(),
+            'trades': int((signals['positions'] == 1).sum())}
+
+
+def assert_matches(row, expected):
+    assert row['trades'] == expected['trades']
+    np.testing.assert_allclose(row['total_return'], expected['total_return'], rtol=1e-9, atol=1e-12)
+    np.testing.assert_allclose(row['max_drawdown'], expected['max_drawdown'], rtol=1e-9, atol=1e-12)
+
+
+def test_moving_averages_match_pandas(data):
+    close = data['Close']
+    windows = [1, 5, 50, 200]
+    full = moving_averages(close.to_numpy(), windows)
+    partial = moving_averages(close.to_numpy(), windows, full_window=False)
+    for i, window in enumerate(windows):
+        np.testing.assert_allclose(full[i], close.rolling(window).mean(), rtol=1e-10, equal_nan=True)
+        np.testing.assert_allclose(partial[i], close.rolling(window, min_periods=1).mean(), rtol=1e-10, equal_nan=True)
+
+
+# 스윕 결과 == moving_average_cross_strategy + calculate_returns
+def test_ma_cross_matches_strategy(data):
+    analyzer = StockAnalyzer({}, profile=False)
+    result = sweep_ma_rsi(data, [short for short, _, _ in GRID], [long for _, long, _ in GRID])
+    for short, long, _ in GRID:
+        row = result[(result['short_window'] == short) & (result['long_window'] == long)].iloc[0]
+        signals = analyzer.moving_average_cross_strategy(data, short, long)
+        assert_matches(row, reference_metrics(analyzer, data, signals))
+
+
+# 스윕 결과 == MovingAverageRSIStrategy + calculate_returns
+def test_ma_rsi_matches_strategy(data):
+    analyzer = StockAnalyzer({}, profile=False)
+    result = sweep_ma_rsi(data, [short for short, _, _ in GRID], [long for _, long, _ in GRID],
+                          [rsi for _, _, rsi in GRID])
+    for short, long, rsi in GRID:
+        row = result[(result['short_window'] == short) & (result['long_window'] == long) &
+                     (result['rsi_window'] == rsi)].iloc[0]
+        signals = MovingAverageRSIStrategy(data.copy(), short, long, rsi).generate_signals()
+        assert_matches(row, reference_metrics(analyzer, data, signals))
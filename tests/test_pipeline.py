@@ -0,0 +1,10 @@
+import pandas as pd
+import pytest
+
+
+# 파이프라인 실행 결과 == 직렬 실행 결과 (계산 스레드 / 프로세스 풀)
+@pytest.mark.parametrize('workers', [None, 2])
+def test_pipelined_matches_serial(run_analysis, workers):
+    serial, _ = run_analysis('serial')
+    pipelined, _ = run_analysis('pipelined', pipelined=True, workers=workers)
+    pd.testing.assert_frame_equal(pipelined, serial)
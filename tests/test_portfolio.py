@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+from portfolio import simulate
+from panel import Panel
+
+
+@pytest.fixture(scope='module')
+def prices(stock_frames):
+    stock_panel = Panel.from_frames(stock_frames)
+    return stock_panel.dates, stock_panel.fields['Close']
+
+
+def test_monthly_rebalance(prices):
+    dates, close = prices
+    result = simulate(close, np.ones_like(close), dates=dates)
+    assert result['metrics']['rebalances'] == len(np.unique(dates.to_period('M'))) > 1
+
+
+# 날짜 없이 기간 문자열 리밸런싱은 오류, 봉 수 리밸런싱은 날짜 없이도 가능
+def test_period_rebalance_requires_dates(prices):
+    dates, close = prices
+    with pytest.raises(ValueError):
+        simulate(close, np.ones_like(close))
+    result = simulate(close, np.ones_like(close), rebalance=21)
+    assert result['metrics']['rebalances'] == len(range(0, len(dates), 21))
+
+
+# top_n 배분에 top_n을 주지 않으면 전체 동일 비중으로 넘어가지 않고 오류
+def test_top_n_allocation_requires_top_n(prices):
+    dates, close = prices
+    with pytest.raises(ValueError):
+        simulate(close, np.ones_like(close), allocation='top_n', dates=dates)
+    result = simulate(close, np.ones_like(close), allocation='top_n', top_n=1, dates=dates)
+    assert (np.count_nonzero(result['weights'], axis=1) <= 1).all()
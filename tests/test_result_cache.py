@@ -0,0 +1,17 @@
+import pandas as pd
+
+
+def computed_tickers(analyzer):
+    return {record['labels'].get('ticker') for record in analyzer.profiler.records if record['stage'] == 'strategy'}
+
+
+# 결과 캐시 실행 결과 == 직렬 실행 결과, 두 번째 실행은 모든 티커를 캐시에서 읽음 (전략 계산 단계 없음)
+def test_matches_serial_and_reuses_entries(workdir, run_analysis):
+    serial, _ = run_analysis('serial')
+    cache_dir = str(workdir / 'result_cache')
+    cold, cold_analyzer = run_analysis('cold', result_cache_dir=cache_dir)
+    warm, warm_analyzer = run_analysis('warm', result_cache_dir=cache_dir)
+    pd.testing.assert_frame_equal(cold, serial)
+    pd.testing.assert_frame_equal(warm, serial)
+    assert computed_tickers(cold_analyzer) == {'AAA', 'BBB', 'CCC'}
+    assert computed_tickers(warm_analyzer) == set()
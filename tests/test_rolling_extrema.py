@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+import pytest
+from rolling_extrema import rolling_extrema, rolling_max, rolling_min
+
+
+def random_values(shape, seed=0):
+    rng = np.random.default_rng(seed)
+    values = rng.normal(size=shape).cumsum(axis=0)
+    values[rng.random(shape) < 0.03] = np.nan
+    return values
+
+
+@pytest.mark.parametrize('window', [1, 2, 3, 7, 9, 26, 52, 300, 301])
+def test_matches_pandas_1d(window):
+    values = random_values(300)
+    series = pd.Series(values)
+    np.testing.assert_array_equal(rolling_max(values, window), series.rolling(window).max().to_numpy())
+    np.testing.assert_array_equal(rolling_min(values, window), series.rolling(window).min().to_numpy())
+
+
+def test_matches_pandas_panel():
+    values = random_values((250, 5), seed=1)
+    frame = pd.DataFrame(values)
+    windows = [9, 26, 52]
+    result = rolling_extrema(values, windows)
+    for window in windows:
+        np.testing.assert_array_equal(result[('max', window)], frame.rolling(window).max().to_numpy())
+        np.testing.assert_array_equal(result[('min', window)], frame.rolling(window).min().to_numpy())
@@ -0,0 +1,33 @@
+import pandas as pd
+from screener import STRATEGY_SIGNALS, lookback_bars, screen_frames
+from stock_analysis import StockAnalyzer
+
+MAX_AGE = 2
+
+
+# 최근 max_age개 봉의 매수/매도 전환을 전체 이력 시그널에서 직접 구한 값
+def expected_changes(analyzer, stock_frames):
+    changes = set()
+    for ticker, frame in stock_frames.items():
+        for strategy, signals in analyzer.generate_all_signals(frame).items():
+            positions = signals['positions'].iloc[-(MAX_AGE + 1):]
+            for bars_ago, change in enumerate(positions.iloc[::-1]):
+                if change != 0 and not pd.isna(change):
+                    changes.add((ticker, strategy, 'buy' if change > 0 else 'sell', bars_ago))
+    return changes
+
+
+# 전략별 최소 구간(lookback_bars)만으로 스크리닝한 결과 == 전체 이력으로 계산한 결과 (여러 기준일)
+def test_trailing_window_matches_full_history(stock_frames):
+    analyzer = StockAnalyzer({}, profile=False)
+    bars = lookback_bars(list(STRATEGY_SIGNALS), MAX_AGE)
+    dates = stock_frames['AAA'].index
+    seen = 0
+    for cutoff in dates[-40:]:
+        history = {ticker: frame.loc[frame.index <= cutoff] for ticker, frame in stock_frames.items()}
+        table = screen_frames({ticker: frame.tail(bars) for ticker, frame in history.items()}, max_age=MAX_AGE)
+        got = set(zip(table['ticker'], table['strategy'], table['action'], table['bars_ago']))
+        assert got == expected_changes(analyzer, history), cutoff
+        seen += len(got)
+    # 비교가 의미 있도록 전환이 실제로 있었는지 확인
+    assert seen > 0
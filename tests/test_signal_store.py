@@ -0,0 +1,26 @@
+import pandas as pd
+import pytest
+from signal_store import load_signals, save_signals, signals_to_frame
+from stock_analysis import StockAnalyzer
+
+
+@pytest.mark.parametrize('name', ['signals.csv.gz', 'signals.pkl'])
+def test_round_trip(tmp_path, stock_frames, name):
+    analyzer = StockAnalyzer({}, profile=False)
+    frame = stock_frames['AAA'].iloc[:300]
+    stock_data, signals = analyzer.compute_ticker(frame)
+    path = str(tmp_path / name)
+    save_signals(path, {'AAA': signals_to_frame(stock_data, signals)})
+    loaded_data, loaded_signals = load_signals(path)['AAA']
+    pd.testing.assert_frame_equal(loaded_data, stock_data.to_frame(), check_freq=False, check_dtype=False)
+    for strategy, strategy_signals in signals.items():
+        pd.testing.assert_frame_equal(loaded_signals[strategy], strategy_signals, check_freq=False,
+                                      check_dtype=False, check_names=False)
+
+
+# 모든 티커가 실패하면 빈 표를 저장하고 불러올 때도 빈 결과
+@pytest.mark.parametrize('name', ['signals.csv.gz', 'signals.pkl'])
+def test_empty(tmp_path, name):
+    path = str(tmp_path / name)
+    save_signals(path, {})
+    assert load_signals(path) == {}
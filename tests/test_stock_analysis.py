@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+import pytest
+from stock_analysis import StockAnalyzer
+
+
+# 프로세스 풀 실행 결과 == 직렬 실행 결과
+def test_process_pool_matches_serial(run_analysis):
+    serial, _ = run_analysis('serial')
+    parallel, _ = run_analysis('parallel', workers=2)
+    pd.testing.assert_frame_equal(parallel, serial)
+
+
+class NullPdf:
+    def savefig(self, figure):
+        pass
+
+
+# 규칙에 쓴 ADX 기준값을 차트도 그대로 그림
+def test_adx_chart_draws_rule_threshold(stock_frames):
+    pytest.importorskip('matplotlib')
+    from chart_renderer import ChartRenderer
+    analyzer = StockAnalyzer({}, profile=False)
+    data = stock_frames['AAA'].copy()
+    analyzer.calculate_adx(data)
+    signals = analyzer.adx_strategy(data, threshold=30)
+    assert (signals['ADX_threshold'] == 30).all()
+    template = ChartRenderer().template('adx')
+    template.render('AAA', data, {'adx': signals}, NullPdf())
+    drawn = [line for source, column, line in template.lines if column == 'ADX_threshold']
+    assert np.all(drawn[0].get_ydata() == 30)
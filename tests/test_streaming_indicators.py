@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+from ma_rsi_strategy import MovingAverageRSIStrategy
+from stock_analysis import StockAnalyzer
+from streaming_indicators import IchimokuCloud, StreamingIndicatorSet
+
+
+# 봉 단위 갱신 결과를 모은 표
+def stream(indicator, data):
+    rows = [indicator.update(bar) for bar in data[list(indicator.fields)].to_dict('records')]
+    return pd.DataFrame(rows, index=data.index)
+
+
+def batch(data):
+    analyzer = StockAnalyzer({}, profile=False)
+    data = data.copy()
+    expected = pd.DataFrame(index=data.index)
+    expected['short_mavg'] = analyzer.calculate_moving_average(data, 50)
+    expected['long_mavg'] = analyzer.calculate_moving_average(data, 200)
+    expected['SMA'] = analyzer.calculate_moving_average(data, 20)
+    expected['Upper_Band'], expected['Lower_Band'] = analyzer.calculate_bollinger_bands(data, 50)
+    delta = data['Close'].diff()
+    gain = delta.where(delta > 0, 0).rolling(14).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(14).mean()
+    expected['RSI'] = 100 - (100 / (1 + gain / loss))
+    strategy = MovingAverageRSIStrategy(data.copy(), short_window=50, long_window=200, rsi_window=14)
+    strategy.calculate_rsi()
+    expected['rsi'] = strategy.data['rsi']
+    for calculate in (analyzer.calculate_macd, analyzer.calculate_vwma, analyzer.calculate_stochastic_oscillator,
+                      analyzer.calculate_ichimoku_cloud, analyzer.calculate_adx):
+        calculate(data)
+    for column in ('EMA_short', 'EMA_long', 'MACD', 'Signal_line', 'VWMA', 'Lowest_Low', 'Highest_High', '%K', '%D',
+                   'Conversion_Line', 'Base_Line', 'Leading_Span_A', 'Leading_Span_B', 'ADX', 'Plus_DI', 'Minus_DI'):
+        expected[column] = data[column]
+    return expected
+
+
+# 봉 단위 스트리밍 지표 == 전체 구간 배치 지표 (모든 봉)
+def test_streaming_matches_batch(stock_frames):
+    for ticker, frame in stock_frames.items():
+        got = stream(StreamingIndicatorSet(), frame)
+        expected = batch(frame)
+        assert set(got.columns) == set(expected.columns)
+        for column in expected.columns:
+            np.testing.assert_allclose(got[column].to_numpy(dtype=float), expected[column].to_numpy(dtype=float),
+                                       rtol=1e-7, atol=1e-8, equal_nan=True, err_msg=f'{column} {ticker}')
+
+
+# 과거 구간으로 seed한 후 이어서 갱신해도 처음부터 갱신한 값과 같음
+def test_seed_then_update(stock_frames):
+    frame = stock_frames['AAA']
+    indicator = StreamingIndicatorSet()
+    indicator.seed(frame.iloc[:400])
+    resumed = stream(indicator, frame.iloc[400:])
+    full = stream(StreamingIndicatorSet(), frame).iloc[400:]
+    pd.testing.assert_frame_equal(resumed, full)
+
+
+# 기본값이 아닌 일목균형표 기간도 배치 지표와 같음
+def test_ichimoku_windows_match_batch(stock_frames):
+    analyzer = StockAnalyzer({}, profile=False)
+    for ticker, frame in stock_frames.items():
+        indicator = IchimokuCloud(7, 22, 44)
+        got = stream(indicator, frame)
+        data = frame.copy()
+        analyzer.calculate_ichimoku_cloud(data, 7, 22, 44)
+        for column in got.columns:
+            np.testing.assert_allclose(got[column].to_numpy(dtype=float), data[column].to_numpy(dtype=float),
+                                       rtol=1e-7, atol=1e-8, equal_nan=True, err_msg=f'{column} {ticker}')
@@ -0,0 +1,23 @@
+import json
+import ticker_registry
+from ticker_registry import TickerRegistry, build_registry, registry_records
+
+ROWS = [('259960.KS', '크래프톤', '커뮤니케이션서비스'), ('005930.KS', '삼성전자', '정보기술'),
+        ('AMZN', 'Amazon.com Inc.', '경기소비재'), ('000270.KS', '기아자동차', '경기소비재'),
+        ('AAPL', 'Apple Inc.', '정보기술')]
+
+
+# TICKER_RECORDS -> 레지스트리 + Ticker.json -> Ticker.json으로 다시 작성해도 섹터와 순서가 유지됨
+def test_rebuild_from_json_keeps_sector_and_order(tmp_path):
+    registry_path, json_path = str(tmp_path / 'Ticker.reg'), str(tmp_path / 'Ticker.json')
+    build_registry(registry_path, registry_records(ROWS))
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump({ticker: name for ticker, name, _ in ROWS}, f, ensure_ascii=False)
+    assert ticker_registry.main(['--registry', registry_path, 'build', '--json', json_path]) == 0
+
+    registry = TickerRegistry(registry_path)
+    assert list(registry.ticker_dict()) == [ticker for ticker, _, _ in ROWS]
+    assert [record.ticker for record in registry.select(sector='경기소비재')] == ['AMZN', '000270.KS']
+    assert [record.ticker for record in registry.select(market='KOSPI', sector='정보기술')] == ['005930.KS']
+    assert registry.get('AAPL').sector == '정보기술'
+    assert [record.ticker for record in registry.select(name_prefix='삼성')] == ['005930.KS']
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+from panel import Panel
+from stock_analysis import StockAnalyzer
+from universe_store import UniverseStore
+
+SPLIT = pd.Timestamp('2021-06-01')
+
+
+def head(frame):
+    return frame[frame.index < SPLIT]
+
+
+def tail(frame):
+    return frame[frame.index >= SPLIT]
+
+
+# 저장소는 모든 필드가 NaN인 행을 거래일로 보지 않음
+def expected_frames(stock_frames):
+    return {ticker: frame.dropna(how='all') for ticker, frame in stock_frames.items()}
+
+
+# 작은 용량에서 나누어 추가(용량 확장, 중간 날짜 삽입 시 재작성 포함)해도 티커별 프레임과 패널이 원본과 같음
+def test_append_round_trip(tmp_path, stock_frames):
+    store = UniverseStore.create(str(tmp_path / 'universe'), ticker_capacity=2, date_capacity=16)
+    store.append({'AAA': head(stock_frames['AAA']), 'CCC': head(stock_frames['CCC'])})
+    store.append({'BBB': head(stock_frames['BBB'])})
+    store.append({ticker: tail(frame) for ticker, frame in stock_frames.items()})
+    expected = expected_frames(stock_frames)
+
+    reader = UniverseStore(str(tmp_path / 'universe'))
+    assert reader.tickers == ['AAA', 'CCC', 'BBB']
+    for ticker, frame in expected.items():
+        pd.testing.assert_frame_equal(reader.fetch(ticker, '2000-01-01', '2100-01-01'), frame, check_freq=False)
+    got = reader.panel(['AAA', 'BBB', 'CCC'])
+    reference = Panel.from_frames(expected)
+    assert got.dates.equals(reference.dates)
+    np.testing.assert_array_equal(got.present, reference.present)
+    for field, values in reference.fields.items():
+        np.testing.assert_array_equal(got.fields[field], values)
+    with pytest.raises(PermissionError):
+        reader.append(stock_frames)
+
+
+# update는 티커별 마지막 저장일 다음 날부터 받아서 추가
+def test_update_from_last_stored_day(tmp_path, frame_source, stock_frames):
+    store = UniverseStore.from_frames(str(tmp_path / 'universe'), {ticker: head(frame) for ticker, frame in
+                                                                    stock_frames.items()})
+    analyzer = StockAnalyzer({}, data_source=frame_source, profile=False)
+    store.update(analyzer, end_date='2023-01-01')
+    for ticker, frame in stock_frames.items():
+        last = head(frame).index[-1]
+        assert (ticker, str((last + pd.Timedelta(days=1)).date()), '2023-01-01') in frame_source.requests
+    for ticker, frame in expected_frames(stock_frames).items():
+        pd.testing.assert_frame_equal(store.fetch(ticker, '2000-01-01', '2100-01-01'), frame, check_freq=False)
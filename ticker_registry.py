@@ -0,0 +1,267 @@
+import argparse
+import datetime
+import json
+import os
+import sys
+from collections import namedtuple
+import numpy as np
+
+REGISTRY_PATH = 'Ticker.reg'
+MAGIC = b'STKREG01'
+NAME_KEY_BYTES = 64
+# 종목 코드 접미사 -> (시장, 통화)
+SUFFIX_MARKETS = {'.KS': ('KOSPI', 'KRW'), '.KQ': ('KOSDAQ', 'KRW')}
+DEFAULT_MARKET = ('NASDAQ', 'USD')
+
+TickerRecord = namedtuple('TickerRecord', ['ticker', 'name', 'market', 'sector', 'currency', 'listed', 'active'])
+TickerRecord.__new__.__defaults__ = ('', None, '', None, True)
+
+RECORD_DTYPE = np.dtype([('ticker', 'S16'), ('name_offset', '<u4'), ('name_length', '<u2'), ('market', '<u2'),
+                         ('sector', '<u2'), ('currency', '<u2'), ('listed', '<i4'), ('active', 'u1')])
+EPOCH = datetime.date(1970, 1, 1)
+
+
+class DuplicateTickerError(ValueError):
+    pass
+
+
+def market_of(ticker):
+    for suffix, market in SUFFIX_MARKETS.items():
+        if ticker.endswith(suffix):
+            return market
+    return DEFAULT_MARKET
+
+
+def name_key(name):
+    return name.casefold().encode('utf-8')[:NAME_KEY_BYTES]
+
+
+# ---- 파일 형식 ----
+# MAGIC(8) + 헤더 길이(u4) + 헤더 JSON + 섹션들 (8바이트 정렬)
+# 헤더: 시장/섹터/통화 이름 목록, 섹션별 (offset, dtype, shape)
+# 섹션:
+#   records       티커 순으로 정렬된 고정 길이 레코드 (티커 조회는 searchsorted)
+#   names         회사명 UTF-8 연결 문자열 (레코드의 name_offset/name_length)
+#   name_keys     소문자 회사명 앞 64바이트, 정렬 (이름 접두사 조회는 searchsorted 구간)
+#   name_order    name_keys 순서의 레코드 번호
+#   <field>_offsets, <field>_ids   시장/섹터별 레코드 번호 목록 (CSR 형식 역색인)
+#   source_rank   레코드별 입력 순서 (조회 결과를 Ticker.json 순서로 돌려줌)
+# 열 때는 헤더만 읽고, 섹션은 메모리 맵으로 조회에 필요한 부분만 읽음
+
+# 레코드 목록으로 레지스트리 파일 작성 - 같은 티커가 두 번 나오면 DuplicateTickerError
+def build_registry(path, records):
+    records = [TickerRecord(*record) for record in records]
+    seen = {}
+    duplicates = []
+    for record in records:
+        if record.ticker in seen:
+            duplicates.append(f'{record.ticker} ({seen[record.ticker]} / {record.name})')
+        seen[record.ticker] = record.name
+    if duplicates:
+        raise DuplicateTickerError('중복 티커: ' + ', '.join(duplicates))
+    for record in records:
+        if len(record.ticker.encode('utf-8')) > RECORD_DTYPE['ticker'].itemsize:
+            raise ValueError(f'티커가 너무 깁니다: {record.ticker}')
+
+    source_rank = sorted(range(len(records)), key=lambda i: records[i].ticker.encode('utf-8'))
+    records = [records[i] for i in source_rank]
+    vocab = {field: sorted({getattr(record, field) for record in records}) for field in ('market', 'sector', 'currency')}
+    codes = {field: {value: i for i, value in enumerate(values)} for field, values in vocab.items()}
+
+    table = np.zeros(len(records), dtype=RECORD_DTYPE)
+    names = bytearray()
+    for i, record in enumerate(records):
+        encoded = record.name.encode('utf-8')
+        listed = (to_date(record.listed) - EPOCH).days if record.listed else -1
+        table[i] = (record.ticker.encode('utf-8'), len(names), len(encoded), codes['market'][record.market],
+                    codes['sector'][record.sector], codes['currency'][record.currency], listed, bool(record.active))
+        names += encoded
+
+    keys = np.array([name_key(record.name) for record in records], dtype=f'S{NAME_KEY_BYTES}')
+    name_order = np.argsort(keys, kind='stable').astype('<u4')
+    sections = {'records': table, 'names': np.frombuffer(bytes(names), dtype='u1'),
+                'name_keys': keys[name_order], 'name_order': name_order}
+    for field in ('market', 'sector'):
+        ids = np.argsort(table[field], kind='stable').astype('<u4')
+        counts = np.bincount(table[field], minlength=len(vocab[field]))
+        sections[f'{field}_offsets'] = np.concatenate([[0], np.cumsum(counts)]).astype('<u4')
+        sections[f'{field}_ids'] = ids
+    sections['source_rank'] = np.array(source_rank, dtype='<u4')
+
+    header = {'count': len(records), 'vocab': vocab, 'sections': {}}
+    # 헤더 길이가 섹션 offset에 따라 바뀌므로 offset이 고정될 때까지 반복
+    base = 0
+    while True:
+        offset = base
+        for name, array in sections.items():
+            header['sections'][name] = {'offset': offset, 'dtype': array.dtype.descr if array.dtype.names else
+                                        array.dtype.str, 'shape': list(array.shape)}
+            offset = align(offset + array.nbytes)
+        encoded_header = json.dumps(header, ensure_ascii=False).encode('utf-8')
+        start = align(len(MAGIC) + 4 + len(encoded_header))
+        if start == base:
+            break
+        base = start
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC + len(encoded_header).to_bytes(4, 'little') + encoded_header)
+        for name, array in sections.items():
+            f.write(b'\0' * (header['sections'][name]['offset'] - f.tell()))
+            f.write(array.tobytes())
+    os.replace(tmp_path, path)
+    return len(records)
+
+
+def align(offset, size=8):
+    return (offset + size - 1) // size * size
+
+
+def to_date(value):
+    if isinstance(value, datetime.date):
+        return value if not isinstance(value, datetime.datetime) else value.date()
+    return datetime.date.fromisoformat(str(value)[:10])
+
+
+# 메모리 맵 기반 티커 레지스트리 - 시장/섹터/이름 접두사 조회는 색인 조회 + 해당 레코드만 디코딩
+class TickerRegistry:
+    def __init__(self, path=REGISTRY_PATH):
+        self.path = path
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f'{path}: 티커 레지스트리 파일이 아닙니다')
+            header_length = int.from_bytes(f.read(4), 'little')
+            self.header = json.loads(f.read(header_length).decode('utf-8'))
+        self.vocab = self.header['vocab']
+        self.sections = {}
+
+    def section(self, name):
+        if name not in self.sections:
+            spec = self.header['sections'][name]
+            dtype = np.dtype([tuple(field) for field in spec['dtype']] if isinstance(spec['dtype'], list) else spec['dtype'])
+            if spec['shape'][0] == 0:
+                self.sections[name] = np.zeros(spec['shape'], dtype=dtype)
+            else:
+                self.sections[name] = np.memmap(self.path, dtype=dtype, mode='r', offset=spec['offset'],
+                                                shape=tuple(spec['shape']))
+        return self.sections[name]
+
+    def __len__(self):
+        return self.header['count']
+
+    @property
+    def markets(self):
+        return list(self.vocab['market'])
+
+    @property
+    def sectors(self):
+        return list(self.vocab['sector'])
+
+    def index_of(self, ticker):
+        tickers = self.section('records')['ticker']
+        encoded = ticker.encode('utf-8')
+        i = int(np.searchsorted(tickers, encoded))
+        return i if i < len(tickers) and tickers[i] == encoded else None
+
+    def __contains__(self, ticker):
+        return self.index_of(ticker) is not None
+
+    def get(self, ticker):
+        i = self.index_of(ticker)
+        return self.record(i) if i is not None else None
+
+    def record(self, i):
+        row = self.section('records')[i]
+        names = self.section('names')
+        name = bytes(names[row['name_offset']:row['name_offset'] + row['name_length']]).decode('utf-8')
+        listed = EPOCH + datetime.timedelta(days=int(row['listed'])) if row['listed'] >= 0 else None
+        return TickerRecord(row['ticker'].decode('utf-8'), name, self.vocab['market'][row['market']],
+                            self.vocab['sector'][row['sector']], self.vocab['currency'][row['currency']], listed,
+                            bool(row['active']))
+
+    # 시장/섹터 역색인에서 해당 값의 레코드 번호 목록
+    def posting(self, field, values):
+        ids = []
+        offsets, postings = self.section(f'{field}_offsets'), self.section(f'{field}_ids')
+        for value in ([values] if isinstance(values, str) else values):
+            if value in self.vocab[field]:
+                code = self.vocab[field].index(value)
+                ids.append(postings[offsets[code]:offsets[code + 1]])
+        return np.unique(np.concatenate(ids)) if ids else np.zeros(0, dtype='<u4')
+
+    def prefix_ids(self, prefix):
+        keys = self.section('name_keys')
+        key = name_key(prefix)
+        lo = np.searchsorted(keys, key, side='left')
+        hi = np.searchsorted(keys, key + b'\xff' * (NAME_KEY_BYTES - len(key)), side='right') if key else len(keys)
+        return np.sort(self.section('name_order')[lo:hi])
+
+    # 조건을 모두 만족하는 레코드 (입력 순) - market/sector는 값 하나 또는 목록
+    def select(self, market=None, sector=None, name_prefix=None, active=True):
+        ids = None
+        for candidates in ([self.posting('market', market)] if market is not None else []) + \
+                          ([self.posting('sector', sector)] if sector is not None else []) + \
+                          ([self.prefix_ids(name_prefix)] if name_prefix is not None else []):
+            ids = candidates if ids is None else np.intersect1d(ids, candidates, assume_unique=True)
+        if ids is None:
+            ids = np.arange(len(self))
+        if active is not None and len(ids):
+            ids = ids[self.section('records')['active'][ids] == bool(active)]
+        # source_rank가 없는 이전 파일은 티커 순
+        if 'source_rank' in self.header['sections'] and len(ids):
+            ids = ids[np.argsort(self.section('source_rank')[ids], kind='stable')]
+        return [self.record(i) for i in ids]
+
+    # StockAnalyzer 입력 (ticker -> 회사명)
+    def ticker_dict(self, **conditions):
+        return {record.ticker: record.name for record in self.select(**conditions)}
+
+
+# (티커, 회사명[, 섹터]) 목록 -> 레코드 (시장/통화는 티커 접미사로 추정)
+def registry_records(rows):
+    records = []
+    for row in rows:
+        ticker, name = row[:2]
+        market, currency = market_of(ticker)
+        records.append(TickerRecord(ticker, name, market, row[2] if len(row) > 2 else '', currency))
+    return records
+
+
+# Ticker.json(ticker -> 회사명)에서 레코드 생성 (Ticker.json 순서 유지)
+# Ticker.json에는 섹터가 없으므로 known(기존 레지스트리 레코드)에 있는 티커는 섹터 등 나머지 필드를 그대로 가져옴
+def records_from_json(path, known=()):
+    with open(path, 'r', encoding='utf-8') as f:
+        tickers = json.load(f)
+    known = {record.ticker: record for record in known}
+    records = []
+    for record in registry_records(tickers.items()):
+        previous = known.get(record.ticker)
+        records.append(previous._replace(name=record.name) if previous is not None else record)
+    return records
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='티커 레지스트리 작성/조회')
+    parser.add_argument('--registry', default=REGISTRY_PATH)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    build = subparsers.add_parser('build', help='Ticker.json으로 레지스트리 작성')
+    build.add_argument('--json', default='./Ticker.json')
+    query = subparsers.add_parser('select', help='조건에 맞는 티커 출력')
+    query.add_argument('--market', nargs='+')
+    query.add_argument('--sector', nargs='+')
+    query.add_argument('--name-prefix')
+    query.add_argument('--all', action='store_true', help='비활성 종목 포함')
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        known = TickerRegistry(args.registry).select(active=None) if os.path.exists(args.registry) else ()
+        print(f'{build_registry(args.registry, records_from_json(args.json, known))}개 티커 -> {args.registry}')
+        return 0
+    registry = TickerRegistry(args.registry)
+    for record in registry.select(args.market, args.sector, args.name_prefix, None if args.all else True):
+        print('\t'.join(str(value if value is not None else '') for value in record))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
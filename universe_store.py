@@ -0,0 +1,266 @@
+import os
+import json
+import datetime
+import numpy as np
+import pandas as pd
+from panel import Panel
+
+UNIVERSE_FIELDS = ['Open', 'High', 'Low', 'Close', 'Adj Close', 'Volume']
+META_FILE = 'meta.json'
+DATES_FILE = 'dates.i8'
+
+
+def field_file(field):
+    return field.replace(' ', '_') + '.f8'
+
+
+# 전체 유니버스 OHLCV를 필드별 메모리 맵 배열(티커 x 날짜, float64)로 저장하는 디스크 저장소
+# - dates.i8: 공통 날짜 인덱스 (int64 ns), <필드>.f8: 티커 행 x 날짜 열 (티커 한 행이 연속된 메모리)
+# - meta.json: 티커 순서(행 번호 = 오프셋 테이블), 티커별 첫/마지막 거래일 위치, 저장된 날짜 수, 배열 용량
+# 배열은 여유 용량을 두고 만들어 새 거래일/티커를 파일 재작성 없이 제자리에 추가
+# 읽기 프로세스들은 같은 파일을 mode='r'로 매핑하여 OS 페이지 캐시 하나를 공유 (쓰기는 한 프로세스만)
+class UniverseStore:
+    name = 'universe'
+
+    def __init__(self, directory, mode='r'):
+        self.directory = directory
+        self.mode = mode
+        self.refresh()
+
+    # 다른 프로세스가 추가한 날짜/티커를 반영하여 다시 매핑
+    def refresh(self):
+        with open(os.path.join(self.directory, META_FILE)) as f:
+            self.meta = json.load(f)
+        shape = (self.meta['ticker_capacity'], self.meta['date_capacity'])
+        self.date_values = np.memmap(os.path.join(self.directory, DATES_FILE), dtype=np.int64, mode=self.mode,
+                                     shape=(shape[1],))
+        self.arrays = {field: np.memmap(os.path.join(self.directory, field_file(field)), dtype=np.float64,
+                                        mode=self.mode, shape=shape)
+                       for field in self.meta['fields']}
+        self.rows = {ticker: row for row, ticker in enumerate(self.meta['tickers'])}
+
+    # 메모리 맵 해제 - Windows에서는 매핑된 파일을 os.replace로 교체할 수 없음
+    def close(self):
+        for array in self.arrays.values():
+            if self.mode != 'r':
+                array.flush()
+        self.arrays = {}
+        self.date_values = None
+
+    @classmethod
+    def create(cls, directory, fields=UNIVERSE_FIELDS, ticker_capacity=256, date_capacity=4096):
+        os.makedirs(directory, exist_ok=True)
+        allocate_files(directory, fields, ticker_capacity, date_capacity)
+        write_meta(directory, {'fields': list(fields), 'tickers': [], 'ranges': [], 'n_dates': 0,
+                               'ticker_capacity': ticker_capacity, 'date_capacity': date_capacity})
+        return cls(directory, mode='r+')
+
+    # fields를 지정하지 않으면 첫 프레임의 컬럼을 사용
+    @classmethod
+    def from_frames(cls, directory, stock_frames, fields=None):
+        fields = fields or [str(column) for column in next(iter(stock_frames.values())).columns]
+        dates = union_dates(stock_frames.values())
+        store = cls.create(directory, fields, ticker_capacity=max(len(stock_frames) * 2, 16),
+                           date_capacity=max(len(dates) * 2, 1024))
+        store.append(stock_frames)
+        return store
+
+    @property
+    def tickers(self):
+        return self.meta['tickers']
+
+    @property
+    def fields(self):
+        return self.meta['fields']
+
+    # 공통 날짜 인덱스 (복사 없는 datetime64 뷰)
+    @property
+    def dates(self):
+        return pd.DatetimeIndex(self.date_values[:self.meta['n_dates']].view('datetime64[ns]'), name='Date')
+
+    # start 이상 end 미만 날짜의 열 범위
+    def date_slice(self, start=None, end=None):
+        values = self.date_values[:self.meta['n_dates']]
+        lo = 0 if start is None else np.searchsorted(values, pd.Timestamp(start).value, side='left')
+        hi = len(values) if end is None else np.searchsorted(values, pd.Timestamp(end).value, side='left')
+        return slice(lo, hi)
+
+    # 티커의 상장 구간(첫 거래일 ~ 마지막 거래일)과 요청 구간의 교집합
+    def ticker_slice(self, ticker, start=None, end=None):
+        first, last = self.meta['ranges'][self.rows[ticker]]
+        dates = self.date_slice(start, end)
+        lo = max(first, dates.start)
+        return slice(lo, max(min(last + 1, dates.stop), lo))
+
+    # 티커 하나, 필드 하나의 복사 없는 1차원 뷰
+    def values(self, ticker, field, start=None, end=None):
+        return self.arrays[field][self.rows[ticker], self.ticker_slice(ticker, start, end)]
+
+    # 필드 하나의 (티커 x 날짜) 복사 없는 2차원 뷰
+    def field(self, field, start=None, end=None):
+        return self.arrays[field][:len(self.tickers), self.date_slice(start, end)]
+
+    # 데이터 소스 인터페이스 (StockAnalyzer(data_source=store)) - pandas 프레임은 복사본
+    def fetch(self, ticker, start_date, end_date):
+        if ticker not in self.rows:
+            return pd.DataFrame(columns=self.fields)
+        columns = self.ticker_slice(ticker, start_date, end_date)
+        data = pd.DataFrame({field: self.arrays[field][self.rows[ticker], columns] for field in self.fields},
+                            index=self.dates[columns])
+        # 휴장/거래정지로 값이 없는 날짜는 제외 (티커별로 받은 프레임과 같은 행)
+        return data[~np.isnan(data.to_numpy()).all(axis=1)]
+
+    def frames(self, tickers=None, start_date=None, end_date=None):
+        return {ticker: self.fetch(ticker, start_date, end_date) for ticker in (tickers or self.tickers)}
+
+    # 스크리너/패널 지표 입력 (날짜 x 티커)
+    def panel(self, tickers=None, start_date=None, end_date=None, fields=None):
+        # 전체 티커이면 복사 없는 뷰, 일부 티커이면 해당 행만 복사
+        rows = slice(0, len(self.tickers)) if tickers is None else [self.rows[ticker] for ticker in tickers]
+        tickers = list(tickers or self.tickers)
+        columns = self.date_slice(start_date, end_date)
+        arrays = {field: self.arrays[field][rows, columns].T for field in (fields or self.fields)}
+        # fetch와 같이 모든 필드가 NaN인 날짜는 거래일이 아님
+        present = ~np.logical_and.reduce([np.isnan(self.arrays[field][rows, columns].T) for field in self.fields])
+        return Panel(self.dates[columns], tickers, arrays, present)
+
+    # ---- 쓰기 ----
+
+    # 새 거래일/티커를 제자리에 추가 (기존 날짜와 겹치는 값은 덮어씀)
+    # 기존 날짜 사이에 없던 날짜가 들어오면 전체 배열을 다시 만듦
+    def append(self, stock_frames):
+        if self.mode == 'r':
+            raise PermissionError(f'{self.directory}: read-only store')
+        stock_frames = {ticker: frame for ticker, frame in stock_frames.items() if len(frame)}
+        if not stock_frames:
+            return
+        meta = self.meta
+        old_dates = self.date_values[:meta['n_dates']]
+        incoming = union_dates(stock_frames.values()).values.astype('datetime64[ns]').astype(np.int64)
+        last = old_dates[-1] if len(old_dates) else np.iinfo(np.int64).min
+        inside = incoming[incoming <= last]
+        if len(np.setdiff1d(inside, old_dates)):
+            self.rebuild(stock_frames)
+            return
+        new_dates = incoming[incoming > last]
+        new_tickers = [ticker for ticker in stock_frames if ticker not in self.rows]
+        self.reserve(len(self.tickers) + len(new_tickers), meta['n_dates'] + len(new_dates))
+        meta = self.meta
+
+        n_dates = meta['n_dates'] + len(new_dates)
+        self.date_values[meta['n_dates']:n_dates] = new_dates
+        all_dates = self.date_values[:n_dates]
+        # 새로 쓰는 영역만 NaN으로 초기화 (파일 전체를 채우지 않음)
+        if new_dates.size:
+            for array in self.arrays.values():
+                array[:len(meta['tickers']), meta['n_dates']:n_dates] = np.nan
+        for ticker in new_tickers:
+            row = len(meta['tickers'])
+            meta['tickers'].append(ticker)
+            meta['ranges'].append([n_dates, -1])
+            self.rows[ticker] = row
+            for array in self.arrays.values():
+                array[row, :] = np.nan
+
+        for ticker, frame in stock_frames.items():
+            row = self.rows[ticker]
+            columns = np.searchsorted(all_dates, frame.index.values.astype('datetime64[ns]').astype(np.int64))
+            for field in self.fields:
+                self.arrays[field][row, columns] = frame[field].to_numpy(dtype=float) if field in frame else np.nan
+            first, last_column = meta['ranges'][row]
+            meta['ranges'][row] = [int(min(first, columns[0])), int(max(last_column, columns[-1]))]
+
+        for array in list(self.arrays.values()) + [self.date_values]:
+            array.flush()
+        # 데이터를 모두 쓴 뒤에 날짜 수를 갱신 - 읽는 쪽은 완성된 날짜만 봄
+        meta['n_dates'] = n_dates
+        write_meta(self.directory, meta)
+
+    # 용량이 부족하면 두 배로 늘린 파일을 새로 만들어 교체
+    def reserve(self, n_tickers, n_dates):
+        meta = self.meta
+        if n_tickers <= meta['ticker_capacity'] and n_dates <= meta['date_capacity']:
+            return
+        ticker_capacity = meta['ticker_capacity']
+        if n_tickers > ticker_capacity:
+            ticker_capacity = max(n_tickers, ticker_capacity * 2)
+        date_capacity = meta['date_capacity']
+        if n_dates > date_capacity:
+            date_capacity = max(n_dates, date_capacity * 2)
+        old_shape = (meta['ticker_capacity'], meta['date_capacity'])
+        allocate_files(self.directory, self.fields, ticker_capacity, date_capacity, suffix='.tmp')
+        dates = np.memmap(os.path.join(self.directory, DATES_FILE + '.tmp'), dtype=np.int64, mode='r+',
+                          shape=(date_capacity,))
+        dates[:old_shape[1]] = self.date_values
+        dates.flush()
+        for field in self.fields:
+            array = np.memmap(os.path.join(self.directory, field_file(field) + '.tmp'), dtype=np.float64, mode='r+',
+                              shape=(ticker_capacity, date_capacity))
+            array[:old_shape[0], :old_shape[1]] = self.arrays[field]
+            array.flush()
+            del array
+        del dates
+        fields = self.fields
+        self.close()
+        for name in [DATES_FILE] + [field_file(field) for field in fields]:
+            os.replace(os.path.join(self.directory, name + '.tmp'), os.path.join(self.directory, name))
+        write_meta(self.directory, dict(meta, ticker_capacity=ticker_capacity, date_capacity=date_capacity))
+        self.refresh()
+
+    # 기존 데이터 + 새 프레임으로 저장소 전체를 다시 작성
+    def rebuild(self, stock_frames):
+        frames = self.frames()
+        for ticker, frame in stock_frames.items():
+            # append와 같이 없는 필드는 NaN
+            frame = frame.reindex(columns=self.fields)
+            if ticker in frames:
+                merged = pd.concat([frames[ticker], frame])
+                frames[ticker] = merged[~merged.index.duplicated(keep='last')].sort_index()
+            else:
+                frames[ticker] = frame
+        tmp_dir = self.directory.rstrip(os.sep) + '.rebuild'
+        UniverseStore.from_frames(tmp_dir, frames, self.fields).close()
+        self.close()
+        for name in os.listdir(tmp_dir):
+            if name != META_FILE:
+                os.replace(os.path.join(tmp_dir, name), os.path.join(self.directory, name))
+        os.replace(os.path.join(tmp_dir, META_FILE), os.path.join(self.directory, META_FILE))
+        os.rmdir(tmp_dir)
+        self.refresh()
+
+    # 티커별 마지막 저장일 다음 날부터 end_date 전날까지 내려받아 추가 (새 티커/저장된 값이 없는 티커는 start_date부터)
+    # 저장소 전체의 마지막 날짜가 아니라 티커별 마지막 날짜를 쓰므로 이전 실행에서 다운로드에 실패한 구간도 다시 받음
+    def update(self, analyzer, tickers=None, start_date='2020-01-01', end_date=None):
+        tickers = list(tickers or self.tickers)
+        end_date = end_date or datetime.datetime.now().strftime('%Y-%m-%d')
+        dates = self.dates
+        starts = {}
+        for ticker in tickers:
+            last = self.meta['ranges'][self.rows[ticker]][1] if ticker in self.rows else -1
+            fetch_start = str((dates[last] + pd.Timedelta(days=1)).date()) if last >= 0 else start_date
+            starts.setdefault(fetch_start, []).append(ticker)
+        # 시작일이 같은 티커끼리 묶어서 받음
+        stock_frames = {}
+        for fetch_start, group in starts.items():
+            stock_frames.update(analyzer.download_many(group, fetch_start, end_date))
+        self.append(stock_frames)
+        return stock_frames
+
+
+def union_dates(frames):
+    return pd.DatetimeIndex(sorted(set().union(*[frame.index for frame in frames])))
+
+
+def allocate_files(directory, fields, ticker_capacity, date_capacity, suffix=''):
+    np.memmap(os.path.join(directory, DATES_FILE + suffix), dtype=np.int64, mode='w+', shape=(date_capacity,)).flush()
+    for field in fields:
+        np.memmap(os.path.join(directory, field_file(field) + suffix), dtype=np.float64, mode='w+',
+                  shape=(ticker_capacity, date_capacity)).flush()
+
+
+# 중간에 중단되어도 메타 파일이 깨지지 않도록 임시 파일에 쓴 후 교체
+def write_meta(directory, meta):
+    tmp_path = os.path.join(directory, META_FILE + '.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, os.path.join(directory, META_FILE))
@@ -0,0 +1,174 @@
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+import pandas as pd
+from backtest import backtest_matrix
+from indicator_engine import IndicatorEngine
+from indicator_store import IndicatorStore
+from ma_rsi_strategy import MovingAverageRSIStrategy
+from bb_strategy import BollingerBandsStrategy
+from result_cache import result_key
+from stock_analysis import StockAnalyzer
+
+WALK_FORWARD_DIR = 'result/walk_forward'
+TRAIN_BARS = 504
+TEST_BARS = 126
+
+# 전략별 파라미터 그리드 (가운데 값이 analyze_stocks의 고정값)
+STRATEGY_GRIDS = {
+    'ma': {'short_window': [20, 50, 100], 'long_window': [100, 150, 200, 250]},
+    'rsi': {'window': [7, 14, 21]},
+    'ma_rsi': {'short_window': [20, 50, 100], 'long_window': [100, 200], 'rsi_window': [7, 14, 21]},
+    'macd': {'short_window': [8, 12, 16], 'long_window': [21, 26, 34], 'signal_window': [7, 9, 12]},
+    'stochastic': {'window': [9, 14, 21], 'smooth_window': [3, 5]},
+    'vwma': {'window': [10, 20, 40]},
+    'ichimoku': {'conversion_window': [7, 9, 12], 'base_window': [22, 26, 30], 'span_b_window': [44, 52, 60]},
+    'adx': {'window': [7, 14, 21], 'threshold': [20, 25, 30]},
+    'bollinger': {'window': [10, 20, 40], 'num_std': [1.5, 2, 2.5]},
+}
+
+# 파라미터 조합 하나의 전략 시그널 - StockAnalyzer / 전략 클래스의 계산 메서드를 그대로 사용
+STRATEGY_SIGNALS = {
+    'ma': lambda a, data, engine, p: a.moving_average_cross_strategy(data, p['short_window'], p['long_window'], engine),
+    'rsi': lambda a, data, engine, p: a.rsi_strategy(data, p['window'], engine),
+    'ma_rsi': lambda a, data, engine, p: MovingAverageRSIStrategy(data, engine=engine, **p).generate_signals(),
+    'macd': lambda a, data, engine, p: a.macd_strategy(a.calculate_macd(data, engine=engine, **p)),
+    'stochastic': lambda a, data, engine, p: a.stochastic_oscillator_strategy(
+        a.calculate_stochastic_oscillator(data, engine=engine, **p)),
+    'vwma': lambda a, data, engine, p: a.vwma_strategy(a.calculate_vwma(data, engine=engine, **p), engine),
+    'ichimoku': lambda a, data, engine, p: a.ichimoku_strategy(a.calculate_ichimoku_cloud(data, engine=engine, **p)),
+    'adx': lambda a, data, engine, p: a.adx_strategy(a.calculate_adx(data, p['window'], engine), p['threshold']),
+    'bollinger': lambda a, data, engine, p: BollingerBandsStrategy(data, engine=engine, **p).generate_signals(),
+}
+
+
+# 그리드의 모든 조합 (단기 창이 장기 창보다 짧은 조합만) - 순서가 고정되어 있어 동점이면 항상 앞 조합을 선택
+def expand_grid(grid):
+    names = list(grid)
+    combos = [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+    return [p for p in combos if p.get('short_window', 0) < p.get('long_window', float('inf'))]
+
+
+# 롤링 train/test 구간 (행 번호 slice) - step을 생략하면 test 길이만큼 이동, anchored=True이면 train 시작 고정
+def walk_forward_folds(n_bars, train_bars=TRAIN_BARS, test_bars=TEST_BARS, step=None, anchored=False):
+    step = step or test_bars
+    folds = []
+    start = 0
+    while start + train_bars + test_bars <= n_bars:
+        train_start = 0 if anchored else start
+        folds.append((slice(train_start, start + train_bars), slice(start + train_bars, start + train_bars + test_bars)))
+        start += step
+    return folds
+
+
+# 조합 x 시간 시그널 행렬 - 지표는 전체 이력으로 한 번 계산하므로(과거 데이터만 사용)
+# test 구간의 시그널은 train 구간 데이터를 지표 warm-up으로 사용한 값과 같음
+def signal_matrix(strategy, stock_data, combos):
+    analyzer = StockAnalyzer({}, profile=False)
+    data = IndicatorStore(stock_data)
+    engine = IndicatorEngine(data)
+    return np.column_stack([np.asarray(STRATEGY_SIGNALS[strategy](analyzer, data, engine, p)['signal'], dtype=float)
+                            for p in combos])
+
+
+# 구간 하나에서 모든 조합의 성과 지표 (backtest_matrix를 조합 열에 대해 한 번에)
+def score_window(close, signal, window, commission=0.0, slippage=0.0):
+    prices = np.repeat(close[window, None], signal.shape[1], axis=1)
+    return backtest_matrix(prices, signal[window], commission=commission, slippage=slippage)['metrics']
+
+
+# 티커 하나, 전략 하나의 모든 fold - train 구간 metric 최댓값 조합을 골라 다음 test 구간에서 평가
+def run_task(ticker, strategy, stock_data, grid, train_bars=TRAIN_BARS, test_bars=TEST_BARS, step=None,
+             anchored=False, metric='sharpe', commission=0.0, slippage=0.0):
+    combos = expand_grid(grid)
+    folds = walk_forward_folds(len(stock_data), train_bars, test_bars, step, anchored)
+    if not folds or not combos:
+        return []
+    close = stock_data['Close'].to_numpy(dtype=float)
+    signal = signal_matrix(strategy, stock_data, combos)
+    dates = stock_data.index
+    rows = []
+    for fold, (train, test) in enumerate(folds):
+        train_metrics = score_window(close, signal, train, commission, slippage)
+        scores = np.nan_to_num(train_metrics[metric], nan=-np.inf)
+        best = int(np.argmax(scores))
+        test_metrics = score_window(close, signal[:, [best]], test, commission, slippage)
+        row = {'ticker': ticker, 'strategy': strategy, 'fold': fold,
+               'train_start': str(dates[train.start].date()), 'train_end': str(dates[train.stop - 1].date()),
+               'test_start': str(dates[test.start].date()), 'test_end': str(dates[test.stop - 1].date()),
+               'params': combos[best], f'train_{metric}': float(train_metrics[metric][best])}
+        row.update({f'test_{name}': float(values[0]) for name, values in test_metrics.items()})
+        rows.append(row)
+    return rows
+
+
+# 결과 파일에 원자적으로 기록 - 중단되어도 완성된 파일만 남음
+def run_task_to_file(path, *args, **kwargs):
+    rows = run_task(*args, **kwargs)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(rows, f)
+    os.replace(tmp_path, path)
+    return rows
+
+
+# 전체 티커 x 전략의 walk-forward 최적화
+# (티커, 전략)마다 결과를 out_dir/<키>.json으로 저장 - 키는 데이터/설정/코드 해시이므로
+# 중단 후 같은 설정으로 다시 실행하면 완료된 작업은 파일에서 읽고 나머지만 계산 (결과는 실행 순서와 무관)
+def walk_forward(stock_frames, strategies=None, grids=None, train_bars=TRAIN_BARS, test_bars=TEST_BARS, step=None,
+                 anchored=False, metric='sharpe', commission=0.0, slippage=0.0, workers=None,
+                 out_dir=WALK_FORWARD_DIR, log=print):
+    strategies = list(strategies or STRATEGY_GRIDS)
+    grids = dict(STRATEGY_GRIDS, **(grids or {}))
+    os.makedirs(out_dir, exist_ok=True)
+    options = {'train_bars': train_bars, 'test_bars': test_bars, 'step': step, 'anchored': anchored,
+               'metric': metric, 'commission': commission, 'slippage': slippage}
+
+    tasks = {}
+    for ticker, stock_data in stock_frames.items():
+        for strategy in strategies:
+            key = result_key(ticker, stock_data, dict(options, strategy=strategy, grid=repr(grids[strategy])))
+            tasks[(ticker, strategy)] = os.path.join(out_dir, f'{key}.json')
+    results = {}
+    for task, path in tasks.items():
+        if os.path.exists(path):
+            with open(path) as f:
+                results[task] = json.load(f)
+    pending = [task for task in tasks if task not in results]
+    log(f'walk-forward: {len(tasks)}개 작업 중 {len(results)}개 재사용, {len(pending)}개 계산')
+
+    def args(task):
+        ticker, strategy = task
+        return (tasks[task], ticker, strategy, stock_frames[ticker], grids[strategy], train_bars, test_bars, step,
+                anchored, metric, commission, slippage)
+
+    if workers is not None and workers > 1 and len(pending) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(run_task_to_file, *args(task)): task for task in pending}
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+    else:
+        for task in pending:
+            results[task] = run_task_to_file(*args(task))
+
+    rows = [row for task in tasks for row in results[task]]
+    table = pd.DataFrame(rows)
+    if not table.empty:
+        table['params'] = table['params'].map(lambda p: json.dumps(p, sort_keys=True))
+    return table
+
+
+# 전략별 out-of-sample 요약 - test 구간 평균 성과와 가장 자주 선택된 파라미터
+def summarize(table, metric='sharpe'):
+    grouped = table.groupby('strategy', sort=False)
+    summary = pd.DataFrame({
+        'folds': grouped.size(),
+        f'train_{metric}': grouped[f'train_{metric}'].mean(),
+        f'test_{metric}': grouped[f'test_{metric}'].mean(),
+        'test_total_return': grouped['test_total_return'].mean(),
+        'test_max_drawdown': grouped['test_max_drawdown'].mean(),
+        'top_params': grouped['params'].agg(lambda params: params.value_counts().index[0]),
+    })
+    return summary.reset_index()